@@ -0,0 +1,50 @@
+#
+#   Python backend and Angular frontend code generation by gencrud
+#   Copyright (C) 2018-2020 Marc Bertens-Nguyen m.bertens@pe2mbs.nl
+#
+#   This library is free software; you can redistribute it and/or modify
+#   it under the terms of the GNU Library General Public License GPL-2.0-only
+#   as published by the Free Software Foundation.
+#
+#   This library is distributed in the hope that it will be useful, but
+#   WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#   Library General Public License for more details.
+#
+#   You should have received a copy of the GNU Library General Public
+#   License GPL-2.0-only along with this library; if not, write to the
+#   Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor,
+#   Boston, MA 02110-1301 USA
+#
+from gencrud.constants import *
+from gencrud.config.base import TemplateBase
+
+
+class TemplateCache( TemplateBase ):
+    """The record cache of /get/<id> of an object, 'cache: true' or with the settings
+    'cache: { ttl: 300, size: 1000 }'.
+    """
+    def __init__( self, parent, cfg ):
+        TemplateBase.__init__( self, parent )
+        if isinstance( cfg, bool ):
+            cfg = {} if cfg else None
+
+        self.__config = cfg
+        return
+
+    @property
+    def enabled( self ) -> bool:
+        return self.__config is not None
+
+    @property
+    def ttl( self ):
+        # Seconds a record is kept
+        return self.__config.get( C_TTL, 300 ) if self.enabled else 0
+
+    @property
+    def size( self ) -> int:
+        # The number of records kept in the process, for the in-process cache
+        return self.__config.get( C_SIZE, 1000 ) if self.enabled else 0
+
+    def __repr__( self ):
+        return "<TemplateCache enabled = {}, ttl = {}, size = {}>".format( self.enabled, self.ttl, self.size )
@@ -695,6 +695,19 @@ class TemplateColumn( TemplateBase ):
     def readonly( self ) -> bool:
         return self.__config.get( C_READ_ONLY, False )
 
+    @property
+    def loadStrategy( self ) -> str:
+        """How the list endpoints load the related record of a foreign key, by default
+        the columns in the list view are loaded eager with a SELECT ... IN.
+        """
+        if not ( self.hasForeignKey() and self.hasService() ):
+            return C_LOAD_LAZY
+
+        if C_LOAD in self.__config:
+            return self.__config[ C_LOAD ]
+
+        return C_LOAD_SELECTIN if self.listview.index is not None else C_LOAD_LAZY
+
     @property
     def group( self ):
         if self.ui:
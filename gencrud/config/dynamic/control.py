@@ -25,11 +25,28 @@ class TemplateDymanicControl( object ):
         self.__parent = parent
         self.__name = name
         self.__htmlTemplate = htmlTemplate
+        self.__template = None
         self.__attributes = []
+        self.__defaultOptions = []
         for name, properties in arguments.items():
             self.__attributes.append( name )
             setattr( self, name, ControlProperty( name, **properties ) )
 
+        self.__buildDefaultOptions()
+        return
+
+    def __buildDefaultOptions( self ):
+        # The control properties do not change per field, so the option string of
+        # each attribute is resolved once here instead of in every getOptions() call.
+        self.__defaultOptions = []
+        for attr in self.__attributes:
+            value = getattr( self, attr )
+            if value.isSet():
+                self.__defaultOptions.append( ( attr, '{}="{}"'.format( attr, str( value ) ) ) )
+
+            else:
+                self.__defaultOptions.append( ( attr, None ) )
+
         return
 
     @property
@@ -40,6 +57,13 @@ class TemplateDymanicControl( object ):
     def htmlTemplate( self ):
         return self.__htmlTemplate
 
+    @property
+    def template( self ) -> Template:
+        if self.__template is None:
+            self.__template = Template( self.__htmlTemplate )
+
+        return self.__template
+
     @property
     def parent( self ):
         return self.__parent
@@ -52,6 +76,7 @@ class TemplateDymanicControl( object ):
             else:
                 setattr( self, name, ControlProperty( name, **attributes ) )
 
+        self.__buildDefaultOptions()
         return
 
     def get( self, arguments ):
@@ -66,28 +91,22 @@ class TemplateDymanicControl( object ):
 
     def getOptions( self, ui = None ):
         options = []
-        for attr in self.__attributes:
+        for attr, default in self.__defaultOptions:
             value = None
-            if ui.isSet( attr ):
+            if ui is not None and ui.isSet( attr ):
                 value = ui.get( attr )
 
-            if value is None:
-                value = getattr( self, attr )
-                if not value.isSet():
-                    continue
-
-                value = str( value )
-
-            if value is None:
-                continue
+            if value is not None:
+                options.append( '{}="{}"'.format( attr, value ) )
 
-            options.append( '{}="{}"'.format( attr, value ) )
+            elif default is not None:
+                options.append( default )
 
         return ' '.join( options )
 
     def build( self, field, table, obj, root ):
-        return Template( self.__htmlTemplate ).render( this = self,
-                                                       field = field,
-                                                       table = table,
-                                                       obj = obj,
-                                                       root = root )
+        return self.template.render( this = self,
+                                     field = field,
+                                     table = table,
+                                     obj = obj,
+                                     root = root )
@@ -16,8 +16,26 @@
 #   Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor,
 #   Boston, MA 02110-1301 USA
 #
+import os
+import yaml
 from gencrud.config.dynamic.control import TemplateDymanicControl
 
+C_PYT_CONTROLS_FILE = os.path.abspath( os.path.join( os.path.dirname( __file__ ), '..', '..',
+                                                     'templates', 'pyt-controls.yaml' ) )
+
+# Parsed control definitions, keyed on the absolute filename. The definitions are
+# read-only, so they can be shared by all configurations in the same run.
+_controlDefinitions = {}
+
+
+def loadControls( filename = C_PYT_CONTROLS_FILE ) -> dict:
+    filename = os.path.abspath( filename )
+    if filename not in _controlDefinitions:
+        with open( filename, 'r' ) as stream:
+            _controlDefinitions[ filename ] = yaml.safe_load( stream )
+
+    return _controlDefinitions[ filename ]
+
 
 class DymanicControls( object ):
     def __init__( self, controls ):
@@ -27,6 +27,7 @@ from gencrud.config.base import TemplateBase
 from gencrud.util.exceptions import MissingAttribute
 from gencrud.config.mixin import TemplateMixin
 from gencrud.config.injection import InjectionTemplate
+from gencrud.config.cache import TemplateCache
 import posixpath
 
 
@@ -103,6 +104,7 @@ class TemplateObject( TemplateBase ):
         self.__table        = TemplateTable( self, **self.__config.get( C_TABLE, {} ) )
         self.__extra        = TemplateExtra( self, **self.__config.get( C_EXTRA, {} ) )
         self.__mixin        = TemplateMixin( self, **self.__config.get( C_MIXIN, {} ) )
+        self.__cache        = TemplateCache( self, self.__config.get( C_CACHE, False ) )
         return
 
     #
@@ -169,6 +171,17 @@ class TemplateObject( TemplateBase ):
     def table( self ) -> TemplateTable:
         return self.__table
 
+    @property
+    def cache( self ) -> TemplateCache:
+        return self.__cache
+
+    @property
+    def optimistic( self ) -> bool:
+        """The data service applies an add, update or delete to the table view before the
+        backend answers, and rolls it back when the request fails.
+        """
+        return self.__config.get( C_OPTIMISTIC, False )
+
     @property
     def actionWidth( self ) -> str:
         return self.__config.get( C_ACTION_WIDTH, '5%' )
@@ -234,3 +247,24 @@ class TemplateObject( TemplateBase ):
 
 
 TemplateObjects = List[ TemplateObject ]
+
+
+class StreamedObjects( object ):
+    """The objects of a configuration in streaming mode. None of the objects is kept,
+    each iteration or index builds the TemplateObject again from its configuration.
+    This keeps the memory at one object, at the cost of building every object once
+    per generator pass instead of once per run.
+    """
+    def __init__( self, parent, objects: list ):
+        self.__parent   = parent
+        self.__objects  = objects
+        return
+
+    def __len__( self ) -> int:
+        return len( self.__objects )
+
+    def __iter__( self ):
+        return ( TemplateObject( self.__parent, **obj ) for obj in self.__objects )
+
+    def __getitem__( self, index ) -> TemplateObject:
+        return TemplateObject( self.__parent, **self.__objects[ index ] )
@@ -44,6 +44,10 @@ class TemplateOptions( TemplateBase ):
 
     @property
     def overWriteFiles( self ) -> bool:
+        if gencrud.util.utils.checkFiles or gencrud.util.utils.diffFiles:
+            # Nothing is written, compare with what a run with --overwrite would produce
+            return True
+
         # This override/set commandline options from the template defintion.
         return self.__config.get( C_OVERWRITE, gencrud.util.utils.overWriteFiles )
 
@@ -52,6 +56,16 @@ class TemplateOptions( TemplateBase ):
         # This override/set commandline options from the template defintion.
         return self.__config.get( C_LAZY_LOADING, gencrud.util.utils.lazyLoading )
 
+    @property
+    def streaming( self ) -> bool:
+        # This override/set commandline options from the template defintion.
+        return self.__config.get( C_STREAMING, gencrud.util.utils.streaming )
+
+    @property
+    def flavour( self ) -> str:
+        # The template family of the backend views, sync or async
+        return self.__config.get( C_FLAVOUR, C_FLAVOUR_SYNC )
+
     @property
     def generateFrontend( self ) -> bool:
         # This override/set commandline options from the template defintion.
@@ -76,6 +76,15 @@ class TemplateService( TemplateBase ):
         label = self.__config.get( C_LABEL, None )
         return self.__config.get( C_LABEL, None )
 
+    @property
+    def labels( self ) -> list:
+        # The label may combine columns separated by ',', ';' or '-'
+        label = self.__config.get( C_LABEL, None )
+        if label is None:
+            return []
+
+        return [ lbl.strip() for lbl in label.replace( ';', ',' ).replace( '-', ',' ).split( ',' ) ]
+
     @property
     def resolveLabel( self ):
         # in case a foreign key label is taken, only the actual label name
@@ -25,6 +25,7 @@ class SortInfo( TemplateBase ):
         TemplateBase.__init__( self, None )
         self.__field    = data[ C_FIELD ]
         self.__direction = C_ASCENDING
+        self.__keyset   = data.get( C_KEYSET, False )
         if C_DIRECTION in data:
             if data[ C_DIRECTION ] in C_DIRECTIONS:
                 self.__direction    = data[ C_DIRECTION ]
@@ -42,6 +43,10 @@ class SortInfo( TemplateBase ):
     def direction( self ):
         return self.__direction
 
+    @property
+    def keyset( self ) -> bool:
+        return self.__keyset
+
     def htmlMaterialSorting( self ):
         return 'matSortActive="{}" matSortDirection="{}"'.format( self.__field, self.__direction )
 
@@ -17,6 +17,7 @@
 #   Boston, MA 02110-1301 USA
 #
 import os
+import json
 from gencrud.util.exceptions import (MissingTemplate,
                                      MissingCommon,
                                      MissingSourceFolder,
@@ -29,23 +30,54 @@ from gencrud.constants import *
 from gencrud.config.base import TemplateBase
 
 
-class TemplateSource( TemplateBase ):
-    def __init__( self, tp, **cfg ):
-        TemplateBase.__init__( self, None )
-        platf = get_platform()
-        if platf not in C_PLATFORMS:
-            raise Exception( "Unsupported platform: {}".format( platf ) )
-
-        self.__config = cfg
-        self.__key = tp
-        self.__source = self.__config.get( platf, self.__config ).get( C_SOURCE, {} )
-        # if there is no templates directory specified, the gencrud default templates will be used
-        self.__template = self.__config.get( platf, self.__config ).get( C_TEMPLATES_DIR, {} )
+class TemplateEnvironment( object ):
+    """The resolved folders for one source type ('python', 'angular' or 'unittest').
+
+    Every folder is resolved and verified only once, on first use, and after
+    that it never changes. The environments are shared between all templates
+    files with the same source settings started from the same folder, so that
+    the file system is not probed again for every object and template.
+    """
+    def __init__( self, tp, cwd, source, template ):
+        self.__key      = tp
+        self.__cwd      = cwd
+        self.__source   = source
+        self.__template = template
+        self.__resolved = {}
         return
 
+    def __resolve( self, name, resolver ) -> str:
+        if name not in self.__resolved:
+            self.__resolved[ name ] = resolver()
+
+        return self.__resolved[ name ]
+
     @property
     def sourceBaseFolder( self ) -> str:
-        folder = self.__source.get( C_BASE, os.getcwd() )
+        return self.__resolve( 'sourceBaseFolder', self.__sourceBaseFolder )
+
+    @property
+    def templateBaseFolder( self ) -> str:
+        return self.__resolve( 'templateBaseFolder', self.__templateBaseFolder )
+
+    @property
+    def commonBaseFolder( self ) -> str:
+        return self.__resolve( 'commonBaseFolder', self.__commonBaseFolder )
+
+    @property
+    def sourceFolder( self ) -> str:
+        return self.__resolve( 'sourceFolder', self.__sourceFolder )
+
+    @property
+    def templateFolder( self ) -> str:
+        return self.__resolve( 'templateFolder', self.__templateFolder )
+
+    @property
+    def commonFolder( self ) -> str:
+        return self.__resolve( 'commonFolder', self.__commonFolder )
+
+    def __sourceBaseFolder( self ) -> str:
+        folder = self.__source.get( C_BASE, self.__cwd )
 
         # if not folder.startswith( os.path.pathsep ):
         #    folder = os.path.abspath( os.path.join(os.getcwd(), folder ) )
@@ -55,26 +87,23 @@ class TemplateSource( TemplateBase ):
 
         return folder
 
-    @property
-    def templateBaseFolder( self ) -> str:
-        folder = self.__template.get( C_BASE, os.getcwd() )
+    def __templateBaseFolder( self ) -> str:
+        folder = self.__template.get( C_BASE, self.__cwd )
 
         if not os.path.isdir( folder ):
             raise PathNotFoundException( folder )
 
         return folder
 
-    @property
-    def commonBaseFolder( self ) -> str:
-        folder = self.__template.get( C_COMMON, {} ).get( C_BASE, os.getcwd() )
+    def __commonBaseFolder( self ) -> str:
+        folder = self.__template.get( C_COMMON, {} ).get( C_BASE, self.__cwd )
 
         if not os.path.isdir( folder ):
             raise PathNotFoundException( folder )
 
         return folder
 
-    @property
-    def sourceFolder( self ) -> str:
+    def __sourceFolder( self ) -> str:
         folder = self.__source.get( self.__key, None )
         if folder is None:
             raise KeyNotFoundException( "{}.{}".format( C_SOURCE, self.__key ) )
@@ -92,8 +121,7 @@ class TemplateSource( TemplateBase ):
 
         return folder
 
-    @property
-    def templateFolder( self ) -> str:
+    def __templateFolder( self ) -> str:
         folder = self.__template.get( self.__key, None )
         # if template folder not specified take default
         if folder is None:
@@ -121,8 +149,7 @@ class TemplateSource( TemplateBase ):
 
         return folder
 
-    @property
-    def commonFolder( self ) -> str:
+    def __commonFolder( self ) -> str:
         folder = self.__template.get( C_COMMON, {} ).get( self.__key, None )
         # if there is no common templates directory specified, the gencrud default common will be used
         if folder is None:
@@ -144,6 +171,64 @@ class TemplateSource( TemplateBase ):
 
         return folder
 
+
+# Shared environments by ( type, working folder, source settings, template settings )
+_environments = {}
+
+
+def getEnvironment( tp, source, template ) -> TemplateEnvironment:
+    cwd = os.getcwd()
+    key = ( tp, cwd, json.dumps( source, sort_keys = True, default = str ),
+                     json.dumps( template, sort_keys = True, default = str ) )
+    if key not in _environments:
+        _environments[ key ] = TemplateEnvironment( tp, cwd, source, template )
+
+    return _environments[ key ]
+
+
+class TemplateSource( TemplateBase ):
+    def __init__( self, tp, **cfg ):
+        TemplateBase.__init__( self, None )
+        platf = get_platform()
+        if platf not in C_PLATFORMS:
+            raise Exception( "Unsupported platform: {}".format( platf ) )
+
+        self.__config = cfg
+        self.__key = tp
+        self.__source = self.__config.get( platf, self.__config ).get( C_SOURCE, {} )
+        # if there is no templates directory specified, the gencrud default templates will be used
+        self.__template = self.__config.get( platf, self.__config ).get( C_TEMPLATES_DIR, {} )
+        self.__environment = getEnvironment( tp, self.__source, self.__template )
+        return
+
+    @property
+    def environment( self ) -> TemplateEnvironment:
+        return self.__environment
+
+    @property
+    def sourceBaseFolder( self ) -> str:
+        return self.__environment.sourceBaseFolder
+
+    @property
+    def templateBaseFolder( self ) -> str:
+        return self.__environment.templateBaseFolder
+
+    @property
+    def commonBaseFolder( self ) -> str:
+        return self.__environment.commonBaseFolder
+
+    @property
+    def sourceFolder( self ) -> str:
+        return self.__environment.sourceFolder
+
+    @property
+    def templateFolder( self ) -> str:
+        return self.__environment.templateFolder
+
+    @property
+    def commonFolder( self ) -> str:
+        return self.__environment.commonFolder
+
     def __repr__( self ):
         return """<TemplateSource {key}
         base = {base} 
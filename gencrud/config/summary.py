@@ -0,0 +1,76 @@
+#
+#   Python backend and Angular frontend code generation by gencrud
+#   Copyright (C) 2018-2020 Marc Bertens-Nguyen m.bertens@pe2mbs.nl
+#
+#   This library is free software; you can redistribute it and/or modify
+#   it under the terms of the GNU Library General Public License GPL-2.0-only
+#   as published by the Free Software Foundation.
+#
+#   This library is distributed in the hope that it will be useful, but
+#   WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#   Library General Public License for more details.
+#
+#   You should have received a copy of the GNU Library General Public
+#   License GPL-2.0-only along with this library; if not, write to the
+#   Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor,
+#   Boston, MA 02110-1301 USA
+#
+from gencrud.config.menuitem import TemplateMenuItem
+
+
+class ScreenRouteSummary( object ):
+    __slots__ = ( 'name', 'cls', 'label', 'module', 'action' )
+
+    def __init__( self, action ):
+        self.name   = action.route.name
+        self.cls    = action.route.cls
+        self.label  = action.route.label
+        self.module = action.route.module
+        self.action = repr( action )
+        return
+
+    def __repr__( self ):
+        return self.action
+
+
+class TemplateObjectSummary( object ):
+    """Small extract of a TemplateObject with the information that is needed
+    across objects, i.e. for the routes, menu and modules of the project.
+    This is kept for every object, also when the object itself is released.
+    """
+    __slots__ = ( '__name', '__cls', '__tableName', '__menu', '__screenRoutes' )
+
+    def __init__( self, obj ):
+        self.__name         = obj.name
+        self.__cls          = obj.cls
+        self.__tableName    = obj.table.name
+        self.__menu         = obj.menu
+        self.__screenRoutes = [ ScreenRouteSummary( action ) for action in obj.actions
+                                if action.type == 'screen' and action.isAngularRoute() ]
+        return
+
+    @property
+    def name( self ) -> str:
+        return self.__name
+
+    @property
+    def cls( self ) -> str:
+        return self.__cls
+
+    @property
+    def tableName( self ) -> str:
+        return self.__tableName
+
+    @property
+    def menu( self ) -> TemplateMenuItem:
+        return self.__menu
+
+    @property
+    def screenRoutes( self ) -> list:
+        return self.__screenRoutes
+
+    def __repr__( self ):
+        return "<TemplateObjectSummary name={}, class={}, table={}>".format( self.__name,
+                                                                             self.__cls,
+                                                                             self.__tableName )
@@ -54,6 +54,48 @@ class RelationShip( TemplateBase ):
         return self.__relation.get( C_CASCADE )
 
 
+class TableIndex( TemplateBase ):
+    def __init__( self, parent, index ):
+        TemplateBase.__init__( self, parent )
+        self.__index = index
+        return
+
+    @property
+    def columns( self ) -> list:
+        columns = self.__index.get( C_COLUMNS, [] )
+        if isinstance( columns, str ):
+            columns = columns.split( ',' )
+
+        return [ column.strip() for column in columns ]
+
+    @property
+    def name( self ) -> str:
+        return self.__index.get( C_NAME, '{0}_{1}_IDX'.format( self.parent.name, '_'.join( self.columns ) ) )
+
+    @property
+    def unique( self ) -> bool:
+        return self.__index.get( C_UNIQUE, False )
+
+    @property
+    def where( self ) -> str:
+        return self.__index.get( C_WHERE, '' )
+
+    def sqlAlchemyDef( self, cls ) -> str:
+        result = "db.Index( '{0}', {1}".format( self.name, ', '.join( '{0}.{1}'.format( cls, column )
+                                                                       for column in self.columns ) )
+        if self.unique:
+            result += ', unique = True'
+
+        if self.where != '':
+            # Partial index, only supported by PostgreSQL and SQLite, on others it indexes all rows
+            result += ', postgresql_where = db.text( {0!r} ), sqlite_where = db.text( {0!r} )'.format( self.where )
+
+        return result + ' )'
+
+    def __repr__( self ):
+        return "<TableIndex name={}, columns={}>".format( self.name, self.columns )
+
+
 class TemplateTable( TemplateBase ):
     def __init__( self, parent, **table ):
         TemplateBase.__init__( self, parent )
@@ -91,6 +133,17 @@ class TemplateTable( TemplateBase ):
             else:
                 raise InvalidViewSize()
 
+        if self.searchIndex not in C_SEARCH_INDEXES:
+            raise InvalidSetting( C_SEARCH, C_TABLE, self.name, expected = C_SEARCH_INDEXES )
+
+        for index in self.__table.get( C_INDEXES, [] ):
+            for column in TableIndex( self, index ).columns:
+                if self.getFieldByName( column ) is None:
+                    raise InvalidSetting( C_INDEXES, self.name, column )
+
+        if self.hasChanges and self.getFieldByName( self.changesColumn ) is not None:
+            raise InvalidSetting( C_CHANGES, self.name, self.changesColumn )
+
         groups = defaultdict(list)
         for column in self.__columns:
             if column.ui:
@@ -224,6 +277,33 @@ class TemplateTable( TemplateBase ):
 
         return False
 
+    @property
+    def indexes( self ) -> list:
+        """The indexes of the 'indexes' section and, unless 'autoIndex' is false, an index for
+        the viewSort field, each foreign key and each listview filter column that is not
+        already the first column of an index, the primary key or unique.
+        """
+        result = [ TableIndex( self, index ) for index in self.__table.get( C_INDEXES, [] ) ]
+        if not self.__table.get( C_AUTO_INDEX, True ):
+            return result
+
+        covered = { self.__primaryKey } | { index.columns[ 0 ] for index in result }
+        if self.hasKeysetPaging:
+            covered.add( self.sortField )
+
+        candidates = [ self.__viewSort.field ] if self.__viewSort is not None else []
+        candidates += [ column.name for column in self.__columns if column.hasForeignKey() ]
+        candidates += [ column.name for column in self.__columns if column.listview.filter ]
+        for name in candidates:
+            column = self.getFieldByName( name )
+            if name in covered or column is None or column.unique or column.hasAttribute( 'UNIQUE' ):
+                continue
+
+            covered.add( name )
+            result.append( TableIndex( self, { C_COLUMNS: [ name ] } ) )
+
+        return result
+
     @property
     def hasAutoUpdate( self ) -> bool:
         for field in self.__columns:
@@ -270,6 +350,97 @@ class TemplateTable( TemplateBase ):
                        [ sibling for col in self.__columns for sibling in col.siblings if sibling.listview.index is not None ],
                        key = lambda col: col.listview.index )
 
+    @property
+    def listViewFields( self ) -> list:
+        """The fields of the list schema, the primary key and what the table view shows"""
+        result = [ self.__primaryKey ]
+        for col in self.listViewColumns:
+            if col.isSibling or col.ui is None:
+                continue
+
+            if col.pType != '' and col.frontend and col.name not in result:
+                result.append( col.name )
+
+            if col.hasForeignKey() and col.ui.hasService():
+                result.append( col.name + '_FK' )
+
+            elif col.hasResolveList():
+                result.append( col.name + '_LABEL' )
+
+        return result
+
+    @property
+    def searchColumns( self ) -> list:
+        """The columns /search and the search of /pagedlist look in, as the table filter of
+        the frontend does; the foreign keys as '<field>_FK' on their label fields.
+        """
+        result = []
+        for col in self.listViewColumns:
+            if col.isSibling or col.ui is None or col.pType == '':
+                continue
+
+            if col.hasForeignKey() and col.ui.hasService():
+                # A label of a nested reference can not be joined
+                if col.ui.service.label is not None and '.' not in col.ui.service.label:
+                    result.append( col.name + '_FK' )
+
+            elif col.name not in result:
+                result.append( col.name )
+
+        return result
+
+    @property
+    def searchResolveLists( self ) -> list:
+        """The search columns that are searched on the labels of their resolve list"""
+        return [ col for col in self.listViewColumns if col.name in self.searchColumns and col.hasResolveList() ]
+
+    @property
+    def searchIndex( self ) -> str:
+        return self.__table.get( C_SEARCH, C_SEARCH_LIKE )
+
+    @property
+    def searchIndexColumns( self ) -> list:
+        """The search columns of the table itself, these are in the full text index"""
+        resolved = [ col.name for col in self.searchResolveLists ]
+        return [ self.getFieldByName( name ) for name in self.searchColumns
+                 if not name.endswith( '_FK' ) and name not in resolved ]
+
+    def searchDDL( self ) -> list:
+        """The ( dialect, statement ) list that creates the full text index of the search
+        columns with the table; an FTS5 table kept up to date by triggers for SQLite or a
+        generated tsvector column with a GIN index for PostgreSQL (version 12 or higher).
+        """
+        columns = [ col.dbField for col in self.searchIndexColumns ]
+        if len( columns ) == 0 or self.searchIndex == C_SEARCH_LIKE:
+            return []
+
+        table = self.name
+        primaryKey = self.getFieldByName( self.__primaryKey ).dbField
+        if self.searchIndex == C_SEARCH_TSVECTOR:
+            document = " || ' ' || ".join( "coalesce( \"{0}\"::text, '' )".format( column ) for column in columns )
+            return [ ( 'postgresql', 'ALTER TABLE "{0}" ADD COLUMN "{0}_TSV" tsvector GENERATED ALWAYS AS '
+                                     '( to_tsvector( \'simple\', {1} ) ) STORED'.format( table, document ) ),
+                     ( 'postgresql', 'CREATE INDEX "{0}_TSV_IDX" ON "{0}" USING GIN ( "{0}_TSV" )'.format( table ) ) ]
+
+        names = ', '.join( '"{0}"'.format( column ) for column in columns )
+
+        def values( prefix ):
+            return ', '.join( '{0}."{1}"'.format( prefix, column ) for column in [ primaryKey ] + columns )
+
+        insert = 'INSERT INTO "{0}_FTS"( rowid, {1} ) VALUES ( {2} );'.format( table, names, values( 'new' ) )
+        delete = 'INSERT INTO "{0}_FTS"( "{0}_FTS", rowid, {1} ) VALUES ( \'delete\', {2} );'.format( table, names,
+                                                                                                      values( 'old' ) )
+        return [ ( 'sqlite', 'CREATE VIRTUAL TABLE "{0}_FTS" USING fts5( {1}, content = \'{0}\', '
+                             'content_rowid = \'{2}\' )'.format( table, names, primaryKey ) ),
+                 ( 'sqlite', 'CREATE TRIGGER "{0}_FTS_AI" AFTER INSERT ON "{0}" BEGIN {1} END'.format( table, insert ) ),
+                 ( 'sqlite', 'CREATE TRIGGER "{0}_FTS_AD" AFTER DELETE ON "{0}" BEGIN {1} END'.format( table, delete ) ),
+                 ( 'sqlite', 'CREATE TRIGGER "{0}_FTS_AU" AFTER UPDATE ON "{0}" BEGIN {1} {2} END'.format( table, delete,
+                                                                                                         insert ) ) ]
+
+    @property
+    def eagerLoadColumns( self ) -> list:
+        return [ col for col in self.__columns if col.loadStrategy != C_LOAD_LAZY ]
+
     @property
     def uiColumns( self ) -> list:
         return [ col for col in self.__columns if col.ui is not None ] +\
@@ -296,6 +467,29 @@ class TemplateTable( TemplateBase ):
     def viewSort( self ) -> SortInfo:
         return self.__viewSort
 
+    @property
+    def changesColumn( self ) -> str:
+        """The generated column with the time of the last insert or update of a record,
+        that /changes selects on; 'changes: true' names it UPDATED_AT.
+        """
+        changes = self.__table.get( C_CHANGES, False )
+        if changes is False:
+            return ''
+
+        name = C_CHANGES_COLUMN if changes is True else changes
+        if root.config.options.ignoreCaseDbIds:
+            return name.lower()
+
+        return name
+
+    @property
+    def hasChanges( self ) -> bool:
+        return self.changesColumn != ''
+
+    @property
+    def hasKeysetPaging( self ) -> bool:
+        return self.__viewSort is not None and self.__viewSort.keyset
+
     @property
     def hasViewSizeService( self ) -> bool:
         if self.__viewSize is not None:
@@ -21,11 +21,12 @@ from ruamel import yaml
 import os
 import io
 import gencrud.util.utils
-from gencrud.config.object import TemplateObject, TemplateObjects
+from gencrud.config.object import TemplateObject, TemplateObjects, StreamedObjects
+from gencrud.config.summary import TemplateObjectSummary
 from gencrud.config.source import TemplateSourcePython, TemplateSourceAngular, TemplateSourceUnittest
 from gencrud.config.options import TemplateOptions
 from gencrud.config.references import TemplateReferences
-from gencrud.config.dynamic.controls import DymanicControls
+from gencrud.config.dynamic.controls import DymanicControls, loadControls
 from gencrud.constants import *
 from gencrud.util.exceptions import MissingAttribute
 import jsonschema
@@ -123,8 +124,15 @@ class TemplateConfiguration( object ):
             raise SystemExit
 
         self.__controls     = None
-        controls            = cfg.get( C_CONTROLS, None )
-        if controls is not None:
+        controls            = self.__config.get( C_CONTROLS, None )
+        if controls is True:
+            controls = loadControls()
+
+        elif isinstance( controls, str ):
+            # filename of the control definitions, i.e. templates/pyt-controls.yaml
+            controls = loadControls( controls )
+
+        if isinstance( controls, dict ):
             self.__controls = DymanicControls( controls )
 
         opts                = self.__config[ C_OPTIONS ] if C_OPTIONS in self.__config else { }
@@ -137,8 +145,16 @@ class TemplateConfiguration( object ):
         opts                = self.__config[ C_REFERENCES ] if C_REFERENCES in self.__config else { }
         self.__references   = TemplateReferences( **opts )
         self.__objects      = []
+        self.__summaries    = []
         for obj in self.__config[ C_OBJECTS ]:
-            self.__objects.append( TemplateObject( self, **obj ) )
+            templateObject = TemplateObject( self, **obj )
+            self.__summaries.append( TemplateObjectSummary( templateObject ) )
+            if not self.__options.streaming:
+                self.__objects.append( templateObject )
+
+        if self.__options.streaming:
+            self.__objects  = StreamedObjects( self, self.__config[ C_OBJECTS ] )
+
         return
 
     @property
@@ -161,11 +177,22 @@ class TemplateConfiguration( object ):
     def unittest( self ) -> TemplateSourceUnittest:
         return self.__unittest
 
+    @property
+    def streaming( self ) -> bool:
+        return self.__options.streaming
+
     @property
     def objects( self ) -> TemplateObjects:
+        # In streaming mode a StreamedObjects, that builds the objects on access
         return self.__objects
 
+    @property
+    def summaries( self ) -> Iterable[ TemplateObjectSummary ]:
+        return self.__summaries
+
     def __iter__( self ) -> Iterable[ TemplateObject ]:
+        # In streaming mode the objects are not kept, each object is build when
+        # it is needed and released by the caller when done with it.
         return iter( self.__objects )
 
     @property
@@ -38,6 +38,11 @@ C_BACKUP                = 'backup'
 C_IGNORE_CASE_DB_IDS    = 'ignore-case-db-ids'
 C_OVERWRITE             = 'overwrite'
 C_LAZY_LOADING          = 'lazy-loading'
+C_STREAMING             = 'streaming'
+C_FLAVOUR               = 'flavour'
+C_FLAVOUR_SYNC          = 'sync'
+C_FLAVOUR_ASYNC         = 'async'
+C_FLAVOURS              = ( C_FLAVOUR_SYNC, C_FLAVOUR_ASYNC )
 C_SORT                  = 'sort'
 
 C_APP_MODULE            = 'app-module'
@@ -81,6 +86,10 @@ C_WHERE                 = 'where'
 C_PATH                  = 'path'
 C_IMPORTS               = 'imports'
 C_INJECTION             = 'injection'
+C_CACHE                 = 'cache'
+C_TTL                   = 'ttl'
+C_SIZE                  = 'size'
+C_OPTIMISTIC            = 'optimistic'
 C_PROVIDERS             = 'providers'
 C_POSITION              = 'position'
 C_NONE                  = 'none'
@@ -153,6 +162,10 @@ C_VIEW_SIZE             = 'viewSize'
 C_UNIQUE_KEY            = 'unique-key'
 C_UNIQUE                = 'unique'
 C_SECONDARY_KEY         = 'secondary-key'
+C_INDEXES               = 'indexes'
+C_AUTO_INDEX            = 'autoIndex'
+C_CHANGES               = 'changes'
+C_CHANGES_COLUMN        = 'UPDATED_AT'
 
 C_ASCENDING             = 'asc'
 C_DESENDING             = 'desc'
@@ -160,6 +173,7 @@ C_DIRECTIONS            = ( C_ASCENDING, C_DESENDING, '' )
 
 C_FIELD                 = 'field'
 C_DIRECTION             = 'direction'
+C_KEYSET                = 'keyset'
 
 C_MODEL                 = 'model'
 C_SCHEMA                = 'schema'
@@ -227,6 +241,16 @@ C_ISSIBLING             = 'isSibling'
 
 C_FIELD_NAME            = 'field-name'
 C_LAZY                  = 'lazy'
+C_LOAD                  = 'load'
+C_LOAD_SELECTIN         = 'selectin'
+C_LOAD_JOINED           = 'joined'
+C_LOAD_LAZY             = 'lazy'
+C_LOAD_STRATEGIES       = ( C_LOAD_SELECTIN, C_LOAD_JOINED, C_LOAD_LAZY )
+C_SEARCH                = 'search'
+C_SEARCH_LIKE           = 'like'
+C_SEARCH_FTS5           = 'fts5'
+C_SEARCH_TSVECTOR       = 'tsvector'
+C_SEARCH_INDEXES        = ( C_SEARCH_LIKE, C_SEARCH_FTS5, C_SEARCH_TSVECTOR )
 C_WIDTH                 = 'width'
 C_UI                    = 'ui'
 C_LIST_VIEW             = 'listview'
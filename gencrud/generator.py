@@ -26,6 +26,8 @@ import glob
 import traceback
 import logging
 import gencrud.util.utils
+import gencrud.util.output
+import gencrud.util.backup
 from gencrud.configuraton import TemplateConfiguration, my_safe_load
 from gencrud.generators.python import generatePython
 from gencrud.generators.angular import generateAngular
@@ -44,20 +46,27 @@ from pypac import get_pac
 logger = logging.getLogger()
 
 
-def verifyLoadProject( config: TemplateConfiguration, env ):
+# The project configuration files by ( environment, source folder ), these are
+# read once and shared by all input files of a run.
+projectConfigurations = {}
+
+
+def loadProjectConfiguration( env, sourceFolder ):
+    key = ( env, sourceFolder )
+    if key in projectConfigurations:
+        return projectConfigurations[ key ]
+
     if env == C_ANGULAR:
         configFile  = os.path.join( '..', '..', 'angular.json' )
-        root        = config.angular
 
     elif env == C_PYTHON:
-        root = config.python
-        if os.path.isfile( os.path.join( root.sourceFolder, 'config', 'config.conf' ) ):
+        if os.path.isfile( os.path.join( sourceFolder, 'config', 'config.conf' ) ):
             configFile = os.path.join( 'config', 'config.conf' )
 
-        elif os.path.isfile( os.path.join( root.sourceFolder, 'config.yaml' ) ):
+        elif os.path.isfile( os.path.join( sourceFolder, 'config.yaml' ) ):
             configFile = 'config.yaml'
 
-        elif os.path.isfile( os.path.join( root.sourceFolder, 'config.json' ) ):
+        elif os.path.isfile( os.path.join( sourceFolder, 'config.json' ) ):
             configFile = 'config.json'
 
         else:
@@ -68,8 +77,8 @@ def verifyLoadProject( config: TemplateConfiguration, env ):
     else:
         raise InvalidEnvironment( env )
 
-    if os.path.isdir( root.sourceFolder ) and os.path.isfile( os.path.join( root.sourceFolder, configFile ) ):
-        with open( os.path.join( root.sourceFolder, configFile ),
+    if os.path.isdir( sourceFolder ) and os.path.isfile( os.path.join( sourceFolder, configFile ) ):
+        with open( os.path.join( sourceFolder, configFile ),
                    gencrud.util.utils.C_FILEMODE_READ ) as stream:
             if configFile.endswith( ( '.yaml', '.conf' ) ):
                 data = my_safe_load( stream )
@@ -78,11 +87,26 @@ def verifyLoadProject( config: TemplateConfiguration, env ):
                 data = json.load( stream )
 
         if data is None:
-            raise EnvironmentInvalidMissing( env, root.sourceFolder, configFile )
+            raise EnvironmentInvalidMissing( env, sourceFolder, configFile )
 
     else:
-        raise EnvironmentInvalidMissing( env, root.sourceFolder, configFile )
+        raise EnvironmentInvalidMissing( env, sourceFolder, configFile )
+
+    projectConfigurations[ key ] = data
+    return data
+
 
+def verifyLoadProject( config: TemplateConfiguration, env ):
+    if env == C_ANGULAR:
+        root        = config.angular
+
+    elif env == C_PYTHON:
+        root = config.python
+
+    else:
+        raise InvalidEnvironment( env )
+
+    data = loadProjectConfiguration( env, root.sourceFolder )
     # logger.debug( 'Configuration for {}: {}'.format( env, json.dumps( data, indent = 4 ) ) )
     if env == C_ANGULAR:
         # Check if we have a valid Angular environment
@@ -163,6 +187,20 @@ def initializeCodeGenerationProcess( input_file ):
     return
 
 
+def restoreBackup( args ):
+    if len( args ) == 0:
+        print( "Backup runs:" )
+        for runId in gencrud.util.backup.listRuns():
+            print( "    {}".format( runId ) )
+
+        return
+
+    for filename in gencrud.util.backup.restoreRun( args[ 0 ] ):
+        print( "Restored: {}".format( filename ) )
+
+    return
+
+
 def banner():
     print( '''gencrud - Python backend and Angular frontend code generation, version {version}
 Copyright (C) {copyright} {author} <{email}>
@@ -178,6 +216,7 @@ def usage( msg = '' ):
 Syntax:
     gencrud [options] { input-file1 [ input-fileN] }
                       { [<yaml-template-folder>/]* }
+    gencrud restore [ <run-id> ]
 
 Parameters:
 
@@ -185,6 +224,8 @@ Parameters:
 Options:
     -h / --help                         This help information.
     -b / --backup                       Make backup of the original project files files.
+                                        'gencrud restore' lists the backup runs, 'gencrud restore <run-id>'
+                                        restores the files of that run.
     -r / --recurse                      do recursive generation of all templates.
     -e / --extension <extension>        to override the default extension .yaml 
     -i / --ignore <folder>              ignore folder (by default all folders starting with 'template' are ignored.   
@@ -192,6 +233,12 @@ Options:
     -c / --ignore-case-db-ids           All database names shall be in lower case. 
     -M / --module                       Create module component for template and use GenCrudModule.
                                         instead of adding the components directly into app.module.ts   
+    --streaming                         Generate one object at a time, to limit the memory usage for
+                                        large template files.
+    --check                             Generate in memory only and exit with status 1 when
+                                        any project file would change, implies --overwrite.
+    --diff                              Generate in memory only and print the differences
+                                        with the project files, implies --overwrite.
     -s / --ssl-verify                    Disable the verification of ssl certificate when    
                                         retrieving some external profile data.
     -p / --proxy <addr|pac>             Using the IP address, url address of the proxy or the address for the PAC file
@@ -219,7 +266,10 @@ def main():
                                                         'ignore-case-db-ids',
                                                         'proxy=',
                                                         'proxy-system',
-                                                        'nltk-update' ] )
+                                                        'nltk-update',
+                                                        'streaming',
+                                                        'check',
+                                                        'diff' ] )
 
     except getopt.GetoptError as err:
         # print help information and exit:
@@ -254,6 +304,15 @@ def main():
             elif o in ( '-M', '--module' ):
                 gencrud.util.utils.useModule = True
 
+            elif o == '--streaming':
+                gencrud.util.utils.streaming = True
+
+            elif o == '--check':
+                gencrud.util.utils.checkFiles = True
+
+            elif o == '--diff':
+                gencrud.util.utils.diffFiles = True
+
             elif o in ( '-b', '--backup' ):
                 gencrud.util.utils.backupFiles = True
 
@@ -316,6 +375,10 @@ def main():
             else:
                 assert False, 'unhandled option'
 
+        if len( args ) > 0 and args[ 0 ] == 'restore':
+            restoreBackup( args[ 1: ] )
+            sys.exit()
+
         gencrud.util.utils.check_nltk()
         if len( args ) == 0:
             usage( 'Missing input file(s)' )
@@ -369,6 +432,11 @@ def main():
                     print( "Filename: {}".format( arg ) )
                     initializeCodeGenerationProcess( arg )
 
+        if gencrud.util.output.files.inMemory:
+            changes = gencrud.util.output.files.report()
+            if gencrud.util.utils.checkFiles and changes > 0:
+                sys.exit( 1 )
+
         print( "Done" )
 
     except ModuleExistsAlready as exc:
@@ -393,7 +461,11 @@ def main():
         logger.debug( traceback.format_exc() )
         logger.error( exc )
 
-    return
+    else:
+        return
+
+    # The generation failed, with --check also nothing was compared
+    sys.exit( 2 )
 
 
 if __name__ == '__main__':
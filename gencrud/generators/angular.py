@@ -18,7 +18,6 @@
 #
 import json
 import os
-import shutil
 import logging
 import datetime
 import gencrud.version
@@ -26,6 +25,7 @@ from mako.template import Template
 from mako import exceptions
 import gencrud.util.utils
 import gencrud.util.exceptions
+import gencrud.util.output
 from gencrud.constants import *
 from gencrud.configuraton import TemplateConfiguration
 from gencrud.util.typescript import TypeScript
@@ -47,8 +47,8 @@ NG_DECLARATIONS     = 'declarations'
 def makeAngularModule( root_path, *args ):
     if len( args ) > 0:
         modulePath = os.path.join( root_path, args[ 0 ] )
-        if not os.path.isdir( modulePath ):
-            os.mkdir( modulePath )
+        if not gencrud.util.output.files.isdir( modulePath ):
+            gencrud.util.output.files.mkdir( modulePath )
 
         makeAngularModule( modulePath, *args[ 1: ] )
 
@@ -94,9 +94,9 @@ def updateAngularAppModuleTs( config: TemplateConfiguration, app_module, exports
     #   imports:            search for 'imports: ['
     #   providers:          search for 'providers: ['
     #   entryComponents:    search for 'entryComponents: ['
-    with open( os.path.join( config.angular.sourceFolder,
-                             config.references.app_module.filename ), 'r' ) as stream:
-        lines = stream.readlines()
+    output = gencrud.util.output.files
+    lines = output.readlines( os.path.join( config.angular.sourceFolder,
+                                            config.references.app_module.filename ) )
 
     if config.options.backupFiles:
         gencrud.util.utils.backupFile( os.path.join( config.angular.sourceFolder,
@@ -135,11 +135,11 @@ def updateAngularAppModuleTs( config: TemplateConfiguration, app_module, exports
     gencrud.util.utils.replaceInList( lines, rangePos, bufferLines )
 
     updateImportSection( lines, app_module[ 'files' ] )
-    with open( os.path.join( config.angular.sourceFolder,
-                             config.references.app_module.filename ), 'w' ) as stream:
-        for line in lines:
-            stream.write( line )
-            logger.debug( line.replace( '\n', '' ) )
+    for line in lines:
+        logger.debug( line.replace( '\n', '' ) )
+
+    output.write( os.path.join( config.angular.sourceFolder,
+                                config.references.app_module.filename ), ''.join( lines ) )
 
     return
 
@@ -149,13 +149,13 @@ def updateAngularAppRoutingModuleTs( config: TemplateConfiguration, app_module )
         return []
 
     del app_module  # unused
-    if not os.path.isfile( os.path.join( config.angular.sourceFolder,
-                                         config.references.app_routing.module ) ):
+    output = gencrud.util.output.files
+    if not output.isfile( os.path.join( config.angular.sourceFolder,
+                                        config.references.app_routing.module ) ):
         return []
 
-    with open( os.path.join( config.angular.sourceFolder,
-                             config.references.app_routing.module ), 'r' ) as stream:
-        lines = stream.readlines()
+    lines = output.readlines( os.path.join( config.angular.sourceFolder,
+                                            config.references.app_routing.module ) )
 
     if config.options.backupFiles:
         gencrud.util.utils.backupFile( os.path.join( config.angular.sourceFolder,
@@ -163,31 +163,30 @@ def updateAngularAppRoutingModuleTs( config: TemplateConfiguration, app_module )
 
     imports = []
     entries = []
-    for cfg in config:
+    # Only the summaries are needed here, the objects may already be released
+    for cfg in config.summaries:
         if cfg.menu is not None and cfg.menu.menu is not None:
             # Do we have child pages for new and edit?
             if not config.options.useModule:
                 children = []
-                for action in cfg.actions:
-                    logger.info( "Action: {} {} {}".format( config.application, cfg.name, action ) )
-                    if action.type == 'screen' and action.isAngularRoute():
-                        logger.info( "Screen {} {} {}".format( config.application, cfg.name, action ) )
-                        children.append( {  'path': "'{}'".format( action.route.name ),
-                                            'component': "{}".format( action.route.cls ),
-                                            'data': {
-                                                'title': "'{cls} {label}'".format( cls = cfg.cls,
-                                                                                   label = action.route.label ),
-                                                'breadcrum': "'{}'".format( action.route.label )
-                                            }
-                                          } )
-                        filename = 'table.component' if action.route.cls.endswith( 'TableComponent' ) else 'screen.component'
-                        clsmod = cfg.name if action.route.module is None else action.route.module
-                        component = "import {{ {cls} }} from './{app}/{module}/{filename}';".format( cls = action.route.cls,
-                                                                                                     app = config.application,
-                                                                                                     module = clsmod,
-                                                                                                     filename = filename )
-                        if component not in imports:
-                            imports.append( component )
+                for route in cfg.screenRoutes:
+                    logger.info( "Screen {} {} {}".format( config.application, cfg.name, route ) )
+                    children.append( {  'path': "'{}'".format( route.name ),
+                                        'component': "{}".format( route.cls ),
+                                        'data': {
+                                            'title': "'{cls} {label}'".format( cls = cfg.cls,
+                                                                               label = route.label ),
+                                            'breadcrum': "'{}'".format( route.label )
+                                        }
+                                      } )
+                    filename = 'table.component' if route.cls.endswith( 'TableComponent' ) else 'screen.component'
+                    clsmod = cfg.name if route.module is None else route.module
+                    component = "import {{ {cls} }} from './{app}/{module}/{filename}';".format( cls = route.cls,
+                                                                                                 app = config.application,
+                                                                                                 module = clsmod,
+                                                                                                 filename = filename )
+                    if component not in imports:
+                        imports.append( component )
 
                 # Get the actual route
                 m = cfg.menu
@@ -299,10 +298,10 @@ def updateAngularAppRoutingModuleTs( config: TemplateConfiguration, app_module )
     gencrud.util.utils.replaceInList( lines, rangePos, bufferLines )
 
     updateImportSection( lines, imports )
-    with open( os.path.join( config.angular.sourceFolder, config.references.app_routing.module ), 'w' ) as stream:
-        for line in lines:
-            stream.write( line )
-            logger.debug( line.replace( '\n', '' ) )
+    for line in lines:
+        logger.debug( line.replace( '\n', '' ) )
+
+    output.write( os.path.join( config.angular.sourceFolder, config.references.app_routing.module ), ''.join( lines ) )
 
     return imports
 
@@ -372,9 +371,11 @@ class ServicesList( list ):
 
 
 def generateAngular( config: TemplateConfiguration, templates: list ):
+    output = gencrud.util.output.files
+    newline = '\n' if gencrud.util.utils.get_platform() == C_PLATFORM_LINUX else ''
     modules = ComponentsModules()
-    if not os.path.isdir( config.angular.sourceFolder ):
-        os.makedirs( config.angular.sourceFolder )
+    if not output.isdir( config.angular.sourceFolder ):
+        output.makedirs( config.angular.sourceFolder )
 
     dt = datetime.datetime.now()
     generationDateTime = dt.strftime( "%Y-%m-%d %H:%M:%S" )
@@ -383,7 +384,7 @@ def generateAngular( config: TemplateConfiguration, templates: list ):
         modulePath = os.path.join( config.angular.sourceFolder,
                                    config.application,
                                    cfg.name )
-        if os.path.isdir( modulePath ) and not config.options.overWriteFiles:
+        if output.isdir( modulePath ) and not config.options.overWriteFiles:
             raise gencrud.util.exceptions.ModuleExistsAlready( cfg, modulePath )
 
         makeAngularModule( config.angular.sourceFolder,
@@ -424,16 +425,16 @@ def generateAngular( config: TemplateConfiguration, templates: list ):
             if cfg.ignoreTemplates( templ ):
                 continue
 
-            if not config.options.overWriteFiles and os.path.isfile( templateFilename ):
+            if not config.options.overWriteFiles and output.isfile( templateFilename ):
                 continue
 
             logger.info( 'template    : {0}'.format( templ ) )
             if config.options.backupFiles:
                 gencrud.util.utils.backupFile( templateFilename )
 
-            if os.path.isfile( templateFilename ):
+            if output.isfile( templateFilename ):
                 # First remove the old file
-                os.remove( templateFilename )
+                output.remove( templateFilename )
 
             logger.info( 'template    : {0}'.format( templ ) )
             if C_SCREEN in templ:
@@ -462,33 +463,33 @@ def generateAngular( config: TemplateConfiguration, templates: list ):
             else:
                 pass
 
-            with open( templateFilename, gencrud.util.utils.C_FILEMODE_WRITE ) as stream:
-                try:
-                    for line in Template( filename = os.path.abspath( templ ) ).render( obj = cfg,
-                                                                                        root = config,
-                                                                                        version = gencrud.version.__version__,
-                                                                                        username = userName,
-                                                                                        services = servicesList,
-                                                                                        allServices=fullServiceList,
-                                                                                        date = generationDateTime ).split( '\n' ):
-
-                        if line.startswith( 'export ' ):
-                            modules.append( ( config.application,
-                                              cfg.name,
-                                              gencrud.util.utils.sourceName( templ ),
-                                              exportAndType( line ) ) )
-
-                        stream.write( line )
-                        if gencrud.util.utils.get_platform() == C_PLATFORM_LINUX:
-                            stream.write( '\n' )
-
-                except Exception:
-                    logger.error( "Mako exception:" )
-                    for line in exceptions.text_error_template().render_unicode().encode('ascii').split(b'\n'):
-                        logger.error( line )
-
-                    logger.error( "Mako done" )
-                    raise
+            buffer = []
+            try:
+                for line in Template( filename = os.path.abspath( templ ) ).render( obj = cfg,
+                                                                                    root = config,
+                                                                                    version = gencrud.version.__version__,
+                                                                                    username = userName,
+                                                                                    services = servicesList,
+                                                                                    allServices=fullServiceList,
+                                                                                    date = generationDateTime ).split( '\n' ):
+
+                    if line.startswith( 'export ' ):
+                        modules.append( ( config.application,
+                                          cfg.name,
+                                          gencrud.util.utils.sourceName( templ ),
+                                          exportAndType( line ) ) )
+
+                    buffer.append( line + newline )
+
+            except Exception:
+                logger.error( "Mako exception:" )
+                for line in exceptions.text_error_template().render_unicode().encode('ascii').split(b'\n'):
+                    logger.error( line )
+
+                logger.error( "Mako done" )
+                raise
+
+            output.write( templateFilename, ''.join( buffer ) )
 
     appModule = {}
     exportsModules = []
@@ -498,24 +499,25 @@ def generateAngular( config: TemplateConfiguration, templates: list ):
                                              app,
                                              mod,
                                              'app.module.json' )
-        if os.path.isfile( app_module_json_file ):
-            with open( app_module_json_file, 'r' ) as stream:
-                try:
-                    data = json.load( stream )
+        if output.isfile( app_module_json_file ):
+            try:
+                data = json.loads( output.read( app_module_json_file ) )
 
-                except Exception:
-                    logger.error( "Error in file: {0}".format( app_module_json_file ) )
-                    raise
+            except Exception:
+                logger.error( "Error in file: {0}".format( app_module_json_file ) )
+                raise
 
-                if appModule is None:
-                    appModule = data
+            if appModule is None:
+                appModule = data
 
-                else:
-                    appModule = gencrud.util.utils.joinJson( appModule, data )
+            else:
+                appModule = gencrud.util.utils.joinJson( appModule, data )
 
-            # This is just to give the OS some time to actually close the file
-            time.sleep(.01)
-            os.remove( app_module_json_file )
+            if not output.inMemory:
+                # This is just to give the OS some time to actually close the file
+                time.sleep(.01)
+
+            output.remove( app_module_json_file )
 
         exportsModules.append( { 'application':   app,
                                  'modules':       mod,
@@ -530,8 +532,7 @@ def generateAngular( config: TemplateConfiguration, templates: list ):
 
     appModule[ 'files' ] = newFiles
     # Write update 'app.module.json'
-    with open( os.path.join( config.angular.sourceFolder, 'app.module.json' ), 'w' ) as stream:
-        json.dump( appModule, stream, indent = 4 )
+    output.write( os.path.join( config.angular.sourceFolder, 'app.module.json' ), json.dumps( appModule, indent = 4 ) )
 
     logger.info( 'exportsModules' )
     for mod in exportsModules:
@@ -550,7 +551,7 @@ def generateAngular( config: TemplateConfiguration, templates: list ):
     logger.info( "appModule: {}".format( json.dumps( appModule, indent = 4 ) ) )
     updateAngularAppModuleTs( config, appModule, exportsModules )
 
-    os.remove( os.path.join( config.angular.sourceFolder, 'app.module.json' ) )
+    output.remove( os.path.join( config.angular.sourceFolder, 'app.module.json' ) )
     copyAngularCommon( config, config.angular.commonFolder,
                        os.path.join( config.angular.sourceFolder, 'common' ) )
     return
@@ -560,6 +561,8 @@ def createAngularComponentModuleTs( config: TemplateConfiguration, appModule: di
     if not config.options.useModule or not config.options.overWriteFiles:
         return appModule
 
+    output = gencrud.util.output.files
+    newline = '\n' if gencrud.util.utils.get_platform() == C_PLATFORM_LINUX else ''
     dt = datetime.datetime.now()
     generationDateTime = dt.strftime( "%Y-%m-%d %H:%M:%S" )
     userName = os.path.split( os.path.expanduser( "~" ) )[ 1 ]
@@ -575,27 +578,24 @@ def createAngularComponentModuleTs( config: TemplateConfiguration, appModule: di
             gencrud.util.utils.backupFile( filename )
 
         # Create the 'module.ts'
-        with open( filename, 'w' ) as stream:
-            # for item in cfg.modules.items:
-            #     print( item )
+        # for item in cfg.modules.items:
+        #     print( item )
+        try:
+            source = Template( filename = templ ).render( obj = cfg,
+                                                          root = config,
+                                                          username = userName,
+                                                          date = generationDateTime,
+                                                          version = gencrud.version.__version__ )
 
-            try:
-                for line in Template( filename = templ ).render( obj = cfg,
-                                                                 root = config,
-                                                                 username = userName,
-                                                                 date = generationDateTime,
-                                                                 version = gencrud.version.__version__ ).split( '\n' ):
-                    stream.write( line )
-                    if gencrud.util.utils.get_platform() == C_PLATFORM_LINUX:
-                        stream.write( '\n' )
+        except Exception:
+            logger.error("Mako exception:")
+            for line in exceptions.text_error_template().render_unicode().encode('ascii').split(b'\n'):
+                logger.error(line)
 
-            except Exception:
-                logger.error("Mako exception:")
-                for line in exceptions.text_error_template().render_unicode().encode('ascii').split(b'\n'):
-                    logger.error(line)
+            logger.error("Mako done")
+            raise
 
-                logger.error("Mako done")
-                raise
+        output.write( filename, ''.join( line + newline for line in source.split( '\n' ) ) )
 
         component = "import {{ {cls}Module }} from './{app}/{mod}/module';".format( cls = cfg.cls,
                                                                                     app = config.application,
@@ -650,27 +650,28 @@ def createAngularComponentModuleTs( config: TemplateConfiguration, appModule: di
 
 
 def copyAngularCommon( config, source, destination ):
+    output = gencrud.util.output.files
     files = os.listdir( source )
     for filename in files:
         if filename == 'gencrud.module.ts' and not config.options.useModule:
             continue
 
-        if not os.path.isfile( os.path.join( destination, filename ) ) and \
+        if not output.isfile( os.path.join( destination, filename ) ) and \
                os.path.isfile( os.path.join( source, filename ) ):
             logger.debug( "Copy new file {0} => {1}".format( os.path.join( source, filename ),
                                                       os.path.join( destination, filename ) ) )
-            if not os.path.isdir( destination ):
-                os.makedirs( destination )
+            if not output.isdir( destination ):
+                output.makedirs( destination )
 
-            shutil.copy( os.path.join( source, filename ),
+            output.copy( os.path.join( source, filename ),
                          os.path.join( destination, filename ) )
 
-        elif os.path.isfile( os.path.join( destination, filename ) ):
-            if sha256sum( os.path.join( destination, filename ) ) != sha256sum( os.path.join( source, filename ) ):
+        elif output.isfile( os.path.join( destination, filename ) ):
+            if output.sha256( os.path.join( destination, filename ) ) != sha256sum( os.path.join( source, filename ) ):
                 # Hash differs, therefore replace the file
                 logger.debug( "Hash differs, replace the file {0} => {1}".format( os.path.join( source, filename ),
                                                                                   os.path.join( destination, filename ) ) )
-                shutil.copy( os.path.join( source, filename ),
+                output.copy( os.path.join( source, filename ),
                              os.path.join( destination, filename ) )
 
             else:
@@ -21,7 +21,6 @@ import os
 import sys
 import yaml
 import logging
-import shutil
 import datetime
 import hashlib
 import gencrud.version
@@ -29,8 +28,10 @@ from mako.template import Template
 from gencrud.configuraton import TemplateConfiguration
 import gencrud.util.utils
 import gencrud.util.exceptions
+import gencrud.util.output
 from gencrud.util.positon import PositionInterface
 import gencrud.util.utils as API
+from gencrud.constants import C_FLAVOUR_SYNC
 
 logger = logging.getLogger()
 
@@ -50,46 +51,46 @@ MENU_ROUTE              = 'route'
 
 
 def makePythonModules( root_path, *args ):
-    def write__init__py():
-        with open( os.path.join( root_path, '__init__.py' ), 'w+' ) as stream:
-            # Write one newline to the file
-            print( '', file = stream )
+    output = gencrud.util.output.files
 
+    def write__init__py():
+        # Write one newline to the file
+        output.write( os.path.join( root_path, '__init__.py' ), '\n' )
         return
 
     if len( args ) > 0:
         root_path = os.path.join( root_path, args[ 0 ] )
-        if not os.path.isdir( root_path ):
-            os.mkdir( root_path )
+        if not output.isdir( root_path ):
+            output.mkdir( root_path )
 
         makePythonModules( root_path, *args[ 1: ] )
 
     if len( args ) > 0:
-        if not os.path.isfile( os.path.join( root_path, '__init__.py' ) ):
+        if not output.isfile( os.path.join( root_path, '__init__.py' ) ):
             write__init__py()
 
     return
 
 
 def updatePythonProject( config: TemplateConfiguration, app_module ):   # noqa
+    output = gencrud.util.output.files
     logger.debug( config.python.sourceFolder )
     # Copy the following files from the common-py folder to the source folder of the project
     for src_filename in ( 'common.py', 'main.py' ):
         fnd = os.path.abspath( os.path.join( config.python.sourceFolder, config.application, src_filename ) )
-        if not os.path.isfile( fnd ):
+        if not output.isfile( fnd ):
             fns = os.path.abspath( os.path.join( config.python.commonFolder, src_filename ) )
             logger.debug( "Source: {}\nTarget: {}".format( fns, fnd ) )
-            shutil.copy( fns, fnd )
+            output.copy( fns, fnd )
     def makeMenuId( menu,prefix ):
         return hashlib.md5( (prefix + menu.caption).encode('ascii') ).hexdigest().upper()
 
     # retrieve default global menu structure from menu.yaml
     menuFilename = os.path.join( config.python.sourceFolder, config.application, 'menu.yaml' )
-    if os.path.isfile( menuFilename ):
-        with open( menuFilename, 'r' )  as stream:
-            menuItems = yaml.load( stream, Loader = yaml.Loader )
-            if menuItems is None:
-                menuItems = []
+    if output.isfile( menuFilename ):
+        menuItems = yaml.load( output.read( menuFilename ), Loader = yaml.Loader )
+        if menuItems is None:
+            menuItems = []
 
     else:
         menuItems = []
@@ -157,58 +158,78 @@ def updatePythonProject( config: TemplateConfiguration, app_module ):   # noqa
                 items.insert( menu.index if menu.index >= 0 else (len( items ) + menu.index + 1), newMenuItem )
 
         return
-    for cfg in config:
-        if cfg.menu is None:
+    for summary in config.summaries:
+        if summary.menu is None:
             continue
-        processMenuStructure_V2( menuItems, cfg.menu )
+        processMenuStructure_V2( menuItems, summary.menu )
     # write new global menu file based on the changes in the module yaml files
-    with open( menuFilename, 'w' )  as stream:
-        yaml.dump( menuItems, stream, default_style=False, default_flow_style=False )
+    output.write( menuFilename, yaml.dump( menuItems, default_style=False, default_flow_style=False ) )
 
     return
 
 
 def updatePythonModels( config:  TemplateConfiguration ):
+    output = gencrud.util.output.files
     modelsFilename = os.path.join( config.python.sourceFolder, config.application, 'modules.yaml' )
-    if os.path.isfile( modelsFilename ):
-        with open( modelsFilename, 'r' ) as stream:
-            modules = yaml.load( stream, Loader = yaml.Loader )
+    if output.isfile( modelsFilename ):
+        modules = yaml.load( output.read( modelsFilename ), Loader = yaml.Loader )
 
     else:
         modules = []
 
-    for cfg in config:
+    for summary in config.summaries:
         """
         - module: testrun.cal
           model: Calendar
         """
-        module_name = "{}.{}".format( config.application, cfg.name )
+        module_name = "{}.{}".format( config.application, summary.name )
         found = False
         for module in modules:
             if module.get( 'module' ) == module_name:
-                module[ 'model' ] = cfg.cls
-                module[ 'table' ] = cfg.table.name.lower()
+                module[ 'model' ] = summary.cls
+                module[ 'table' ] = summary.tableName.lower()
                 found = True
                 break
 
 
         if not found:
             modules.append( { 'module': module_name,
-                              'model': cfg.cls,
-                              'table': cfg.table.name.lower() } )
+                              'model': summary.cls,
+                              'table': summary.tableName.lower() } )
 
-    with open( modelsFilename, 'w' ) as stream:
-        yaml.dump( modules, stream, Dumper = yaml.Dumper )
+    output.write( modelsFilename, yaml.dump( modules, Dumper = yaml.Dumper ) )
 
     # Now generate the models.py module
     template = os.path.abspath( os.path.join( config.python.commonFolder, 'models.py.templ' ) )
     modeles_py_file = os.path.join( config.python.sourceFolder, config.application, 'models.py' )
-    with open( modeles_py_file, 'w' ) as stream:
-        stream.write( Template( filename = template ).render( config = config, modules = modules ) )
+    output.write( modeles_py_file, Template( filename = template ).render( config = config, modules = modules ) )
 
     return modules
 
+def flavourTemplates( config: TemplateConfiguration, templates: list ) -> list:
+    """The templates of the backend flavour of the application, a template in the
+    folder of the flavour replaces the template with the same name.
+    """
+    folder = os.path.join( config.python.templateFolder, config.options.flavour )
+    if config.options.flavour != C_FLAVOUR_SYNC and not os.path.isdir( folder ):
+        logger.warning( "No templates for the flavour '{}' in {}".format( config.options.flavour,
+                                                                        config.python.templateFolder ) )
+
+    result = []
+    for templ in templates:
+        if not os.path.isfile( templ ):
+            continue
+
+        flavoured = os.path.join( folder, os.path.basename( templ ) )
+        result.append( os.path.abspath( flavoured ) if os.path.isfile( flavoured ) else templ )
+
+    return result
+
+
 def generatePython( config: TemplateConfiguration, templates: list ):
+    output = gencrud.util.output.files
+    templates = flavourTemplates( config, templates )
+    newline = '\n' if sys.platform.startswith( 'linux' ) else ''
     constants = []
     logger.info( 'application : {0}'.format( config.application ) )
     dt = datetime.datetime.now()
@@ -230,29 +251,25 @@ def generatePython( config: TemplateConfiguration, templates: list ):
             if cfg.ignoreTemplates( templ ):
                 continue
             logger.info( 'template    : {0}'.format( templ ) )
-            if not os.path.isdir( config.python.sourceFolder ):
-                os.makedirs( config.python.sourceFolder )
+            if not output.isdir( config.python.sourceFolder ):
+                output.makedirs( config.python.sourceFolder )
 
-            if os.path.isdir( modulePath ) and not config.options.overWriteFiles:
+            if output.isdir( modulePath ) and not config.options.overWriteFiles:
                 raise gencrud.util.exceptions.ModuleExistsAlready( cfg, modulePath )
             outputSourceFile = os.path.join( modulePath, gencrud.util.utils.sourceName( templ ) )
             if config.options.backupFiles:
                 gencrud.util.utils.backupFile( outputSourceFile )
-            if os.path.isfile( outputSourceFile ):
+            if output.isfile( outputSourceFile ):
                 # remove the file first
-                os.remove( outputSourceFile )
+                output.remove( outputSourceFile )
             makePythonModules( config.python.sourceFolder, config.application, cfg.name )
-            with open( outputSourceFile,
-                       gencrud.util.utils.C_FILEMODE_WRITE ) as stream:
-                for line in Template( filename = os.path.abspath( templ ) ).render( obj = cfg,
-                                                                                    root = config,
-                                                                                    modules = modules,
-                                                                                    date = generationDateTime,
-                                                                                    version = gencrud.version.__version__,
-                                                                                    username = userName ).split( '\n' ):
-                    stream.write( line )
-                    if sys.platform.startswith( 'linux' ):
-                        stream.write( '\n' )
+            source = Template( filename = os.path.abspath( templ ) ).render( obj = cfg,
+                                                                             root = config,
+                                                                             modules = modules,
+                                                                             date = generationDateTime,
+                                                                             version = gencrud.version.__version__,
+                                                                             username = userName )
+            output.write( outputSourceFile, ''.join( line + newline for line in source.split( '\n' ) ) )
         for column in cfg.table.columns:
             if column.ui is not None:
                 if column.ui.hasResolveList():
@@ -272,17 +289,16 @@ def generatePython( config: TemplateConfiguration, templates: list ):
             if config.options.backupFiles:
                 gencrud.util.utils.backupFile( filename )
 
-            with open( filename, 'w' ) as stream:
-                stream.writelines( constants )
+            output.write( filename, ''.join( constants ) )
         entryPointsFile = os.path.join( modulePath, 'entry_points.py' )
-        if len( cfg.actions.getCustomButtons() ) > 0 and not os.path.isfile( entryPointsFile ):
+        if len( cfg.actions.getCustomButtons() ) > 0 and not output.isfile( entryPointsFile ):
             # use the template from 'common-py'
             templateFolder  = config.python.commonFolder
             templateFile    = os.path.join( templateFolder, 'entry-points.py.templ' )
 
-            with open( entryPointsFile, gencrud.util.utils.C_FILEMODE_WRITE ) as stream:
-                with open( templateFile, 'r' ) as templateStream:
-                    for line in Template( templateStream ).render( obj = cfg, root = config ).split( '\n' ):
-                        stream.write( line + '\n' )
+            with open( templateFile, 'r' ) as templateStream:
+                source = Template( templateStream.read() ).render( obj = cfg, root = config )
+
+            output.write( entryPointsFile, ''.join( line + '\n' for line in source.split( '\n' ) ) )
     updatePythonProject( config, '' )
     return
@@ -21,7 +21,6 @@ import os
 import sys
 import yaml
 import logging
-import shutil
 import datetime
 import hashlib
 import gencrud.version
@@ -29,6 +28,7 @@ from mako.template import Template
 from gencrud.configuraton import TemplateConfiguration
 import gencrud.util.utils
 import gencrud.util.exceptions
+import gencrud.util.output
 from gencrud.util.positon import PositionInterface
 import gencrud.util.utils as API
 
@@ -50,22 +50,22 @@ MENU_ROUTE              = 'route'
 
 
 def makeUnittestModules( root_path, *args ):
-    def write__init__py():
-        with open( os.path.join( root_path, '__init__.py' ), 'w+' ) as stream:
-            # Write one newline to the file
-            print( '', file = stream )
+    output = gencrud.util.output.files
 
+    def write__init__py():
+        # Write one newline to the file
+        output.write( os.path.join( root_path, '__init__.py' ), '\n' )
         return
 
     if len( args ) > 0:
         root_path = os.path.join( root_path, args[ 0 ] )
-        if not os.path.isdir( root_path ):
-            os.mkdir( root_path )
+        if not output.isdir( root_path ):
+            output.mkdir( root_path )
 
         makeUnittestModules( root_path, *args[ 1: ] )
 
     if len( args ) > 0:
-        if not os.path.isfile( os.path.join( root_path, '__init__.py' ) ):
+        if not output.isfile( os.path.join( root_path, '__init__.py' ) ):
             write__init__py()
 
     return
@@ -76,20 +76,19 @@ def updateUnittestDirectory( config: TemplateConfiguration, app_module ):   # no
     # Copy the following files from the common-py folder to the source folder of the project
     for src_filename in ['generic.py']:
         fnd = os.path.abspath( os.path.join( config.unittest.sourceFolder, config.application, src_filename ) )
-        if not os.path.isfile( fnd ):
+        if not gencrud.util.output.files.isfile( fnd ):
             fns = os.path.abspath( os.path.join( config.unittest.commonFolder, src_filename ) )
             logger.debug( "Source: {}\nTarget: {}".format( fns, fnd ) )
-            shutil.copy( fns, fnd )
+            gencrud.util.output.files.copy( fns, fnd )
 
     return
 
 
 def generateCommonTemplateFiles( config:  TemplateConfiguration ):
-
+    output = gencrud.util.output.files
     modelsFilename = os.path.join( config.python.sourceFolder, config.application, 'modules.yaml' )
-    if os.path.isfile( modelsFilename ):
-        with open( modelsFilename, 'r' ) as stream:
-            modules = yaml.load( stream, Loader = yaml.Loader )
+    if output.isfile( modelsFilename ):
+        modules = yaml.load( output.read( modelsFilename ), Loader = yaml.Loader )
 
     else:
         modules = []
@@ -117,13 +116,14 @@ def generateCommonTemplateFiles( config:  TemplateConfiguration ):
     # Now generate the suite.py module
     template = os.path.abspath( os.path.join( config.unittest.commonFolder, 'suite.py.templ' ) )
     suite_py_file = os.path.join( config.unittest.sourceFolder, config.application, 'suite.py' )
-    with open( suite_py_file, 'w' ) as stream:
-        for line in  Template( filename = template ).render( config = config, modules = modules ).split( '\n' ):
-            stream.write( line )
+    source = Template( filename = template ).render( config = config, modules = modules )
+    output.write( suite_py_file, ''.join( source.split( '\n' ) ) )
 
     return
 
 def generateUnittest( config: TemplateConfiguration, templates: list ):
+    output = gencrud.util.output.files
+    newline = '\n' if sys.platform.startswith( 'linux' ) else ''
     logger.info( 'application : {0}'.format( config.application ) )
     dt = datetime.datetime.now()
     generationDateTime = dt.strftime( "%Y-%m-%d %H:%M:%S" )
@@ -144,28 +144,24 @@ def generateUnittest( config: TemplateConfiguration, templates: list ):
             if cfg.ignoreTemplates( templ ):
                 continue
             logger.info( 'template    : {0}'.format( templ ) )
-            if not os.path.isdir( config.unittest.sourceFolder ):
-                os.makedirs( config.unittest.sourceFolder )
+            if not output.isdir( config.unittest.sourceFolder ):
+                output.makedirs( config.unittest.sourceFolder )
 
-            if os.path.isdir( modulePath ) and not config.options.overWriteFiles:
+            if output.isdir( modulePath ) and not config.options.overWriteFiles:
                 raise gencrud.util.exceptions.ModuleExistsAlready( cfg, modulePath )
             outputSourceFile = os.path.join( modulePath, gencrud.util.utils.sourceName( templ ) )
             if config.options.backupFiles:
                 gencrud.util.utils.backupFile( outputSourceFile )
-            if os.path.isfile( outputSourceFile ):
+            if output.isfile( outputSourceFile ):
                 # remove the file first
-                os.remove( outputSourceFile )
+                output.remove( outputSourceFile )
             makeUnittestModules( config.unittest.sourceFolder, config.application, cfg.name )
-            with open( outputSourceFile,
-                       gencrud.util.utils.C_FILEMODE_WRITE ) as stream:
-                for line in Template( filename = os.path.abspath( templ ) ).render( obj = cfg,
-                                                                                    root = config,
-                                                                                    date = generationDateTime,
-                                                                                    version = gencrud.version.__version__,
-                                                                                    username = userName ).split( '\n' ):
-                    stream.write( line )
-                    if sys.platform.startswith( 'linux' ):
-                        stream.write( '\n' )
+            source = Template( filename = os.path.abspath( templ ) ).render( obj = cfg,
+                                                                             root = config,
+                                                                             date = generationDateTime,
+                                                                             version = gencrud.version.__version__,
+                                                                             username = userName )
+            output.write( outputSourceFile, ''.join( line + newline for line in source.split( '\n' ) ) )
 
     updateUnittestDirectory( config, '' )
     return
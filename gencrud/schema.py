@@ -75,6 +75,11 @@ GENCRUD_SCHEME = {
         'nogen': {
             'type': 'boolean'
         },
+        'controls': {
+            # true for the bundled templates/pyt-controls.yaml, the filename of
+            # a control definition file or the control definitions themselves
+            'type': [ 'boolean', 'string', 'object' ]
+        },
         'references': {
             'type': 'object',
             'additionalProperties': False,
@@ -111,6 +116,12 @@ GENCRUD_SCHEME = {
                 },
                 'use-module': {
                     'type': 'boolean'
+                },
+                'streaming': {
+                    'type': 'boolean'
+                },
+                'flavour': {
+                    'enum': [ 'sync', 'async' ]
                 }
             }
         },
@@ -256,6 +267,20 @@ GENCRUD_SCHEME = {
                         }
                     },
                     'ignore_templates': { 'type': 'array' },
+                    'cache': {
+                        'oneOf': [
+                            { 'type': 'boolean' },
+                            {
+                                'type': 'object',
+                                "additionalProperties": False,
+                                'properties': {
+                                    'ttl': { 'type': 'number', 'minimum': 0 },
+                                    'size': { 'type': 'integer', 'minimum': 1 }
+                                }
+                            }
+                        ]
+                    },
+                    'optimistic': { 'type': 'boolean' },
                     'injection': {
                         'type': 'object',
                         'properties': {
@@ -453,6 +478,40 @@ GENCRUD_SCHEME = {
                                 "optional": True
                             },
                             'unique-key': { 'type': 'string' },
+                            'indexes': {
+                                'type': 'array',
+                                'items': {
+                                    'type': 'object',
+                                    'required': [ 'columns' ],
+                                    "additionalProperties": False,
+                                    'properties': {
+                                        'name': {
+                                            'type': 'string'
+                                        },
+                                        'columns': {
+                                            'type': [ 'string', 'array' ],
+                                            'items': {
+                                                'type': 'string'
+                                            }
+                                        },
+                                        'unique': {
+                                            'type': 'boolean'
+                                        },
+                                        'where': {
+                                            'type': 'string'
+                                        },
+                                    }
+                                }
+                            },
+                            'autoIndex': {
+                                'type': 'boolean'
+                            },
+                            'changes': {
+                                'type': [ 'boolean', 'string' ]
+                            },
+                            'search': {
+                                'enum': [ 'like', 'fts5', 'tsvector' ]
+                            },
                             'viewSort': {
                                 'type': 'object',
                                 'required': [ 'field', 'direction' ],
@@ -464,6 +523,9 @@ GENCRUD_SCHEME = {
                                     'direction': {
                                         'enum': [ 'desc', 'asc' ]
                                     },
+                                    'keyset': {
+                                        'type': 'boolean'
+                                    },
                                 }
                             },
                             'hint': {
@@ -548,6 +610,9 @@ GENCRUD_SCHEME = {
                                         'unique-key': {
                                             'type': 'string'
                                         },
+                                        'load': {
+                                            'enum': [ 'selectin', 'joined', 'lazy' ]
+                                        },
                                         'label': {
                                             'type': 'string'
                                         },
@@ -19,8 +19,23 @@
 #
 */
 import { BehaviorSubject, Observable, throwError } from 'rxjs';
-import { HttpClient, HttpErrorResponse, HttpParams, HttpHeaders } from '@angular/common/http';
-import { tap } from 'rxjs/operators';
+import { HttpClient, HttpErrorResponse, HttpParams, HttpHeaders, HttpResponse } from '@angular/common/http';
+import { tap, map } from 'rxjs/operators';
+
+// The encodings of the list, pagedlist, keysetlist and select responses
+export const JSON_MIMETYPE = 'application/json';
+export const COLUMNAR_MIMETYPE = 'application/vnd.gencrud.columnar+json';
+export const MSGPACK_MIMETYPE = 'application/msgpack';
+
+// The MessagePack decoder, registered by the application, i.e. the decode() of @msgpack/msgpack.
+// Without it the msgpack responseFormat requests JSON, so the package is only needed when used.
+let msgpackDecode: ( data: ArrayBuffer ) => any = null;
+
+export function registerMsgpackDecoder( decoder: ( data: ArrayBuffer ) => any ): void
+{
+    msgpackDecode = decoder;
+    return;
+}
 
 export interface BackEndInfo
 {
@@ -35,11 +50,15 @@ export interface BackEndInfo
 export interface FilterColumn
 {
     column: string;
+    // One of the CONDITIONS_LIST values of the filter-header component, default 'EQ'
+    operator?: string;
+    value?: any;
 }
 
 export interface BackendColumnSort
 {
     column: string;
+    direction?: string;     // 'asc' or 'desc'
 }
 
 export interface FilteredListReq
@@ -48,6 +67,8 @@ export interface FilteredListReq
     pageSize: number;
     columns?: FilterColumn[];
     columnSort?: BackendColumnSort;
+    // Words that must all be found in the columns of the table view
+    search?: string;
 }
 
 export interface FilteredList<T>
@@ -58,6 +79,84 @@ export interface FilteredList<T>
     records: T;
 }
 
+export interface KeysetListReq
+{
+    pageSize: number;
+    cursor: string;
+    backwards: boolean;
+    columns?: FilterColumn[];
+}
+
+export interface KeysetList<T>
+{
+    pageSize: number;
+    next: string;
+    prev: string;
+    records: T;
+}
+
+export interface ChangesList<T>
+{
+    // The since of the next request
+    token: string;
+    // The records are all records, instead of the changed ones
+    reset: boolean;
+    records: T;
+    deleted: any[];
+}
+
+export interface ColumnarList
+{
+    columns: string[];
+    data: any[][];
+}
+
+/**
+ *  Turns a columnar list, or the columnar records of a paged list, back into records.
+ */
+export function fromColumnar( value: any ): any
+{
+    if ( value !== null && Array.isArray( value.columns ) && Array.isArray( value.data ) )
+    {
+        const columns: string[] = value.columns;
+        return value.data.map( ( row: any[] ) => {
+            const record = {};
+            columns.forEach( ( column, idx ) => record[ column ] = row[ idx ] );
+            return record;
+        } );
+    }
+    if ( value !== null && typeof value === 'object' && value.records !== undefined )
+    {
+        value.records = fromColumnar( value.records );
+    }
+    return value;
+}
+
+/**
+ *  Applies the response of /changes to the records; removes the deleted ones, replaces the
+ *  updated ones by primary key and adds the inserted ones.
+ */
+export function mergeChanges<T>( data: T[], changes: ChangesList<T[]>, primaryKey: string ): T[]
+{
+    if ( changes.reset )
+    {
+        return changes.records;
+    }
+    const deleted = new Set( changes.deleted );
+    const changed = new Map<any, T>( changes.records.map( record => [ record[ primaryKey ], record ] as [ any, T ] ) );
+    const result = data.filter( record => !deleted.has( record[ primaryKey ] ) ).map( record => {
+        const update = changed.get( record[ primaryKey ] );
+        if ( update === undefined )
+        {
+            return record;
+        }
+        changed.delete( record[ primaryKey ] );
+        return update;
+    } );
+    changed.forEach( record => result.push( record ) );
+    return result;
+}
+
 export class BackendError extends Error
 {
     public code: number;
@@ -94,6 +193,19 @@ export class CrudDataService<T>
     public _pageIndex: number;
     public _pageSize: number;
     public _recordCount: number;
+    // Set by the generated service when the backend has the /keysetlist endpoint
+    public keysetPaging: boolean = false;
+    public _nextCursor: string = null;
+    public _prevCursor: string = null;
+    // Set by the generated service when the backend has the /changes endpoint
+    public changesTracking: boolean = false;
+    // Set by the generated service, the records of add, update and delete are applied by it
+    public primaryKey: string = null;
+    // Applies add, update and delete before the backend answers and rolls them back when it fails
+    public optimisticUpdates: boolean = false;
+    protected _changesToken: string = null;
+    // The mimetype the list responses are requested in, JSON_MIMETYPE, COLUMNAR_MIMETYPE or MSGPACK_MIMETYPE
+    public responseFormat: string = JSON_MIMETYPE;
     dataChange: BehaviorSubject<T[]> = new BehaviorSubject<T[]>([]);
     // Temporarily stores data from dialogs
     dialogData: T;
@@ -124,6 +236,37 @@ export class CrudDataService<T>
         return this.dialogData;
     }
 
+    /**
+     *  Requests a list endpoint in the responseFormat and decodes the response to
+     *  what the JSON encoding would give, so the callers do not see the difference.
+     */
+    protected requestList<R>( method: string, uri: string, body: any = null, params: HttpParams = null ): Observable<R>
+    {
+        const format = ( this.responseFormat === MSGPACK_MIMETYPE && msgpackDecode === null ) ? JSON_MIMETYPE
+                                                                                              : this.responseFormat;
+        const headers = new HttpHeaders( { Accept: format + ', ' + JSON_MIMETYPE + ';q=0.5' } );
+        if ( format !== MSGPACK_MIMETYPE )
+        {
+            return this.httpClient.request<any>( method, this._uri + uri, { body, params, headers } ).pipe(
+                map( data => fromColumnar( data ) as R )
+            );
+        }
+        return this.httpClient.request( method, this._uri + uri, { body,
+                                                                  params,
+                                                                  headers,
+                                                                  observe: 'response',
+                                                                  responseType: 'arraybuffer' } ).pipe(
+            map( ( response: HttpResponse<ArrayBuffer> ) => {
+                if ( ( response.headers.get( 'Content-Type' ) || '' ).startsWith( MSGPACK_MIMETYPE ) )
+                {
+                    return msgpackDecode( response.body ) as R;
+                }
+                // The backend does not have msgpack installed
+                return fromColumnar( JSON.parse( new TextDecoder().decode( response.body ) ) ) as R;
+            } )
+        );
+    }
+
     /** CRUD METHODS */
     public getAll( _backend_filter: any ): void
     {
@@ -133,7 +276,14 @@ export class CrudDataService<T>
             this._backend_filter = _backend_filter;
             uri += '/' + _backend_filter.id + '/' + _backend_filter.value;
         }
-        this.httpClient.get<T[]>( this._uri + uri ).subscribe(
+        else if ( this.changesTracking && this._backend_filter === null )
+        {
+            // All records through /changes, for the token of the following refreshes
+            this._changesToken = null;
+            this.getChanges();
+            return;
+        }
+        this.requestList<T[]>( 'GET', uri ).subscribe(
             data => {
                 this.dataChange.next( data );
             },
@@ -145,12 +295,58 @@ export class CrudDataService<T>
         return;
     }
 
+    /**
+     *  Updates the records with the changes since the previous request of all records
+     *  or changes, when the backend tracks the changes of the table, otherwise the
+     *  records are requested again.
+     */
+    public refresh(): void
+    {
+        if ( this.changesTracking && this._backend_filter === null && !this.keysetPaging )
+        {
+            this.getChanges();
+        }
+        else
+        {
+            this.getAll( this._backend_filter );
+        }
+        return;
+    }
+
+    public getChanges(): void
+    {
+        this.changes( this._changesToken ).subscribe(
+            data => {
+                this._changesToken = data.token;
+                if ( data.reset || data.records.length > 0 || data.deleted.length > 0 )
+                {
+                    this.dataChange.next( mergeChanges( this.dataChange.value, data, this.primaryKey ) );
+                }
+            },
+            (error: HttpErrorResponse) => {
+                throw new BackendError( error.message, error.error );
+            }
+        );
+        return;
+    }
+
+    public changes( since: string = null ): Observable<ChangesList<T[]>>
+    {
+        let params = new HttpParams();
+        if ( since !== null )
+        {
+            params = params.set( 'since', since );
+        }
+        return this.requestList<ChangesList<T[]>>( 'GET', '/changes', null, params );
+    }
+
     	public getPagedList( page: number
 						, pageSize: number
 						, columns: FilterColumn[]
-						, columnSort: BackendColumnSort = null ): void
+						, columnSort: BackendColumnSort = null
+						, search: string = null ): void
 	{
-		this.pagedList( page, pageSize, columns, columnSort ).subscribe(
+		this.pagedList( page, pageSize, columns, columnSort, search ).subscribe(
 			data => {
 				console.log( "pagedList", data );
 				this.dataChange.next( data.records );
@@ -168,18 +364,62 @@ export class CrudDataService<T>
 	public pagedList( page: number
 					, pageSize: number
 					, columns: FilterColumn[]
-					, columnSort: BackendColumnSort = null ): Observable<FilteredList<T[]>>
+					, columnSort: BackendColumnSort = null
+					, search: string = null ): Observable<FilteredList<T[]>>
     {
 		const params: FilteredListReq = {
 			page,
 			pageSize,
 			columns,
-			columnSort
+			columnSort,
+			search
 		};
-		return this.httpClient.post<FilteredList<T[]>>( this._uri + '/pagedlist',
-														params );
+		return this.requestList<FilteredList<T[]>>( 'POST', '/pagedlist', params );
+    }
+
+
+    public getKeysetPage( pageSize: number
+                        , cursor: string = null
+                        , backwards: boolean = false
+                        , columns: FilterColumn[] = null ): void
+    {
+        this.keysetList( pageSize, cursor, backwards, columns ).subscribe(
+            data => {
+                this._pageSize = data.pageSize;
+                this._nextCursor = data.next;
+                this._prevCursor = data.prev;
+                this.dataChange.next( data.records );
+            },
+            (error: HttpErrorResponse) => {
+                throw new BackendError( error.message, error.error );
+            }
+        );
+        return;
     }
 
+    public keysetList( pageSize: number
+                     , cursor: string = null
+                     , backwards: boolean = false
+                     , columns: FilterColumn[] = null ): Observable<KeysetList<T[]>>
+    {
+        const params: KeysetListReq = {
+            pageSize,
+            cursor,
+            backwards,
+            columns
+        };
+        return this.requestList<KeysetList<T[]>>( 'POST', '/keysetlist', params );
+    }
+
+    /**
+     *  The records where all words of the text are found in the columns of the table view,
+     *  searched by the backend.
+     */
+    public search( text: string, limit: number = 100 ): Observable<T[]>
+    {
+        const params = new HttpParams().set( 'q', text ).set( 'limit', String( limit ) );
+        return this.requestList<T[]>( 'GET', '/search', null, params );
+    }
 
     public list( _backend_filter: any ): Observable<T[]>
     {
@@ -189,7 +429,7 @@ export class CrudDataService<T>
             this._backend_filter = _backend_filter;
             uri += '/' + _backend_filter.id + '/' + _backend_filter.value;
         }
-        return this.httpClient.get<T[]>( this._uri + uri );
+        return this.requestList<T[]>( 'GET', uri );
     }
 
     public getSelectListSimple( value: string, label: string, initial: any = null, final: any = null ): Observable<PytSelectList[]>
@@ -203,7 +443,7 @@ export class CrudDataService<T>
         {
             listParams.set( 'final', final );
         }
-        return this.httpClient.get<PytSelectList[]>( this._uri + '/select', { params: listParams } );
+        return this.requestList<PytSelectList[]>( 'GET', '/select', null, listParams );
     }
 
     public getSelectList( value: string, label: string, initial: any = null, final: any = null ): Observable<PytSelectList[]>
@@ -218,7 +458,7 @@ export class CrudDataService<T>
             listParams.set( 'final', final );
         }
         return ( Observable.create( observer => {
-            this.httpClient.get<PytSelectList[]>( this._uri + '/select', { params: listParams } )
+            this.requestList<PytSelectList[]>( 'GET', '/select', null, listParams )
             .subscribe( ( data ) => {
                     if ( this.debug )
                     {
@@ -246,7 +486,7 @@ export class CrudDataService<T>
             listParams.set( 'final', final );
         }
         return ( Observable.create( observer => {
-            this.httpClient.get<PytSelectList[]>( this._uri + '/select', { params: listParams } )
+            this.requestList<PytSelectList[]>( 'GET', '/select', null, listParams )
             .subscribe( ( data ) => {
                     if ( this.debug )
                     {
@@ -309,6 +549,67 @@ export class CrudDataService<T>
         return;
     }
 
+    protected get optimistic(): boolean
+    {
+        return this.optimisticUpdates && this.primaryKey !== null;
+    }
+
+    protected recordIndex( key: any ): number
+    {
+        return this.dataChange.value.findIndex( record => String( record[ this.primaryKey ] ) === String( key ) );
+    }
+
+    /**
+     *  Replaces the record that is replace, or else the record with the same primary key,
+     *  by the record, or adds it when there is none.
+     */
+    protected patchRecord( record: T, replace: T = null ): void
+    {
+        const data = this.dataChange.value.slice();
+        let index = replace !== null ? data.indexOf( replace ) : -1;
+        if ( index < 0 )
+        {
+            index = this.recordIndex( record[ this.primaryKey ] );
+        }
+        if ( index < 0 )
+        {
+            data.push( record );
+        }
+        else
+        {
+            data[ index ] = record;
+        }
+        this.dataChange.next( data );
+        return;
+    }
+
+    /**
+     *  Removes the record with the primary key, returns it with its index for restoreRecord().
+     */
+    protected removeRecord( key: any ): { index: number, record: T }
+    {
+        const index = this.recordIndex( key );
+        if ( index < 0 )
+        {
+            return { index, record: null };
+        }
+        const data = this.dataChange.value.slice();
+        const record = data.splice( index, 1 )[ 0 ];
+        this.dataChange.next( data );
+        return { index, record };
+    }
+
+    protected restoreRecord( removed: { index: number, record: T } ): void
+    {
+        if ( removed.record !== null )
+        {
+            const data = this.dataChange.value.slice();
+            data.splice( Math.min( removed.index, data.length ), 0, removed.record );
+            this.dataChange.next( data );
+        }
+        return;
+    }
+
     public addRecord( record: T ): void
     {
         if ( this.debug )
@@ -316,14 +617,31 @@ export class CrudDataService<T>
             console.log( 'addRecord', record );
         }
         this.dialogData = record;
+        // The backend assigns the primary key, the record is replaced by the one it returns
+        const pending: T = this.optimistic ? Object.assign( {}, record ) : null;
+        if ( pending !== null )
+        {
+            this.dataChange.next( this.dataChange.value.concat( [ pending ] ) );
+        }
         this.httpClient.post<T>( this._uri + '/new', record ).subscribe(result => {
             if ( this.debug )
             {
                 console.log( result );
             }
-            this.getAll( this._backend_filter );
+            if ( this.primaryKey !== null )
+            {
+                this.patchRecord( result, pending );
+            }
+            else
+            {
+                this.refresh();
+            }
         },
         (error: HttpErrorResponse) => {
+            if ( pending !== null )
+            {
+                this.dataChange.next( this.dataChange.value.filter( item => item !== pending ) );
+            }
             throw new BackendError( error.message, error.error );
         });
         return;
@@ -364,22 +682,42 @@ export class CrudDataService<T>
             console.log( 'updateRecord.orignal ', this.dialogData );
             console.log( 'updateRecord.updated ', record );
         }
+        // A copy, the record in the table view stays as it is until it is patched
+        const original: T = this.dialogData;
+        const updated: T = Object.assign( {}, this.dialogData );
         for ( const key of Object.keys( record ) )
         {
             if ( this.debug )
             {
                 console.log( 'update key ' + key + ' with value ', record[ key ] );
             }
-            this.dialogData[ key ] = record[ key ];
+            updated[ key ] = record[ key ];
+        }
+        this.dialogData = updated;
+        const optimistic = this.optimistic;
+        if ( optimistic )
+        {
+            this.patchRecord( updated, original );
         }
-        this.httpClient.post<T>( this._uri + '/update', this.dialogData ).subscribe( result => {
+        this.httpClient.post<T>( this._uri + '/update', updated ).subscribe( result => {
             if ( this.debug )
             {
                 console.log ( result );
             }
-            this.getAll( this._backend_filter );
+            if ( this.primaryKey !== null )
+            {
+                this.patchRecord( result, optimistic ? updated : original );
+            }
+            else
+            {
+                this.refresh();
+            }
         },
         (error: HttpErrorResponse) => {
+            if ( optimistic && original !== null )
+            {
+                this.patchRecord( original, updated );
+            }
             throw new BackendError( error.message, error.error );
         });
         return;
@@ -388,14 +726,26 @@ export class CrudDataService<T>
     public deleteRecord( record: string ): void
     {
         console.log( 'deleteRecord', record );
+        const removed = this.optimistic ? this.removeRecord( record ) : null;
         this.httpClient.delete<T>( this._uri + '/' + record ).subscribe( result => {
             if ( this.debug )
             {
                 console.log ( result );
             }
-            this.getAll( this._backend_filter );
+            if ( this.primaryKey === null )
+            {
+                this.refresh();
+            }
+            else if ( removed === null )
+            {
+                this.removeRecord( record );
+            }
         },
         (error: HttpErrorResponse) => {
+            if ( removed !== null )
+            {
+                this.restoreRecord( removed );
+            }
             throw new BackendError( error.message, error.error );
         });
         return;
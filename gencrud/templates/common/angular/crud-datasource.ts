@@ -24,7 +24,7 @@ import { PageEvent } from '@angular/material';
 import { BehaviorSubject, merge, Observable } from 'rxjs';
 import { MatPaginator, MatSort } from '@angular/material';
 import { map } from 'rxjs/operators';
-import { CrudDataService } from './crud-dataservice';
+import { CrudDataService, FilterColumn } from './crud-dataservice';
 import * as moment from 'moment';
 
 
@@ -70,6 +70,28 @@ export class CrudDataSource<T> extends DataSource<T>
         return ( record );
     }
 
+    public get backendColumns(): FilterColumn[]
+    {
+        if ( this._backend_filter === undefined || this._backend_filter === null )
+        {
+            return ( null );
+        }
+        return ( [ { column: this._backend_filter.id, value: this._backend_filter.value } ] );
+    }
+
+    /** The paginator length, with keyset paging the total is unknown, so only
+     *  announce one record more when there is a next page. */
+    public get length(): number
+    {
+        if ( this._databaseTable.keysetPaging )
+        {
+            return ( ( this._paginator.pageIndex * this._paginator.pageSize ) +
+                     this.renderedData.length +
+                     ( this._databaseTable._nextCursor !== null ? 1 : 0 ) );
+        }
+        return ( this.filteredData.length );
+    }
+
     public makeSearchString( record: any ): string
     {
         return ( '' );
@@ -86,9 +108,23 @@ export class CrudDataSource<T> extends DataSource<T>
             this.pageEvent
         ];
 
-        this._databaseTable.getAll( this._backend_filter );
+        if ( this._databaseTable.keysetPaging )
+        {
+            this._databaseTable.getKeysetPage( this._paginator.pageSize, null, false, this.backendColumns );
+        }
+        else
+        {
+            this._databaseTable.getAll( this._backend_filter );
+        }
 
         return merge(...displayDataChanges).pipe(map( () => {
+            if ( this._databaseTable.keysetPaging )
+            {
+                // The backend already delivers the filtered and sorted page
+                this.filteredData = this.castRecords( this._databaseTable.data.slice() );
+                this.renderedData = this.filteredData;
+                return ( this.renderedData );
+            }
             // Filter data
             this.filteredData = this.castRecords( this._databaseTable.data.slice().filter((record: any) => {
                 const searchStr = this.makeSearchString( record );
@@ -128,13 +128,8 @@ export class TableBaseComponent<T> extends Subscribers implements OnInit, OnDest
             console.log( 'editRecord() dialog result ', result );
             if ( result === 1 )
             {
-                // When using an edit things are little different,
-                // firstly we find record inside DataService by id
-                console.log( 'editRecord() updating index ', foundIndex );
-                // Then you update that record using data from
-                // dialogData (values you entered)
-                this.dataService.dataChange.value[ foundIndex ] = this.dataService.getDialogData();
-                // And lastly refresh table
+                // The data service replaces the record by primary key with the one the
+                // backend returns, or already did with the optimistic updates
                 this.refreshTable();
             }
             else
@@ -147,6 +142,24 @@ export class TableBaseComponent<T> extends Subscribers implements OnInit, OnDest
 
     public pagingEvent( $event )
     {
+        if ( this.dataService.keysetPaging )
+        {
+            if ( $event.pageIndex === 0 || $event.pageSize !== this.pageSize )
+            {
+                $event.pageIndex = 0;
+                this.dataService.getKeysetPage( $event.pageSize, null, false, this.dataSource.backendColumns );
+            }
+            else if ( $event.pageIndex > $event.previousPageIndex )
+            {
+                this.dataService.getKeysetPage( $event.pageSize, this.dataService._nextCursor, false,
+                                                this.dataSource.backendColumns );
+            }
+            else
+            {
+                this.dataService.getKeysetPage( $event.pageSize, this.dataService._prevCursor, true,
+                                                this.dataSource.backendColumns );
+            }
+        }
         this.pageSize = $event.pageSize;
         localStorage.setItem( this.componentName + '.size', $event.pageSize );
         localStorage.setItem( this.componentName + '.index', $event.pageIndex );
@@ -183,10 +196,8 @@ export class TableBaseComponent<T> extends Subscribers implements OnInit, OnDest
             console.log( 'deleteItem() dialog result ', result );
             if ( result === 1 )
             {
-                const foundIndex = this.dataService.dataChange.value.findIndex( x =>
-                                    x[ 0 ] === this.id );
-                console.log( 'deleteItem() removing index ', foundIndex );
-                this.dataService.dataChange.value.splice( foundIndex, 0 );
+                // The data service removes the record by primary key when the backend
+                // deleted it, or already did with the optimistic updates
                 this.refreshTable();
             }
             else
@@ -16,8 +16,25 @@
 #   Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor,
 #   Boston, MA 02110-1301 USA
 #
+import os
+import json
+import asyncio
+import time
+import uuid
+import base64
+import sqlite3
+import decimal
+import hashlib
 import datetime
+import functools
+import collections
+import threading
 import sqlalchemy.sql.sqltypes
+from flask import request, make_response, jsonify, g, has_request_context, json as flaskJson
+from sqlalchemy import or_, and_, cast, event, func, literal_column
+from sqlalchemy.orm import aliased, load_only, selectinload, object_session, Session, sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlalchemy.exc import IntegrityError
 from dateutil import tz
 
 try:
@@ -27,24 +44,39 @@ except ModuleNotFoundError:
     raise SystemExit("You need to include the module webapp2. Follow instructions " +
         "on https://github.com/pe2mbs/gencrud/blob/master/doc/MANUAL.md")
 
+try:
+    import msgpack
+except ModuleNotFoundError:
+    # Optional, without it the list endpoints only answer in JSON
+    msgpack = None
+
+try:
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+except ImportError:
+    # SQLAlchemy before 1.4, only the sync views
+    AsyncSession = create_async_engine = None
 
-def convertDateTime( value ):
-    value = value[ 0:22 ] + value[ 23: ]
-    API.app.logger.debug( 'datetime.datetime.value: {}'.format( value ) )
-    if value.startswith( '0000-00-00' ):
-        value = datetime.datetime.utcnow()
 
-    elif not value[ 0 ].isdigit():
+UTC_ZONE        = tz.tzutc()
+LOCAL_ZONE      = tz.tzlocal()
+# Python 3.7 and later
+_fromisoformat  = getattr( datetime.datetime, 'fromisoformat', None )
+
+
+def convertDateTimeFormats( value ):
+    """The date/time formats the frontend sends, parsed with strptime()"""
+    if not value[ 0 ].isdigit():
         # 'Tue Aug 19 1975 23:15:30 GMT+0200 (CEST)'
         value = value.split( '(' )[ 0 ].strip()
         try:
-            value = datetime.datetime.strptime( value,'%a %b %d %Y %H:%M:%S %Z%z' )
+            return datetime.datetime.strptime( value,'%a %b %d %Y %H:%M:%S %Z%z' )
 
         except Exception:
-            value = datetime.datetime.strptime( value,'%a %b %d %Y %H:%M:%S %z%Z' )
+            return datetime.datetime.strptime( value,'%a %b %d %Y %H:%M:%S %z%Z' )
 
-    # ELSE starts with digit
-    elif value.endswith( 'Z' ):
+    # Removes the ':' of a '+HH:MM' timezone, strptime() of Python 3.6 does not accept it
+    value = value[ 0:22 ] + value[ 23: ]
+    if value.endswith( 'Z' ):
         # ISO format without timezone
         value = datetime.datetime.strptime( value,'%Y-%m-%dT%H:%M:%S.%fZ' )
 
@@ -63,109 +95,1582 @@ def convertDateTime( value ):
     return value
 
 
+def convertDateTime( value ):
+    if value.startswith( '0000-00-00' ):
+        return datetime.datetime.utcnow()
+
+    if _fromisoformat is not None and value[ :1 ].isdigit():
+        # Fast path for the ISO formats, 'Z' (UTC) is stored without timezone
+        try:
+            if value.endswith( 'Z' ):
+                return _fromisoformat( value[ :-1 ] )
+
+            return _fromisoformat( value )
+
+        except ValueError:
+            pass
+
+    return convertDateTimeFormats( value )
+
+
+INTEGER_TYPES   = ( sqlalchemy.sql.sqltypes.Integer,
+                    sqlalchemy.sql.sqltypes.INTEGER,
+                    sqlalchemy.sql.sqltypes.BigInteger,
+                    sqlalchemy.sql.sqltypes.INT,
+                    sqlalchemy.sql.sqltypes.BIGINT )
+FLOAT_TYPES     = ( sqlalchemy.sql.sqltypes.REAL,
+                    sqlalchemy.sql.sqltypes.Float,
+                    sqlalchemy.sql.sqltypes.FLOAT,
+                    sqlalchemy.sql.sqltypes.DECIMAL,
+                    sqlalchemy.sql.sqltypes.Numeric,
+                    sqlalchemy.sql.sqltypes.NUMERIC )
+DATETIME_TYPES  = ( sqlalchemy.sql.sqltypes.DateTime,
+                    sqlalchemy.sql.sqltypes.DATETIME,
+                    sqlalchemy.sql.sqltypes.TIMESTAMP )
+DATE_TYPES      = ( sqlalchemy.sql.sqltypes.Date,
+                    sqlalchemy.sql.sqltypes.DATE )
+TIME_TYPES      = ( sqlalchemy.sql.sqltypes.Time,
+                    sqlalchemy.sql.sqltypes.TIME )
+BOOLEAN_TYPES   = ( sqlalchemy.sql.sqltypes.Boolean,
+                    sqlalchemy.sql.sqltypes.BOOLEAN )
+
+
+def convertInteger( value, default = None ):
+    try:
+        if value is not None:
+            return int( str( value ) )
+
+        return default
+
+    except Exception:
+        return default if isinstance( default, int ) else 0
+
+
+def convertFloat( value, default = None ):
+    try:
+        if value is not None:
+            return float( str( value ) )
+
+        return default
+
+    except Exception:
+        return default if isinstance( default, float ) else 0.0
+
+
+def convertDateTimeField( value, default = None ):
+    if value is not None:
+        return convertDateTime( value )
+
+    return default
+
+
+def convertDate( value, default = None ):
+    # TODO: needs to be tested
+    if value is None:
+        return default
+
+    # UTC format, need to add local time diff
+    if 'T' in value:
+        utc  = convertDateTime( value )
+        value = utc.replace( tzinfo = UTC_ZONE ).astimezone( LOCAL_ZONE )
+
+    else:
+        value = datetime.datetime.strptime( value, '%Y-%m-%d' )
+
+    return value.date()
+
+
+def convertTime( value, default = None ):
+    # TODO: needs to be tested
+    if value is not None:
+        return datetime.datetime.strptime( value, '%H:%M:%S' ).time()
+
+    return default
+
+
+def convertBoolean( value, default = None ):
+    if type( value ) is int or type( value ) is str:
+        return bool( value )
+
+    elif value is None:
+        return default if default is not None else False
+
+    return value
+
+
+def convertNothing( value, default = None ):
+    return value
+
+
+def fieldConverter( _type ):
+    """Returns the conversion function for a column type"""
+    if isinstance( _type, INTEGER_TYPES ):
+        return convertInteger
+
+    elif isinstance( _type, FLOAT_TYPES ):
+        return convertFloat
+
+    elif isinstance( _type, DATETIME_TYPES ):
+        return convertDateTimeField
+
+    elif isinstance( _type, DATE_TYPES ):
+        return convertDate
+
+    elif isinstance( _type, TIME_TYPES ):
+        return convertTime
+
+    elif isinstance( _type, BOOLEAN_TYPES ):
+        return convertBoolean
+
+    return convertNothing
+
+
+class FieldConverters( dict ):
+    """The conversion function per attribute and column name of a model, a name
+    that is not found is looked up in lower case, as fieldConversion() always did.
+    """
+    def __missing__( self, key ):
+        lower = key.lower()
+        if lower == key:
+            raise KeyError( key )
+
+        return self[ lower ]
+
+    def unknown( self, names ) -> list:
+        """Returns the names that have no conversion function"""
+        return [ name for name in names if name not in self and name.lower() not in self ]
+
+
+def fieldConverters( model ) -> FieldConverters:
+    """Returns the conversion function per attribute and column name of the model,
+    the views make this table once at import time.
+    """
+    converters = FieldConverters()
+    for column in model.__table__.columns:
+        converters[ column.name ] = fieldConverter( column.type )
+
+    for prop in model.__mapper__.column_attrs:
+        converters[ prop.key ] = fieldConverter( prop.columns[ 0 ].type )
+
+    return converters
+
+
+# Converter tables per model class for fieldConversion()
+_modelConverters = {}
+
+
+def modelConverters( model ) -> FieldConverters:
+    """The conversion table of the model class, made once"""
+    converters = _modelConverters.get( model )
+    if converters is None:
+        converters = _modelConverters[ model ] = fieldConverters( model )
+
+    return converters
+
+
 def fieldConversion( record, key, value, default = None ):
+    cls = record if isinstance( record, type ) else type( record )
+    return modelConverters( cls )[ key ]( value, default )
+
+
+def isEmpty( column ):
+    if isinstance( column.type, sqlalchemy.sql.sqltypes.String ):
+        return or_( column.is_( None ), column == '' )
+
+    return column.is_( None )
+
+
+def asString( column ):
+    if isinstance( column.type, sqlalchemy.sql.sqltypes.String ):
+        return column
+
+    return cast( column, sqlalchemy.sql.sqltypes.String )
+
+
+def likeWord( column, word ):
+    """The column contains the word, case insensitive"""
+    pattern = word.replace( '/', '//' ).replace( '%', '/%' ).replace( '_', '/_' )
+    return asString( column ).ilike( '%{}%'.format( pattern ), escape = '/' )
+
+
+SEARCH_LIKE     = 'like'
+SEARCH_FTS5     = 'fts5'
+SEARCH_TSVECTOR = 'tsvector'
+
+
+# The CONDITIONS_LIST operators of the frontend filter-header component as SQL expressions
+PAGED_LIST_CONDITIONS = {
+    'EQ':       lambda column, value: column == value,
+    '!EQ':      lambda column, value: column != value,
+    'GT':       lambda column, value: column > value,
+    'GT|EQ':    lambda column, value: column >= value,
+    'LE':       lambda column, value: column < value,
+    'LE|EQ':    lambda column, value: column <= value,
+    'CO':       lambda column, value: asString( column ).contains( str( value ), autoescape = True ),
+    '!CO':      lambda column, value: ~asString( column ).contains( str( value ), autoescape = True ),
+    'EM':       lambda column, value: isEmpty( column ),
+    '!EM':      lambda column, value: ~isEmpty( column ),
+}
+
+
+class PagedListQuery( object ):
+    """Builds the query for a /pagedlist request;
+
+        { "page": 0, "pageSize": 25,
+          "columns": [ { "column": "NAME", "operator": "CO", "value": "abc" } ],
+          "columnSort": { "column": "ROLE_ID_FK", "direction": "desc" } }
+
+    Any column of the model can be used, and the foreign key columns '<field>_FK'
+    given in foreign_key_labels { '<field>_FK': [ label, ... ] }, these are
+    filtered and sorted on the label field(s) of the referenced table through
+    an outer join.
+    """
+    def __init__( self, model, query, foreign_key_labels = None ):
+        self.__model            = model
+        self.__query            = query
+        self.__foreignKeyLabels = foreign_key_labels or {}
+        self.__joins            = {}
+        return
+
+    @property
+    def query( self ):
+        return self.__query
+
+    def columns( self, name ) -> list:
+        if name in self.__foreignKeyLabels:
+            if name not in self.__joins:
+                relation = getattr( self.__model, name )
+                target = aliased( relation.property.mapper.class_ )
+                self.__query = self.__query.outerjoin( target, relation )
+                self.__joins[ name ] = target
+
+            return [ getattr( self.__joins[ name ], label ) for label in self.__foreignKeyLabels[ name ] ]
+
+        if name in self.__model.__mapper__.column_attrs.keys():
+            return [ getattr( self.__model, name ) ]
+
+        raise ValueError( "Invalid column '{}'".format( name ) )
+
+    def filter( self, columns ):
+        for item in columns or []:
+            operator = item.get( 'operator', 'EQ' )
+            if operator not in PAGED_LIST_CONDITIONS:
+                raise ValueError( "Invalid operator '{}'".format( operator ) )
+
+            # For a foreign key with multiple label fields, the first label is used
+            column = self.columns( item[ 'column' ] )[ 0 ]
+            self.__query = self.__query.filter( PAGED_LIST_CONDITIONS[ operator ]( column, item.get( 'value' ) ) )
+
+        return self
+
+    def sort( self, column_sort, default, unique ):
+        """Sorts on the requested column, or the default ordering when there is none.
+        The unique column (primary key) is always added last to get a stable order
+        over the pages.
+        """
+        if column_sort is None or column_sort.get( 'column' ) in ( None, '' ):
+            self.__query = self.__query.order_by( default, unique )
+            return self
+
+        descending = str( column_sort.get( 'direction', 'asc' ) ).lower() == 'desc'
+        order = [ column.desc() if descending else column.asc() for column in self.columns( column_sort[ 'column' ] ) ]
+        self.__query = self.__query.order_by( *order, unique )
+        return self
+
+    def search( self, text, columns, resolve_lists = None, index = SEARCH_LIKE ):
+        """Keeps the records where every word of the text is found in one of the columns;
+        a '<field>_FK' in the label field(s) of the referenced table, a column of
+        resolve_lists { '<field>': { value: label } } in its labels and the other columns
+        in their value.
+
+        The values are matched with ILIKE, or with the full text index of the table on
+        the database it is made for; the FTS5 table '<table>_FTS' on SQLite or the
+        tsvector column '<table>_TSV' on PostgreSQL. These match the words as prefix.
+        """
+        resolveLists = resolve_lists or {}
+        if hasattr( self.__query, 'session' ):
+            dialect = self.__query.session.get_bind().dialect.name
+
+        else:
+            # A select() of the async views
+            dialect = API.db.engine.dialect.name
+
+        for word in ( text or '' ).split():
+            conditions = []
+            indexed = []
+            for name in columns:
+                if name in resolveLists:
+                    values = [ value for value, label in resolveLists[ name ].items()
+                               if word.lower() in str( label ).lower() ]
+                    if len( values ) > 0:
+                        conditions.append( self.columns( name )[ 0 ].in_( values ) )
+
+                elif name in self.__foreignKeyLabels:
+                    conditions.extend( likeWord( column, word ) for column in self.columns( name ) )
+
+                else:
+                    indexed.extend( self.columns( name ) )
+
+            if len( indexed ) > 0:
+                conditions.append( self.__indexCondition( indexed, word, index, dialect ) )
+
+            self.__query = self.__query.filter( or_( *conditions ) if len( conditions ) > 0 else sqlalchemy.false() )
+
+        return self
+
+    def __indexCondition( self, columns, word, index, dialect ):
+        table = self.__model.__table__.name
+        if index == SEARCH_FTS5 and dialect == 'sqlite':
+            fts = sqlalchemy.table( '{}_FTS'.format( table ), sqlalchemy.column( 'rowid' ) )
+            match = sqlalchemy.select( fts.c.rowid ).where(
+                        literal_column( '"{}_FTS"'.format( table ) ).op( 'MATCH' )( '"{}"*'.format( word.replace( '"', '""' ) ) ) )
+            return self.__model.__mapper__.primary_key[ 0 ].in_( match )
+
+        if index == SEARCH_TSVECTOR and dialect == 'postgresql':
+            return literal_column( '"{0}"."{0}_TSV"'.format( table ) ).op( '@@' )(
+                        func.to_tsquery( 'simple', "'{}':*".format( word.replace( "'", "''" ) ) ) )
+
+        return or_( *[ likeWord( column, word ) for column in columns ] )
+
+
+def encodeCursor( values ) -> str:
+    """Makes an opaque cursor token of the sort and primary key values of a record"""
+    def encode( value ):
+        if isinstance( value, datetime.datetime ):
+            return { 'dt': value.isoformat() }
+
+        elif isinstance( value, datetime.date ):
+            return { 'd': value.isoformat() }
+
+        elif isinstance( value, datetime.time ):
+            return { 't': value.isoformat() }
+
+        elif isinstance( value, decimal.Decimal ):
+            return { 'n': str( value ) }
+
+        return value
+
+    data = json.dumps( [ encode( value ) for value in values ], separators = ( ',', ':' ) )
+    return base64.urlsafe_b64encode( data.encode( 'utf-8' ) ).decode( 'ascii' )
+
+
+def decodeCursor( token ) -> list:
+    def decode( value ):
+        if isinstance( value, dict ):
+            if 'dt' in value:
+                return datetime.datetime.fromisoformat( value[ 'dt' ] )
+
+            elif 'd' in value:
+                return datetime.date.fromisoformat( value[ 'd' ] )
+
+            elif 't' in value:
+                return datetime.time.fromisoformat( value[ 't' ] )
+
+            elif 'n' in value:
+                return decimal.Decimal( value[ 'n' ] )
+
+        return value
+
     try:
-        _type = record.__table__.columns[ key ].type
+        return [ decode( value ) for value in json.loads( base64.urlsafe_b64decode( token.encode( 'ascii' ) ) ) ]
 
     except Exception:
-        _type = record.__table__.columns[ key.lower() ].type
-
-    API.app.logger.debug( 'field {0} value {1} type {2}'.format( key, value, str( _type ) ) )
-    if isinstance( _type, ( sqlalchemy.sql.sqltypes.Integer,
-                            sqlalchemy.sql.sqltypes.INTEGER,
-                            sqlalchemy.sql.sqltypes.BigInteger,
-                            sqlalchemy.sql.sqltypes.INT,
-                            sqlalchemy.sql.sqltypes.BIGINT ) ):
+        raise ValueError( "Invalid cursor" )
+
+
+def keysetQuery( query, sort_column, key_column, descending, page_size, cursor = None, backwards = False ):
+    """The query of keysetPage(), for a query that is executed by the caller"""
+    ascending = descending == backwards
+    if cursor is not None:
+        sortValue, keyValue = decodeCursor( cursor )
+        if ascending:
+            query = query.filter( or_( sort_column > sortValue,
+                                       and_( sort_column == sortValue, key_column > keyValue ) ) )
+
+        else:
+            query = query.filter( or_( sort_column < sortValue,
+                                       and_( sort_column == sortValue, key_column < keyValue ) ) )
+
+    if ascending:
+        query = query.order_by( sort_column.asc(), key_column.asc() )
+
+    else:
+        query = query.order_by( sort_column.desc(), key_column.desc() )
+
+    return query.limit( page_size + 1 )
+
+
+def keysetResult( records, sort_column, key_column, page_size, cursor = None, backwards = False ) -> dict:
+    """The page of keysetPage() from the records of the keysetQuery()"""
+    records = list( records )
+    more = len( records ) > page_size
+    records = records[ :page_size ]
+    if backwards:
+        records.reverse()
+
+    def recordCursor( record ):
+        return encodeCursor( [ getattr( record, sort_column.key ), getattr( record, key_column.key ) ] )
+
+    if backwards:
+        nextCursor = recordCursor( records[ -1 ] ) if len( records ) > 0 else None
+        prevCursor = recordCursor( records[ 0 ] ) if more else None
+
+    else:
+        nextCursor = recordCursor( records[ -1 ] ) if more else None
+        prevCursor = recordCursor( records[ 0 ] ) if cursor is not None and len( records ) > 0 else None
+
+    return { 'records': records, 'next': nextCursor, 'prev': prevCursor }
+
+
+def keysetPage( query, sort_column, key_column, descending, page_size, cursor = None, backwards = False ) -> dict:
+    """Returns one page of records that follow (or precede when backwards) the cursor,
+    in the order of ( sort_column, key_column ). The columns are compared explicitly
+    instead of with a row value, so it works on every database, and with an index on
+    both columns the database only reads the rows of the page, independent of the depth.
+
+    Note that the sort column must not contain NULL values.
+    """
+    records = keysetQuery( query, sort_column, key_column, descending, page_size, cursor, backwards ).all()
+    return keysetResult( records, sort_column, key_column, page_size, cursor, backwards )
+
+
+# Schema instances per ( schema class, fields, many ), building a schema is expensive
+PROJECTION_SCHEMAS_MAX = 256
+_projectionSchemas = {}
+
+
+def fieldProjection( model, schema_class, fields, many = False ) -> tuple:
+    """Returns the query options and the schema for a list of field names, as given
+    by the ?fields= parameter. Only the columns of the fields are selected, for a
+    <column>_FK field the related record is loaded with a SELECT ... IN and for a
+    <column>_LABEL field the column is selected.
+
+    Raises ValueError for an unknown field.
+    """
+    if isinstance( fields, str ):
+        fields = [ name.strip() for name in fields.split( ',' ) if name.strip() != '' ]
+
+    fields      = tuple( fields )
+    columns     = model.__mapper__.column_attrs.keys()
+    relations   = model.__mapper__.relationships.keys()
+    loadColumns = []
+    options     = []
+    for name in fields:
+        if name in columns:
+            loadColumns.append( getattr( model, name ) )
+
+        elif name in relations and name.endswith( '_FK' ) and name[ :-3 ] in columns:
+            loadColumns.append( getattr( model, name[ :-3 ] ) )
+            options.append( selectinload( getattr( model, name ) ) )
+
+        elif name.endswith( '_LABEL' ) and name[ :-6 ] in columns:
+            loadColumns.append( getattr( model, name[ :-6 ] ) )
+
+        else:
+            raise ValueError( "Invalid field: {}".format( name ) )
+
+    if len( loadColumns ) > 0:
+        options.insert( 0, load_only( *loadColumns ) )
+
+    key = ( schema_class, fields, many )
+    if key not in _projectionSchemas:
+        if len( _projectionSchemas ) >= PROJECTION_SCHEMAS_MAX:
+            _projectionSchemas.clear()
+
+        # Raises ValueError when a field is not in the schema
+        _projectionSchemas[ key ] = schema_class( many = many, only = fields )
+
+    return options, _projectionSchemas[ key ]
+
+
+def initialVersion() -> int:
+    """A new counter starts at the time in milliseconds, so that a recreated store
+    does not hand out the versions, and so the ETags, of the old store again.
+    """
+    return int( time.time() * 1000 )
+
+
+class MemoryVersionStore( object ):
+    """Table version counters of this process only. The epoch makes the ETags
+    of different processes differ, so that they never match by accident. A write in
+    another process does not change the versions of this one, so it is only correct
+    when the backend runs as a single process.
+    """
+    shared = False
+
+    def __init__( self ):
+        self.epoch      = uuid.uuid4().hex[ :8 ]
+        self.__lock     = threading.Lock()
+        self.__versions = {}
+        return
+
+    def get( self, tables ) -> list:
+        return [ self.__versions.get( table, 0 ) for table in tables ]
+
+    def bump( self, tables ):
+        with self.__lock:
+            for table in tables:
+                self.__versions[ table ] = self.__versions.get( table, 0 ) + 1
+
+        return
+
+
+class SqliteVersionStore( object ):
+    """Table version counters in a SQLite file, shared by the processes on one host"""
+    shared = True
+
+    def __init__( self, filename ):
+        self.epoch      = 'S'
+        self.__filename = filename
+        with self.__connect() as conn:
+            conn.execute( "CREATE TABLE IF NOT EXISTS table_versions ( name TEXT PRIMARY KEY, version INTEGER NOT NULL )" )
+
+        return
+
+    def __connect( self ):
+        return sqlite3.connect( self.__filename, timeout = 5 )
+
+    def get( self, tables ) -> list:
+        conn = self.__connect()
         try:
-            if value is not None:
-                value = int( str( value ) )
+            versions = dict( conn.execute( "SELECT name, version FROM table_versions" ).fetchall() )
 
-            elif default is not None:
-                value = default
+        finally:
+            conn.close()
 
-        except:
-            if isinstance( default,int ):
-                value = default
+        return [ versions.get( table, 0 ) for table in tables ]
 
-            else:
-                value = 0
-
-    elif isinstance( _type, ( sqlalchemy.sql.sqltypes.REAL,
-                              sqlalchemy.sql.sqltypes.Float,
-                              sqlalchemy.sql.sqltypes.FLOAT,
-                              sqlalchemy.sql.sqltypes.DECIMAL,
-                              sqlalchemy.sql.sqltypes.Numeric,
-                              sqlalchemy.sql.sqltypes.NUMERIC ) ):
+    def bump( self, tables ):
+        conn = self.__connect()
         try:
-            if value is not None:
-                value = float( str( value ) )
+            with conn:
+                for table in tables:
+                    conn.execute( "INSERT OR IGNORE INTO table_versions ( name, version ) VALUES ( ?, ? )",
+                                  ( table, initialVersion() ) )
+                    conn.execute( "UPDATE table_versions SET version = version + 1 WHERE name = ?", ( table, ) )
 
-            elif default is not None:
-                value = default
+        finally:
+            conn.close()
 
-        except:
-            if isinstance( default, float ):
-                value = default
+        return
 
-            else:
-                value = 0.0
 
-    elif isinstance( _type, ( sqlalchemy.sql.sqltypes.DateTime,
-                              sqlalchemy.sql.sqltypes.DATETIME,
-                              sqlalchemy.sql.sqltypes.TIMESTAMP ) ):
-        if value is not None:
-            value = convertDateTime( value )
+class DatabaseVersionStore( object ):
+    """Table version counters in a table of the application database, shared by all processes"""
+    shared = True
 
-        elif default is not None:
-            value = default
+    def __init__( self, engine ):
+        self.epoch      = 'D'
+        self.__engine   = engine
+        metadata        = sqlalchemy.MetaData()
+        self.__table    = sqlalchemy.Table( 'GC_TABLE_VERSIONS', metadata,
+                                            sqlalchemy.Column( 'NAME', sqlalchemy.String( 128 ), primary_key = True ),
+                                            sqlalchemy.Column( 'VERSION', sqlalchemy.Integer, nullable = False ) )
+        metadata.create_all( engine, checkfirst = True )
+        return
 
-    elif isinstance( _type, ( sqlalchemy.sql.sqltypes.Date,
-                              sqlalchemy.sql.sqltypes.DATE ) ):
-        # TODO: needs to be tested
-        API.app.logger.debug( "Type date: '{}'".format( value ) )
-        if value is not None:
-            # UTC format, need to add local time diff
-            if 'T' in value:
-                utc  = convertDateTime( value )
-                from_zone = tz.tzutc()
-                to_zone = tz.tzlocal()
-                utc = utc.replace( tzinfo = from_zone )
-                value = utc.astimezone( to_zone )
-                API.app.logger.debug( "Type datetime: '{}'".format( value ) )
+    def get( self, tables ) -> list:
+        table = self.__table
+        with self.__engine.connect() as conn:
+            versions = dict( conn.execute( sqlalchemy.select( table.c.NAME, table.c.VERSION )
+                                           .where( table.c.NAME.in_( tables ) ) ).fetchall() )
 
-            else:
-                value = datetime.datetime.strptime( value, '%Y-%m-%d' )
+        return [ versions.get( name, 0 ) for name in tables ]
 
-            API.app.logger.debug( "Type date: '{}'".format( value ) )
-            value = value.date()
-            API.app.logger.debug( "Type date: '{}'".format( value ) )
+    def bump( self, tables ):
+        table = self.__table
+        for name in tables:
+            with self.__engine.begin() as conn:
+                result = conn.execute( table.update().where( table.c.NAME == name )
+                                       .values( VERSION = table.c.VERSION + 1 ) )
+                if result.rowcount > 0:
+                    continue
 
-        elif default is not None:
-            value = default
+            try:
+                with self.__engine.begin() as conn:
+                    conn.execute( table.insert().values( NAME = name, VERSION = initialVersion() ) )
 
-    elif isinstance( _type, ( sqlalchemy.sql.sqltypes.Time,
-                              sqlalchemy.sql.sqltypes.TIME ) ):
-        # TODO: needs to be tested
-        if value is not None:
-            value = datetime.datetime.strptime( value, '%H:%M:%S' ).time()
+            except IntegrityError:
+                # Another process inserted it in the meantime
+                with self.__engine.begin() as conn:
+                    conn.execute( table.update().where( table.c.NAME == name )
+                                  .values( VERSION = table.c.VERSION + 1 ) )
+
+        return
+
+
+_versionStore = None
+
+
+def tableVersions():
+    """Returns the table version store as configured by TABLE_VERSION_STORE;
+
+        database            in the GC_TABLE_VERSIONS table of the application database (default)
+        sqlite:<filename>   shared by the processes on one host
+        memory              in-process, only for a backend that runs as a single process
+
+    The ETags and the caches depend on the versions, a store that is not shared by all
+    processes lets them answer with data that another process has changed.
+    """
+    global _versionStore
+    if _versionStore is None:
+        setting = API.app.config.get( 'TABLE_VERSION_STORE', 'database' )
+        if setting.startswith( 'sqlite:' ):
+            _versionStore = SqliteVersionStore( os.path.abspath( setting[ 7: ] ) )
+
+        elif setting == 'memory':
+            _versionStore = MemoryVersionStore()
+
+        else:
+            _versionStore = DatabaseVersionStore( API.db.engine )
+
+    return _versionStore
+
+
+def versionedTables( model ) -> tuple:
+    """The table of the model and the tables of the relations, which the schema nests"""
+    result = []
+    mappers = [ model.__mapper__ ]
+    while len( mappers ) > 0:
+        mapper = mappers.pop( 0 )
+        if mapper.local_table.name in result:
+            continue
+
+        result.append( mapper.local_table.name )
+        mappers.extend( relation.mapper for relation in mapper.relationships )
+
+    return tuple( result )
+
+
+def _changedTable( mapper, connection, target ):
+    session = object_session( target )
+    if session is not None:
+        session.info.setdefault( 'changedTables', set() ).add( mapper.local_table.name )
+
+    return
+
+
+def _bumpChangedTables( session ):
+    changed = session.info.pop( 'changedTables', None )
+    if changed:
+        tableVersions().bump( sorted( changed ) )
+
+    return
+
+
+def _discardChangedTables( session ):
+    session.info.pop( 'changedTables', None )
+    return
+
+
+def trackTableVersion( model ):
+    """Bumps the version of the table of the model when a record is inserted, updated
+    or deleted through the ORM. The version is bumped after the commit, so that a
+    new ETag always belongs to committed data.
+    """
+    for name in ( 'after_insert', 'after_update', 'after_delete' ):
+        event.listen( model, name, _changedTable )
+
+    if not event.contains( API.db.session, 'after_commit', _bumpChangedTables ):
+        event.listen( API.db.session, 'after_commit', _bumpChangedTables )
+        event.listen( API.db.session, 'after_rollback', _discardChangedTables )
+
+    return
+
+
+def conditionalGet( model ):
+    """Decorator for read endpoints, adds an ETag of the table versions and the request,
+    answers a matching If-None-Match with 304 without running the endpoint.
+    """
+    def decorator( func ):
+        tables = versionedTables( model )
+
+        def requestEtag():
+            store   = tableVersions()
+            digest  = hashlib.sha1( request.full_path.encode( 'utf-8' ) + request.get_data() )
+            # The encoding of the response is negotiated, see encodeList()
+            digest.update( request.headers.get( 'Accept', '' ).encode( 'utf-8' ) )
+            versions = store.get( tables )
+            # Taken before the endpoint runs, the record cache uses the same versions
+            g.tableVersions = ( tables, versions )
+            for version in versions:
+                digest.update( b':%d' % version )
+
+            return '{}-{}'.format( store.epoch, digest.hexdigest()[ :20 ] )
+
+        def setEtag( response, etag ):
+            if response.status_code not in ( 200, 304 ):
+                return response
 
-        elif default is not None:
-            value = default
+            response.set_etag( etag, weak = True )
+            # Let the browser revalidate every time, instead of guessing a lifetime
+            response.headers[ 'Cache-Control' ] = 'no-cache'
+            return response
 
-    elif isinstance( _type, ( sqlalchemy.sql.sqltypes.Boolean,
-                              sqlalchemy.sql.sqltypes.BOOLEAN ) ):
-        if type( value ) is int:
-            value = bool( value )
+        if asyncio.iscoroutinefunction( func ):
+            @functools.wraps( func )
+            async def asyncWrapper( *args, **kwargs ):
+                etag = requestEtag()
+                if request.if_none_match.contains_weak( etag ):
+                    return setEtag( make_response( '', 304 ), etag )
 
-        elif type( value ) is str:
-            value = bool( value )
+                return setEtag( make_response( await func( *args, **kwargs ) ), etag )
 
-        elif value is None:
-            if default is not None:
-                value = default
+            return asyncWrapper
+
+        @functools.wraps( func )
+        def wrapper( *args, **kwargs ):
+            etag = requestEtag()
+            if request.if_none_match.contains_weak( etag ):
+                return setEtag( make_response( '', 304 ), etag )
+
+            return setEtag( make_response( func( *args, **kwargs ) ), etag )
+
+        return wrapper
+
+    return decorator
+
+
+class SelectCache( object ):
+    """The results of /select per table, value, label, sort and filter. An entry is valid
+    as long as the table version is the same as when it was made, so writes to the
+    table, also by other processes when the version store is shared, invalidate it.
+    It also expires SELECT_CACHE_TTL seconds (default 60) after it was made, which bounds
+    how stale it can be when a write is not counted, i.e. by another application or a
+    process with a memory version store of its own.
+    """
+    REPORT_INTERVAL = 1000
+
+    def __init__( self, size = 256 ):
+        self.__size     = size
+        self.__lock     = threading.Lock()
+        self.__entries  = collections.OrderedDict()
+        self.hits       = 0
+        self.misses     = 0
+        return
+
+    @property
+    def hitRate( self ) -> float:
+        total = self.hits + self.misses
+        return ( self.hits / total ) if total > 0 else 0.0
+
+    def statistics( self ) -> dict:
+        return { 'hits': self.hits, 'misses': self.misses, 'hitRate': self.hitRate, 'entries': len( self.__entries ) }
+
+    def get( self, key, version ):
+        with self.__lock:
+            entry = self.__entries.get( key )
+            if entry is not None and entry[ 0 ] == version and entry[ 1 ] > time.monotonic():
+                self.__entries.move_to_end( key )
+                self.hits += 1
+                result = entry[ 2 ]
 
             else:
-                value = False
+                self.misses += 1
+                result = None
 
-    API.app.logger.debug( 'field {0} value {1}'.format( key, value ) )
-    return value
+            if ( self.hits + self.misses ) % self.REPORT_INTERVAL == 0:
+                API.app.logger.info( "Select cache: {hits} hits, {misses} misses, hit rate {hitRate:.1%}, "
+                                     "{entries} entries".format( **self.statistics() ) )
+
+        return result
+
+    def put( self, key, version, result ):
+        with self.__lock:
+            self.__entries[ key ] = ( version, time.monotonic() + API.app.config.get( 'SELECT_CACHE_TTL', 60 ), result )
+            self.__entries.move_to_end( key )
+            while len( self.__entries ) > self.__size:
+                self.__entries.popitem( last = False )
+
+        return
+
+
+selectCache = SelectCache()
+
+
+def _selectQuery( model, value, label, sorton, filters ) -> tuple:
+    """The cache key and version, the cached result (or None), the query and the
+    function that makes the result from the rows of the query, for selectList()
+    """
+    splitter, separator = ',', ' '
+    for character, joiner in ( ( ',', ' ' ), ( '-', '-' ), ( ';', '; ' ) ):
+        if character in label:
+            splitter, separator = character, joiner
+            break
+
+    labels  = [ lbl.strip() for lbl in label.strip().split( splitter ) ]
+    sorton  = sorton or labels[ 0 ]
+    filters = filters or {}
+    if not isinstance( filters, dict ):
+        raise ValueError( "Invalid filter: {}".format( filters ) )
+
+    columns = model.__mapper__.column_attrs.keys()
+    for name in [ value, sorton ] + labels + list( filters.keys() ):
+        if name not in columns:
+            raise ValueError( "Invalid column: {}".format( name ) )
+
+    table   = model.__mapper__.local_table.name
+    key     = ( table, value, tuple( labels ), separator, sorton, json.dumps( filters, sort_keys = True, default = str ) )
+    version = tableVersions().get( [ table ] )[ 0 ]
+    query = sqlalchemy.select( getattr( model, value ), *[ getattr( model, lbl ) for lbl in labels ] )
+    for name, filterValue in filters.items():
+        query = query.where( getattr( model, name ) == filterValue )
+
+    def makeResult( rows ) -> list:
+        if len( labels ) > 1:
+            return [ { 'value': row[ 0 ], 'label': separator.join( str( field ) for field in row[ 1: ] ) }
+                     for row in rows ]
+
+        return [ { 'value': row[ 0 ], 'label': row[ 1 ] } for row in rows ]
+
+    return key, version, selectCache.get( key, version ), query.order_by( getattr( model, sorton ) ), makeResult
+
+
+def selectList( model, value, label, sorton = None, filters = None ) -> list:
+    """Returns the [ { value, label } ] list of /select, only the value, label, sort
+    and filter columns are queried. The label may combine columns separated by
+    ',' (joined by a space), '-' or ';'.
+
+    Raises ValueError for an unknown column.
+    """
+    key, version, result, query, makeResult = _selectQuery( model, value, label, sorton, filters )
+    if result is None:
+        result = makeResult( API.db.session.execute( query ) )
+        selectCache.put( key, version, result )
+
+    # A copy, the caller may add the initial and final items
+    return list( result )
+
+
+def markTableChanged( session, model ):
+    """For changes that bypass the ORM events, such as the bulk operations"""
+    session.info.setdefault( 'changedTables', set() ).add( model.__mapper__.local_table.name )
+    return
+
+
+class BulkError( Exception ):
+    def __init__( self, results ):
+        Exception.__init__( self, "{} of {} records are invalid".format( len( [ r for r in results if not r[ 'ok' ] ] ),
+                                                                           len( results ) ) )
+        self.results = results
+        return
+
+
+def _bulkMappings( model, records, clean, with_key ):
+    """Converts the records as /new and /update do, the result per record"""
+    primaryKey = model.__mapper__.primary_key[ 0 ].key
+    columns = model.__mapper__.column_attrs.keys()
+    converters = modelConverters( model )
+    mappings = []
+    results = []
+    if not isinstance( records, list ):
+        raise ValueError( "Expected a list of records" )
+
+    for record in records:
+        try:
+            if not isinstance( record, dict ):
+                raise ValueError( "Expected a record" )
+
+            if with_key and record.get( primaryKey ) is None:
+                raise ValueError( "Missing {}".format( primaryKey ) )
+
+            key = fieldConversion( model, primaryKey, record.get( primaryKey ) )
+            record = clean( dict( record ) )
+            # The same fields as /new and /update accept, the relations are skipped
+            record = { name: value for name, value in record.items() if not name.endswith( '_REL' ) }
+            unknown = converters.unknown( record )
+            if len( unknown ) > 0:
+                raise ValueError( "Unknown fields {}".format( ', '.join( unknown ) ) )
+
+            mapping = { ( name if name in columns else name.lower() ): converters[ name ]( value )
+                        for name, value in record.items() if name != primaryKey }
+            if with_key:
+                mapping[ primaryKey ] = key
+
+            mappings.append( mapping )
+            results.append( { 'ok': True } )
+
+        except Exception as exc:
+            mappings.append( None )
+            results.append( { 'ok': False, 'error': str( exc ) } )
+
+    if not all( result[ 'ok' ] for result in results ):
+        raise BulkError( results )
+
+    return primaryKey, mappings, results
+
+
+def _missingKeys( session, model, primaryKey, keys, results ):
+    column = getattr( model, primaryKey )
+    found = set( row[ 0 ] for row in session.query( column ).filter( column.in_( keys ) ) )
+    for key, result in zip( keys, results ):
+        if key not in found:
+            result.update( ok = False, error = "Record {} not found".format( key ) )
+
+    if not all( result[ 'ok' ] for result in results ):
+        raise BulkError( results )
+
+    return
+
+
+def bulkNew( session, model, records, clean ) -> list:
+    """Inserts the records in one transaction, returns per record { ok, <primary key> }.
+    Raises BulkError when a record is invalid, nothing is inserted then.
+    """
+    primaryKey, mappings, results = _bulkMappings( model, records, clean, False )
+    session.bulk_insert_mappings( model, mappings, return_defaults = True )
+    markTableChanged( session, model )
+    session.commit()
+    for mapping, result in zip( mappings, results ):
+        result[ primaryKey ] = mapping.get( primaryKey )
+
+    return results
+
+
+def bulkUpdate( session, model, records, clean, events = False ) -> list:
+    """Updates the records in one transaction, returns per record { ok, <primary key> }.
+    With events the records are updated through the ORM, so that the model events,
+    like autoupdate, are applied, in one flush. Raises BulkError when a record is
+    invalid or does not exist, nothing is updated then.
+    """
+    primaryKey, mappings, results = _bulkMappings( model, records, clean, True )
+    keys = [ mapping[ primaryKey ] for mapping in mappings ]
+    _missingKeys( session, model, primaryKey, keys, results )
+    if events:
+        column = getattr( model, primaryKey )
+        objects = { getattr( obj, primaryKey ): obj for obj in session.query( model ).filter( column.in_( keys ) ) }
+        for mapping in mappings:
+            obj = objects[ mapping[ primaryKey ] ]
+            for name, value in mapping.items():
+                if name != primaryKey:
+                    setattr( obj, name, value )
+
+    else:
+        session.bulk_update_mappings( model, mappings )
+        markTableChanged( session, model )
+        markRecordsChanged( session, model, keys )
+
+    session.commit()
+    for key, result in zip( keys, results ):
+        result[ primaryKey ] = key
+
+    return results
+
+
+def bulkDelete( session, model, keys ) -> list:
+    """Deletes the records by primary key in one transaction, returns per key { ok, <primary key> }.
+    Raises BulkError when a record does not exist, nothing is deleted then.
+    """
+    primaryKey = model.__mapper__.primary_key[ 0 ].key
+    if not isinstance( keys, list ):
+        raise ValueError( "Expected a list of {}".format( primaryKey ) )
+
+    # Accept the records as well as the keys
+    keys = [ fieldConversion( model, primaryKey, key.get( primaryKey ) if isinstance( key, dict ) else key )
+             for key in keys ]
+    results = [ { 'ok': True, primaryKey: key } for key in keys ]
+    _missingKeys( session, model, primaryKey, keys, results )
+    session.query( model ).filter( getattr( model, primaryKey ).in_( keys ) ).delete( synchronize_session = False )
+    markTableChanged( session, model )
+    markRecordsChanged( session, model, keys )
+    markRecordsDeleted( session, model, keys )
+    session.commit()
+    return results
+
+
+STREAM_CHUNK_SIZE = 1000
+
+
+def streamRecords( query, schema, ndjson = False, chunk_size = STREAM_CHUNK_SIZE ):
+    """Yields the records of the query serialized, as a JSON array or as NDJSON (one
+    record per line), in pieces of chunk_size records. The query is read with
+    yield_per(), so only one chunk of records is in memory at any time.
+    """
+    def encode( records ):
+        rows = [ flaskJson.dumps( row ) for row in schema.dump( records ) ]
+        if ndjson:
+            return ''.join( row + '\n' for row in rows )
+
+        return ','.join( rows )
+
+    first = True
+    chunk = []
+    if not ndjson:
+        yield '['
+
+    for record in query.yield_per( chunk_size ):
+        chunk.append( record )
+        if len( chunk ) == chunk_size:
+            yield ( '' if first or ndjson else ',' ) + encode( chunk )
+            first = False
+            chunk = []
+
+    if len( chunk ) > 0:
+        yield ( '' if first or ndjson else ',' ) + encode( chunk )
+
+    if not ndjson:
+        yield ']'
+
+    return
+
+
+# The asyncio driver per database, for the SQLALCHEMY_DATABASE_URI of the async views
+ASYNC_DRIVERS = { 'sqlite':     'sqlite+aiosqlite',
+                  'postgresql': 'postgresql+asyncpg',
+                  'mysql':      'mysql+aiomysql' }
+
+
+class VersionedSession( Session ):
+    """The session of the AsyncSession of the async views, bumps the table versions
+    after the commit as API.db.session does for the sync views.
+    """
+
+
+event.listen( VersionedSession, 'after_commit', _bumpChangedTables )
+event.listen( VersionedSession, 'after_rollback', _discardChangedTables )
+
+
+def asyncDatabaseUri( uri ) -> str:
+    """The database URI with the asyncio driver of the database"""
+    scheme, separator, rest = uri.partition( '://' )
+    dialect = scheme.split( '+' )[ 0 ]
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError( "No asyncio driver for the database '{}'".format( dialect ) )
+
+    return ASYNC_DRIVERS[ dialect ] + separator + rest
+
+
+_asyncLock = threading.Lock()
+_asyncSessionFactory = None
+
+
+def asyncSession():
+    """A new AsyncSession for an async view, 'async with asyncSession() as session:'.
+    The engine connects to SQLALCHEMY_ASYNC_DATABASE_URI, by default the
+    SQLALCHEMY_DATABASE_URI with the asyncio driver of the database.
+
+    Flask runs every async view in an event loop of its own, and the connections of
+    an asyncio driver belong to the loop they were made in. So the engine does not
+    pool the connections, unless SQLALCHEMY_ASYNC_POOL is set for an application
+    served by an ASGI server, which runs all requests in one loop.
+    """
+    global _asyncSessionFactory
+    if _asyncSessionFactory is None:
+        if AsyncSession is None:
+            raise RuntimeError( "The async views need SQLAlchemy 1.4 or later" )
+
+        with _asyncLock:
+            if _asyncSessionFactory is None:
+                config = API.app.config
+                uri = ( config.get( 'SQLALCHEMY_ASYNC_DATABASE_URI' ) or
+                        asyncDatabaseUri( config[ 'SQLALCHEMY_DATABASE_URI' ] ) )
+                options = {} if config.get( 'SQLALCHEMY_ASYNC_POOL', False ) else { 'poolclass': NullPool }
+                _asyncSessionFactory = sessionmaker( create_async_engine( uri, **options ),
+                                                     class_ = AsyncSession,
+                                                     sync_session_class = VersionedSession )
+
+    return _asyncSessionFactory()
+
+
+async def asyncDump( session, schema, records ):
+    """schema.dump() of records of the AsyncSession. It runs in the greenlet of the
+    session, so the relations the schema nests are lazy loaded as in the sync views.
+    """
+    return await session.run_sync( lambda _session: schema.dump( records ) )
+
+
+async def asyncCount( session, query ) -> int:
+    """The number of records of the select() query"""
+    return await session.scalar( sqlalchemy.select( func.count() ).select_from( query.order_by( None ).subquery() ) )
+
+
+async def asyncSelectList( session, model, value, label, sorton = None, filters = None ) -> list:
+    """selectList() with the AsyncSession of an async view"""
+    key, version, result, query, makeResult = _selectQuery( model, value, label, sorton, filters )
+    if result is None:
+        result = makeResult( await session.execute( query ) )
+        selectCache.put( key, version, result )
+
+    return list( result )
+
+
+def markRecordsChanged( session, model, keys ):
+    """For changes that bypass the ORM events, the records are removed from the record
+    cache of the model after the commit.
+    """
+    table = model.__mapper__.local_table.name
+    if table in recordCaches:
+        session.info.setdefault( 'changedRecords', {} ).setdefault( table, set() ).update( keys )
+
+    return
+
+
+def _changedRecord( mapper, connection, target ):
+    session = object_session( target )
+    if session is not None:
+        markRecordsChanged( session, mapper.class_, [ mapper.primary_key_from_instance( target )[ 0 ] ] )
+
+    return
+
+
+def _invalidateChangedRecords( session ):
+    for table, keys in session.info.pop( 'changedRecords', {} ).items():
+        recordCaches[ table ].invalidate( keys )
+
+    return
+
+
+def _discardChangedRecords( session ):
+    session.info.pop( 'changedRecords', None )
+    return
+
+
+event.listen( VersionedSession, 'after_commit', _invalidateChangedRecords )
+event.listen( VersionedSession, 'after_rollback', _discardChangedRecords )
+
+
+class MemoryRecordStore( object ):
+    """The record cache in this process, the size most recently used records with the
+    variants of each record, for ttl seconds after they were stored.
+    """
+    def __init__( self, size ):
+        self.__size     = size
+        self.__lock     = threading.Lock()
+        self.__entries  = collections.OrderedDict()
+        return
+
+    def __len__( self ):
+        return len( self.__entries )
+
+    def get( self, key, variant ):
+        with self.__lock:
+            entry = self.__entries.get( key )
+            if entry is None:
+                return None
+
+            if entry[ 0 ] < time.monotonic():
+                del self.__entries[ key ]
+                return None
+
+            self.__entries.move_to_end( key )
+            return entry[ 1 ].get( variant )
+
+    def put( self, key, variant, value, ttl ):
+        with self.__lock:
+            entry = self.__entries.get( key )
+            variants = entry[ 1 ] if entry is not None else {}
+            variants[ variant ] = value
+            self.__entries[ key ] = ( time.monotonic() + ttl, variants )
+            self.__entries.move_to_end( key )
+            while len( self.__entries ) > self.__size:
+                self.__entries.popitem( last = False )
+
+        return
+
+    def delete( self, keys ):
+        with self.__lock:
+            for key in keys:
+                self.__entries.pop( key, None )
+
+        return
+
+
+class RedisRecordStore( object ):
+    """The record cache in Redis, or a server with the same protocol, shared by the
+    processes. A record is a hash of its variants as JSON, which expires ttl seconds
+    after it was stored; the size is left to the maxmemory policy of the server.
+    """
+    def __init__( self, client, table ):
+        self.__client   = client
+        self.__prefix   = 'gencrud:record:{}:'.format( table )
+        return
+
+    def get( self, key, variant ):
+        value = self.__client.hget( self.__prefix + key, variant )
+        return None if value is None else json.loads( value )
+
+    def put( self, key, variant, value, ttl ):
+        pipeline = self.__client.pipeline()
+        pipeline.hset( self.__prefix + key, variant, flaskJson.dumps( value ) )
+        pipeline.expire( self.__prefix + key, max( 1, int( ttl ) ) )
+        pipeline.execute()
+        return
+
+    def delete( self, keys ):
+        if len( keys ) > 0:
+            self.__client.delete( *[ self.__prefix + key for key in keys ] )
+
+        return
+
+
+_redisClient = None
+
+
+def recordStore( table, size ):
+    """The store of the record cache of a table as configured by;
+
+        RECORD_CACHE_CLIENT     a Redis client object, i.e. redis.Redis(), or a compatible one
+        RECORD_CACHE_REDIS_URL  the URL of the Redis server, needs the redis package
+
+    without them the records are cached in this process.
+    """
+    global _redisClient
+    config = API.app.config
+    client = config.get( 'RECORD_CACHE_CLIENT' )
+    if client is None and config.get( 'RECORD_CACHE_REDIS_URL' ):
+        if _redisClient is None:
+            import redis
+            _redisClient = redis.Redis.from_url( config[ 'RECORD_CACHE_REDIS_URL' ] )
+
+        client = _redisClient
+
+    if client is not None:
+        return RedisRecordStore( client, table )
+
+    return MemoryRecordStore( size )
+
+
+# The record cache per table
+recordCaches = {}
+
+
+class RecordCache( object ):
+    """Read-through cache of the serialized records of /get/<id> of a model, per primary
+    key and variant (the ?fields= of the request). A record is removed when it is
+    updated or deleted, after the commit, and is not used when its table or a table
+    the schema nests has changed since it was stored.
+
+    The caller takes the versions() before the query of a miss and passes them to
+    put(); when a write commits in the meantime the versions differ and the record,
+    which may be the old one, is not stored.
+    """
+    def __init__( self, model, ttl = 300, size = 1000 ):
+        self.__table    = model.__mapper__.local_table.name
+        self.__tables   = versionedTables( model )
+        self.__ttl      = ttl
+        self.__size     = size
+        self.__store    = None
+        self.hits       = 0
+        self.misses     = 0
+        recordCaches[ self.__table ] = self
+        for name in ( 'after_update', 'after_delete' ):
+            event.listen( model, name, _changedRecord )
+
+        if not event.contains( API.db.session, 'after_commit', _invalidateChangedRecords ):
+            event.listen( API.db.session, 'after_commit', _invalidateChangedRecords )
+            event.listen( API.db.session, 'after_rollback', _discardChangedRecords )
+
+        return
+
+    @property
+    def store( self ):
+        if self.__store is None:
+            self.__store = recordStore( self.__table, self.__size )
+
+        return self.__store
+
+    def versions( self ) -> list:
+        """The versions of the table and the nested tables, the ones conditionalGet()
+        took for the ETag of the request when there are.
+        """
+        if has_request_context():
+            tables, versions = g.get( 'tableVersions', ( None, None ) )
+            if tables == self.__tables:
+                return versions
+
+        return tableVersions().get( self.__tables )
+
+    def get( self, key, variant = '', versions = None ):
+        """The serialized record, or None when it is not in the cache"""
+        entry = self.store.get( str( key ), variant )
+        if entry is not None and entry[ 'versions' ] == ( versions if versions is not None else self.versions() ):
+            self.hits += 1
+            return entry[ 'record' ]
+
+        self.misses += 1
+        return None
+
+    def put( self, key, record, variant = '', versions = None ):
+        """Stores the record, the versions are the ones taken before its query"""
+        current = tableVersions().get( self.__tables )
+        if versions is not None and versions != current:
+            return
+
+        self.store.put( str( key ), variant, { 'versions': current, 'record': record }, self.__ttl )
+        return
+
+    def invalidate( self, keys ):
+        self.store.delete( [ str( key ) for key in keys ] )
+        return
+
+    def statistics( self ) -> dict:
+        total = self.hits + self.misses
+        return { 'hits': self.hits, 'misses': self.misses, 'hitRate': ( self.hits / total ) if total > 0 else 0.0 }
+
+
+# The column with the time of the last change per table of which /changes returns the
+# changed and deleted records
+changeColumns = {}
+_tombstones = None
+_tombstonesPurged = 0.0
+
+
+def tombstoneTable():
+    """The GC_TOMBSTONES table with the primary keys of the deleted records of the tables
+    that track changes. It is in the metadata of the models, so db.create_all() and the
+    migrations create it with the tables.
+    """
+    global _tombstones
+    if _tombstones is None:
+        db = API.db
+        _tombstones = db.Table( 'GC_TOMBSTONES',
+                                db.Column( 'ID', db.Integer, primary_key = True ),
+                                db.Column( 'TABLE_NAME', db.String( 128 ), nullable = False ),
+                                db.Column( 'RECORD_KEY', db.String( 128 ), nullable = False ),
+                                db.Column( 'DELETED_AT', db.DateTime, nullable = False ),
+                                db.Index( 'GC_TOMBSTONES_IDX', 'TABLE_NAME', 'DELETED_AT' ) )
+
+    return _tombstones
+
+
+def changesRetention() -> datetime.timedelta:
+    return datetime.timedelta( days = API.app.config.get( 'CHANGES_RETENTION_DAYS', 7 ) )
+
+
+def _writeTombstones( connection, table, keys ):
+    """Inserts the tombstones in the transaction of the delete, and once an hour removes
+    the ones older than CHANGES_RETENTION_DAYS.
+    """
+    global _tombstonesPurged
+    tombstones = tombstoneTable()
+    now = datetime.datetime.utcnow()
+    connection.execute( tombstones.insert(), [ { 'TABLE_NAME': table,
+                                                 'RECORD_KEY': json.dumps( key, default = str ),
+                                                 'DELETED_AT': now } for key in keys ] )
+    if time.monotonic() - _tombstonesPurged > 3600:
+        _tombstonesPurged = time.monotonic()
+        connection.execute( tombstones.delete().where( tombstones.c.DELETED_AT < now - changesRetention() ) )
+
+    return
+
+
+def _deletedRecord( mapper, connection, target ):
+    _writeTombstones( connection, mapper.local_table.name, [ mapper.primary_key_from_instance( target )[ 0 ] ] )
+    return
+
+
+def markRecordsDeleted( session, model, keys ):
+    """For deletes that bypass the ORM events, writes the tombstones of the records"""
+    table = model.__mapper__.local_table.name
+    if table in changeColumns and len( keys ) > 0:
+        _writeTombstones( session.connection(), table, keys )
+
+    return
+
+
+def trackChanges( model, column ):
+    """Keeps a tombstone of every deleted record of the model, column is the time of the
+    last insert or update of a record, together they give the changes for /changes.
+    """
+    tombstoneTable()
+    changeColumns[ model.__mapper__.local_table.name ] = column
+    event.listen( model, 'after_delete', _deletedRecord )
+    return
+
+
+def changesSince( token ) -> tuple:
+    """Returns the time of the request, which is the token for the next request, and the
+    time from which the records changed for the token of the previous request. That is
+    CHANGES_GRACE_SECONDS (default 5) before it, for the transactions that committed
+    after the previous request with an earlier time; the client merges them again.
+    The time is None when the client must replace all its records, without a token or
+    with one older than the tombstones are kept. Raises ValueError for an invalid token.
+    """
+    now = datetime.datetime.utcnow()
+    if token in ( None, '' ):
+        return now, None
+
+    values = decodeCursor( token )
+    if len( values ) != 1 or not isinstance( values[ 0 ], datetime.datetime ):
+        raise ValueError( "Invalid token" )
+
+    if values[ 0 ] < now - changesRetention():
+        return now, None
+
+    return now, values[ 0 ] - datetime.timedelta( seconds = API.app.config.get( 'CHANGES_GRACE_SECONDS', 5 ) )
+
+
+def changesQuery( query, model, since ):
+    """The query of the records inserted or updated since, all records when since is None"""
+    if since is None:
+        return query
+
+    return query.filter( changeColumns[ model.__mapper__.local_table.name ] >= since )
+
+
+def deletedQuery( model, since ):
+    """The statement of the keys of the records deleted since"""
+    tombstones = tombstoneTable()
+    return sqlalchemy.select( tombstones.c.RECORD_KEY ).where(
+                    and_( tombstones.c.TABLE_NAME == model.__mapper__.local_table.name,
+                          tombstones.c.DELETED_AT >= since ) ).distinct()
+
+
+def changesResult( now, since, records, deleted, primary_key ) -> dict:
+    """The response of /changes from the serialized records and the rows of the deletedQuery().
+    A key that is deleted and inserted again is only in the records.
+    """
+    present = set( record.get( primary_key ) for record in records )
+    keys = [ json.loads( row[ 0 ] ) for row in deleted ]
+    return { 'token':   encodeCursor( [ now ] ),
+             'reset':   since is None,
+             'records': records,
+             'deleted': [ key for key in keys if key not in present ] }
+
+
+JSON_MIMETYPE       = 'application/json'
+COLUMNAR_MIMETYPE   = 'application/vnd.gencrud.columnar+json'
+MSGPACK_MIMETYPE    = 'application/msgpack'
+
+
+def responseFormat() -> str:
+    """The encoding of a list response the client accepts best, the mimetype of JSON,
+    columnar JSON or, when msgpack is installed, MessagePack. JSON when the client
+    does not prefer one of the others.
+    """
+    offers = [ JSON_MIMETYPE, COLUMNAR_MIMETYPE ]
+    if msgpack is not None:
+        offers.append( MSGPACK_MIMETYPE )
+
+    return request.accept_mimetypes.best_match( offers, JSON_MIMETYPE )
+
+
+def columnar( records ) -> dict:
+    """The list of records as { columns: [ ... ], data: [ [ ... ], ... ] }"""
+    columns = []
+    for record in records:
+        for key in record:
+            if key not in columns:
+                columns.append( key )
+
+    return { 'columns': columns, 'data': [ [ record.get( column ) for column in columns ] for record in records ] }
+
+
+def _msgpackDefault( value ):
+    if isinstance( value, ( datetime.date, datetime.time ) ):
+        return value.isoformat()
+
+    if isinstance( value, ( decimal.Decimal, uuid.UUID ) ):
+        return str( value )
+
+    raise TypeError( 'Cannot serialize {!r} with msgpack'.format( value ) )
+
+
+def encodeList( data, records = None ):
+    """Returns the response of a list endpoint in the encoding of responseFormat(). The data
+    is the list of records or, with records, a dict that has the list under that key.
+    Columnar JSON replaces the list(s) of records by columnar(), MessagePack encodes the
+    data as is.
+    """
+    mimetype = responseFormat()
+    if mimetype == COLUMNAR_MIMETYPE:
+        if records is None:
+            data = columnar( data )
+
+        else:
+            data = dict( data, **{ records: columnar( data[ records ] ) } )
+
+    if mimetype == MSGPACK_MIMETYPE:
+        response = make_response( msgpack.packb( data, default = _msgpackDefault, use_bin_type = True ) )
+
+    else:
+        response = jsonify( data )
+
+    response.mimetype = mimetype
+    response.vary.add( 'Accept' )
+    return response
+
+
+LATENCY_BUCKETS = ( 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0 )
+
+
+class EndpointMetrics( object ):
+    """Latency histogram, status codes, payload bytes and row counts per route of the
+    registered blueprints. For a streamed response the latency is up to the first
+    chunk and the payload bytes are not known.
+    """
+    def __init__( self, buckets = LATENCY_BUCKETS ):
+        self.__buckets  = buckets
+        self.__lock     = threading.Lock()
+        self.__routes   = {}
+        return
+
+    def register( self, blueprint ):
+        blueprint.before_request( self.__start )
+        blueprint.after_request( self.__finish )
+        return blueprint
+
+    @staticmethod
+    def __start():
+        g.metricsStart  = time.perf_counter()
+        g.metricsRows   = None
+        return
+
+    def __finish( self, response ):
+        start = g.pop( 'metricsStart', None )
+        if start is None or request.url_rule is None:
+            return response
+
+        latency = time.perf_counter() - start
+        size = None if response.is_streamed else response.calculate_content_length()
+        rows = g.pop( 'metricsRows', None )
+        key = '{} {}'.format( request.method, request.url_rule.rule )
+        with self.__lock:
+            route = self.__routes.get( key )
+            if route is None:
+                route = self.__routes[ key ] = { 'count': 0,
+                                                 'latency': 0.0,
+                                                 'maxLatency': 0.0,
+                                                 'histogram': [ 0 ] * ( len( self.__buckets ) + 1 ),
+                                                 'status': {},
+                                                 'bytes': 0,
+                                                 'rows': 0 }
+
+            route[ 'count' ] += 1
+            route[ 'latency' ] += latency
+            route[ 'maxLatency' ] = max( route[ 'maxLatency' ], latency )
+            route[ 'histogram' ][ next( ( idx for idx, bucket in enumerate( self.__buckets ) if latency <= bucket ),
+                                        len( self.__buckets ) ) ] += 1
+            status = str( response.status_code )
+            route[ 'status' ][ status ] = route[ 'status' ].get( status, 0 ) + 1
+            route[ 'bytes' ] += size or 0
+            route[ 'rows' ] += rows or 0
+
+        return response
+
+    def statistics( self ) -> dict:
+        """The metrics per 'METHOD /route', the histogram has the number of requests per
+        latency bucket (in seconds), the last one is for the slower requests.
+        """
+        with self.__lock:
+            return { key: dict( route,
+                                histogram = dict( zip( [ str( bucket ) for bucket in self.__buckets ] + [ '+Inf' ],
+                                                       route[ 'histogram' ] ) ),
+                                status = dict( route[ 'status' ] ),
+                                averageLatency = route[ 'latency' ] / route[ 'count' ] )
+                     for key, route in self.__routes.items() }
+
+    def reset( self ):
+        with self.__lock:
+            self.__routes.clear()
+
+        return
+
+
+endpointMetrics = EndpointMetrics()
+
+
+def countRows( count ):
+    """Records the number of rows of the current request in the endpoint metrics"""
+    g.metricsRows = count
+    return
@@ -17,12 +17,17 @@
 #   Boston, MA 02110-1301 USA
 #
 import os
+import time
 import yaml
 import json
 import logging
 import traceback
 import importlib
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from common.sql import getSqlStatement
+from .common import endpointMetrics, selectCache, recordCaches
 try:
     import webapp2.api as API
 except ModuleNotFoundError:
@@ -155,8 +160,59 @@ def logMappedDrives():
     return
 
 
+def _beforeCursorExecute( conn, cursor, statement, parameters, context, executemany ):
+    conn.info.setdefault( 'queryStart', [] ).append( time.perf_counter() )
+    return
+
+
+def _afterCursorExecute( conn, cursor, statement, parameters, context, executemany ):
+    starts = conn.info.get( 'queryStart' )
+    if not starts:
+        # The execution started before the instrumentation was registered
+        return
+
+    elapsed = time.perf_counter() - starts.pop()
+    if has_request_context():
+        g.queryCount = g.get( 'queryCount', 0 ) + 1
+        g.dbTime = g.get( 'dbTime', 0.0 ) + elapsed
+
+    threshold = API.app.config.get( 'SQL_SLOW_QUERY', 0.5 )
+    if threshold is not None and elapsed >= threshold:
+        try:
+            sql = getSqlStatement( context.compiled.statement )
+
+        except Exception:
+            sql = '{} {!r}'.format( statement, parameters )
+
+        API.app.logger.warning( 'Slow query %.3f s: %s', elapsed, sql )
+
+    return
+
+
+def _addQueryHeaders( response ):
+    if API.app.debug:
+        response.headers[ 'X-Query-Count' ] = str( g.get( 'queryCount', 0 ) )
+        response.headers[ 'X-DB-Time' ] = '{:.1f}'.format( g.get( 'dbTime', 0.0 ) * 1000 )
+
+    return response
+
+
+def registerSqlInstrumentation( app ):
+    """Counts the queries and their time per request, when debugging these are sent in the
+    headers X-Query-Count and X-DB-Time (ms). Queries that take longer than the Flask
+    configuration key SQL_SLOW_QUERY (in seconds, default 0.5, None to disable) are logged.
+    """
+    if not event.contains( Engine, 'before_cursor_execute', _beforeCursorExecute ):
+        event.listen( Engine, 'before_cursor_execute', _beforeCursorExecute )
+        event.listen( Engine, 'after_cursor_execute', _afterCursorExecute )
+
+    app.after_request( _addQueryHeaders )
+    return
+
+
 def registerApi( app, cors ):
     logger = app.logger
+    registerSqlInstrumentation( app )
     # mapDrive( "E:", "\\\\sfp09021\\testrun", None, None, True )
     logMappedDrives()
     global menuItems, applicInfo
@@ -247,6 +303,14 @@ def getAppInfo():
                     copyright = __copyright__,
                     version = __version__ )
 
+
+@applicApi.route( "/api/application/metrics", methods=[ 'GET' ] )
+def getAppMetrics():
+    return jsonify( routes = endpointMetrics.statistics(),
+                    selectCache = selectCache.statistics(),
+                    recordCache = { table: cache.statistics() for table, cache in recordCaches.items() } )
+
+
 @applicApi.route( "/api/menu", methods=[ 'GET' ] )
 def getAppMenu():
     return jsonify( menuItems )
\ No newline at end of file
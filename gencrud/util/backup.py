@@ -0,0 +1,103 @@
+#
+#   Python backend and Angular frontend code generation by gencrud
+#   Copyright (C) 2018-2020 Marc Bertens-Nguyen m.bertens@pe2mbs.nl
+#
+#   This library is free software; you can redistribute it and/or modify
+#   it under the terms of the GNU Library General Public License GPL-2.0-only
+#   as published by the Free Software Foundation.
+#
+#   This library is distributed in the hope that it will be useful, but
+#   WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#   Library General Public License for more details.
+#
+#   You should have received a copy of the GNU Library General Public
+#   License GPL-2.0-only along with this library; if not, write to the
+#   Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor,
+#   Boston, MA 02110-1301 USA
+#
+#   Backups are stored content addressed in the folder where gencrud is started;
+#
+#       .gencrud-backup/objects/<sha256>        the content of the backuped file
+#       .gencrud-backup/runs/<run-id>           the index of a run, one line per backup
+#                                               '<sha256>  <absolute filename>'
+#
+#   Identical content is only stored once and a backup never needs to look at
+#   earlier backups.
+#
+import os
+import shutil
+import logging
+import datetime
+from gencrud.util.sha import sha256sum
+
+logger = logging.getLogger()
+
+BACKUP_FOLDER   = '.gencrud-backup'
+OBJECTS_FOLDER  = 'objects'
+RUNS_FOLDER     = 'runs'
+
+runId           = None
+
+
+def backupFolder( *args ) -> str:
+    return os.path.join( os.getcwd(), BACKUP_FOLDER, *args )
+
+
+def currentRunId() -> str:
+    global runId
+    if runId is None:
+        runId = '{}-{}'.format( datetime.datetime.now().strftime( '%Y%m%d-%H%M%S' ), os.getpid() )
+
+    return runId
+
+
+def backupFile( file_name ):
+    if not os.path.isfile( file_name ):
+        return
+
+    digest = sha256sum( file_name )
+    objectFile = backupFolder( OBJECTS_FOLDER, digest )
+    if not os.path.isfile( objectFile ):
+        os.makedirs( os.path.dirname( objectFile ), exist_ok = True )
+        # Copy to a temporary name first, so that an object is always complete
+        shutil.copyfile( file_name, objectFile + '.tmp' )
+        os.replace( objectFile + '.tmp', objectFile )
+
+    indexFile = backupFolder( RUNS_FOLDER, currentRunId() )
+    os.makedirs( os.path.dirname( indexFile ), exist_ok = True )
+    with open( indexFile, 'a' ) as stream:
+        stream.write( '{}  {}\n'.format( digest, os.path.abspath( file_name ) ) )
+
+    logger.debug( "Backup {} => {}".format( file_name, digest ) )
+    return
+
+
+def listRuns() -> list:
+    folder = backupFolder( RUNS_FOLDER )
+    if not os.path.isdir( folder ):
+        return []
+
+    return sorted( os.listdir( folder ) )
+
+
+def restoreRun( run_id ) -> list:
+    """Restores the files as they were before the run <run_id> changed them
+    and returns the list of restored files.
+    """
+    indexFile = backupFolder( RUNS_FOLDER, run_id )
+    if not os.path.isfile( indexFile ):
+        raise FileNotFoundError( 2, "Backup run '{}' not found".format( run_id ), indexFile )
+
+    restore = {}
+    with open( indexFile, 'r' ) as stream:
+        for line in stream:
+            digest, filename = line.rstrip( '\n' ).split( '  ', 1 )
+            # A file may be backuped more than once in a run, the first is the original
+            restore.setdefault( filename, digest )
+
+    for filename, digest in restore.items():
+        logger.info( "Restore {} <= {}".format( filename, digest ) )
+        shutil.copyfile( backupFolder( OBJECTS_FOLDER, digest ), filename )
+
+    return list( restore.keys() )
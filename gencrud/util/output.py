@@ -0,0 +1,207 @@
+#
+#   Python backend and Angular frontend code generation by gencrud
+#   Copyright (C) 2018-2020 Marc Bertens-Nguyen m.bertens@pe2mbs.nl
+#
+#   This library is free software; you can redistribute it and/or modify
+#   it under the terms of the GNU Library General Public License GPL-2.0-only
+#   as published by the Free Software Foundation.
+#
+#   This library is distributed in the hope that it will be useful, but
+#   WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#   Library General Public License for more details.
+#
+#   You should have received a copy of the GNU Library General Public
+#   License GPL-2.0-only along with this library; if not, write to the
+#   Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor,
+#   Boston, MA 02110-1301 USA
+#
+import io
+import os
+import errno
+import re
+import sys
+import shutil
+import locale
+import difflib
+import hashlib
+import logging
+from collections import OrderedDict
+import gencrud.util.utils
+from gencrud.util.sha import sha256sum
+
+logger = logging.getLogger()
+
+ENCODING = locale.getpreferredencoding( False )
+# The generation date in the header of the generated files, this is not a change
+GENERATION_STAMP = re.compile( rb'gencrud: \d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}' )
+
+
+class GeneratedFiles( object ):
+    """All files the generators create, patch, copy or remove go through this object.
+
+    Normally the operations are done directly on disk. With the --check or --diff
+    option nothing is written; the new content is kept in memory, later reads
+    see the pending content, and at the end of the run the result is compared
+    with what is on disk.
+    """
+    def __init__( self ):
+        self.__files    = OrderedDict()     # filename -> bytes, None when removed
+        self.__folders  = set()
+        return
+
+    @property
+    def inMemory( self ) -> bool:
+        return gencrud.util.utils.checkFiles or gencrud.util.utils.diffFiles
+
+    def isfile( self, filename ) -> bool:
+        filename = os.path.abspath( filename )
+        if filename in self.__files:
+            return self.__files[ filename ] is not None
+
+        return os.path.isfile( filename )
+
+    def isdir( self, path ) -> bool:
+        path = os.path.abspath( path )
+        return path in self.__folders or os.path.isdir( path )
+
+    def mkdir( self, path ):
+        if not self.inMemory:
+            os.mkdir( path )
+            return
+
+        self.__folders.add( os.path.abspath( path ) )
+        return
+
+    def makedirs( self, path ):
+        if not self.inMemory:
+            os.makedirs( path )
+            return
+
+        path = os.path.abspath( path )
+        while path not in self.__folders and not os.path.isdir( path ):
+            self.__folders.add( path )
+            path = os.path.dirname( path )
+
+        return
+
+    def __pending( self, filename ):
+        """Returns the pending content of the file, None when there is none.
+        A file that is pending removal raises FileNotFoundError, as it would on disk.
+        """
+        filename = os.path.abspath( filename )
+        if filename in self.__files and self.__files[ filename ] is None:
+            raise FileNotFoundError( errno.ENOENT, os.strerror( errno.ENOENT ), filename )
+
+        return self.__files.get( filename )
+
+    def read( self, filename ) -> str:
+        data = self.__pending( filename )
+        if data is None:
+            with open( filename, gencrud.util.utils.C_FILEMODE_READ ) as stream:
+                return stream.read()
+
+        return io.TextIOWrapper( io.BytesIO( data ), encoding = ENCODING ).read()
+
+    def readlines( self, filename ) -> list:
+        return io.StringIO( self.read( filename ) ).readlines()
+
+    def write( self, filename, text ):
+        if not self.inMemory:
+            with open( filename, gencrud.util.utils.C_FILEMODE_WRITE ) as stream:
+                stream.write( text )
+
+            return
+
+        # Store the exact bytes that a text mode write would produce
+        self.__files[ os.path.abspath( filename ) ] = text.replace( '\n', os.linesep ).encode( ENCODING )
+        return
+
+    def remove( self, filename ):
+        if not self.inMemory:
+            os.remove( filename )
+            return
+
+        self.__files[ os.path.abspath( filename ) ] = None
+        return
+
+    def copy( self, source, destination ):
+        if not self.inMemory:
+            shutil.copy( source, destination )
+            return
+
+        with open( source, 'rb' ) as stream:
+            self.__files[ os.path.abspath( destination ) ] = stream.read()
+
+        return
+
+    def sha256( self, filename ) -> str:
+        data = self.__pending( filename )
+        if data is None:
+            return sha256sum( filename )
+
+        return hashlib.sha256( data ).hexdigest()
+
+    def changes( self ) -> list:
+        """Returns the list of ( filename, state ) of the pending files that differ
+        from disk; state is 'create', 'update' or 'remove'.
+
+        The size is compared first and only for files with the same size
+        the content hash is calculated, most changed files are therefore never
+        read. The generation date in the header is not seen as a change.
+        """
+        result = []
+        for filename, data in self.__files.items():
+            exists = os.path.isfile( filename )
+            if data is None:
+                if exists:
+                    result.append( ( filename, 'remove' ) )
+
+            elif not exists:
+                result.append( ( filename, 'create' ) )
+
+            elif self.__differs( filename, data ):
+                result.append( ( filename, 'update' ) )
+
+        return result
+
+    @staticmethod
+    def __differs( filename, data ) -> bool:
+        if os.path.getsize( filename ) != len( data ):
+            return True
+
+        if sha256sum( filename ) == hashlib.sha256( data ).hexdigest():
+            return False
+
+        with open( filename, 'rb' ) as stream:
+            current = stream.read()
+
+        return GENERATION_STAMP.sub( b'', current ) != GENERATION_STAMP.sub( b'', data )
+
+    def diff( self, filename ) -> list:
+        oldLines = []
+        if os.path.isfile( filename ):
+            with open( filename, gencrud.util.utils.C_FILEMODE_READ ) as stream:
+                oldLines = stream.readlines()
+
+        newLines = []
+        if self.__files.get( filename ) is not None:
+            newLines = self.readlines( filename )
+
+        return list( difflib.unified_diff( oldLines, newLines, fromfile = filename, tofile = filename ) )
+
+    def report( self, stream = sys.stdout ) -> int:
+        changes = self.changes()
+        for filename, state in changes:
+            print( "Would {} {}".format( state, filename ), file = stream )
+            if gencrud.util.utils.diffFiles:
+                for line in self.diff( filename ):
+                    stream.write( line if line.endswith( '\n' ) else line + '\n' )
+
+        if len( changes ) == 0:
+            print( "No changes", file = stream )
+
+        return len( changes )
+
+
+files = GeneratedFiles()
@@ -18,8 +18,7 @@
 #
 import os
 import logging
-import shutil
-
+import gencrud.util.backup
 from gencrud.util.positon import PositionInterface
 from platform import system
 
@@ -30,6 +29,9 @@ overWriteFiles  = False
 ignoreCaseDbIds = False
 useModule       = False
 lazyLoading     = False
+streaming       = False
+checkFiles      = False
+diffFiles       = False
 version         = 1
 config          = None
 
@@ -50,13 +52,11 @@ def get_platform():
 
 
 def backupFile( file_name ):
-    idx = 1
-    while os.path.isfile( file_name + '.~{0}'.format( idx ) ):
-        idx += 1
-
-    if os.path.isfile( file_name ):
-        shutil.copyfile( file_name, file_name + '.~{0}'.format( idx ) )
+    if checkFiles or diffFiles:
+        # Nothing is written to disk, so nothing needs to be preserved
+        return
 
+    gencrud.util.backup.backupFile( file_name )
     return
 
 
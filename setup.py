@@ -29,6 +29,7 @@ from gencrud.version import __version__, __author__, __email__, __copyright__
 
 template_list   = [ 'templates/angular/*.templ',
                     'templates/python/*.templ',
+                    'templates/python/async/*.templ',
                     'templates/common/angular/*.*',
                     'templates/common/angular/input-component/*.*',
                     'templates/common/angular/confirm-dialog/*.*',
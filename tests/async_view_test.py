@@ -0,0 +1,118 @@
+import time
+import asyncio
+import concurrent.futures
+import pytest
+from .helpers import make_model, fill
+
+
+def item_schema():
+    marshmallow = pytest.importorskip( 'marshmallow' )
+
+    class ItemSchema( marshmallow.Schema ):
+        class Meta:
+            fields = ( 'I_ID', 'I_NAME', 'I_COUNT', 'I_PRICE' )
+
+    return ItemSchema( many = True )
+
+
+@pytest.fixture
+def async_common( project_common ):
+    pytest.importorskip( 'sqlalchemy.ext.asyncio' )
+    pytest.importorskip( 'aiosqlite' )
+    return project_common
+
+
+def test_async_database_uri( project_common ):
+    common, app, db = project_common
+    assert common.asyncDatabaseUri( 'sqlite:////tmp/app.db' ) == 'sqlite+aiosqlite:////tmp/app.db'
+    assert common.asyncDatabaseUri( 'postgresql+psycopg2://u:p@host/db' ) == 'postgresql+asyncpg://u:p@host/db'
+    with pytest.raises( ValueError ):
+        common.asyncDatabaseUri( 'oracle://host/db' )
+
+
+def test_async_queries( async_common ):
+    common, app, db = async_common
+    sqlalchemy = pytest.importorskip( 'sqlalchemy' )
+    model = make_model( db )
+    schema = item_schema()
+    with app.app_context():
+        common.trackTableVersion( model )
+        db.create_all()
+        fill( db, model, 25 )
+        expected = schema.dump( db.session.query( model ).order_by( model.I_ID ).all() )
+        select = common.selectList( model, 'I_ID', 'I_NAME', filters = { 'I_COUNT': 3 } )
+        page = common.keysetPage( db.session.query( model ), model.I_NAME, model.I_ID, True, 10 )
+        page[ 'records' ] = [ record.I_ID for record in page[ 'records' ] ]
+        db.session.remove()
+
+        async def run():
+            async with common.asyncSession() as session:
+                records = ( await session.execute( sqlalchemy.select( model ).order_by( model.I_ID ) ) ).scalars().all()
+                dumped = await common.asyncDump( session, schema, records )
+                count = await common.asyncCount( session, sqlalchemy.select( model ).filter( model.I_COUNT < 10 ) )
+                selected = await common.asyncSelectList( session, model, 'I_ID', 'I_NAME', filters = { 'I_COUNT': 3 } )
+                query = common.keysetQuery( sqlalchemy.select( model ), model.I_NAME, model.I_ID, True, 10 )
+                keyset = common.keysetResult( ( await session.execute( query ) ).scalars().all(),
+                                              model.I_NAME, model.I_ID, 10 )
+                keyset[ 'records' ] = [ record.I_ID for record in keyset[ 'records' ] ]
+                session.add( model( I_NAME = 'new', I_COUNT = 1 ) )
+                await session.commit()
+
+            return dumped, count, selected, keyset
+
+        before = common.tableVersions().get( [ 'ITEMS' ] )
+        dumped, count, selected, keyset = asyncio.run( run() )
+        assert dumped == expected
+        assert count == 10
+        assert selected == select
+        assert keyset == page
+        # A commit of the AsyncSession bumps the table version as the sync session does
+        assert common.tableVersions().get( [ 'ITEMS' ] ) != before
+
+
+def test_async_concurrency( async_common, report_benchmark ):
+    """The same 200 list requests of 100 records, by 20 threads with the sync session and
+    as 20 concurrent tasks with the AsyncSession on aiosqlite.
+    """
+    common, app, db = async_common
+    sqlalchemy = pytest.importorskip( 'sqlalchemy' )
+    model = make_model( db )
+    schema = item_schema()
+    requests, concurrency = 200, 20
+    with app.app_context():
+        db.create_all()
+        fill( db, model, 2000 )
+
+    def syncRequest( idx ):
+        with app.app_context():
+            records = db.session.query( model ).order_by( model.I_ID ).limit( 100 ).offset( idx * 10 ).all()
+            result = schema.dump( records )
+            db.session.remove()
+            return result
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor( max_workers = concurrency ) as executor:
+        syncResults = list( executor.map( syncRequest, range( requests ) ) )
+
+    syncTime = time.perf_counter() - start
+
+    async def asyncRequest( idx, semaphore ):
+        async with semaphore:
+            async with common.asyncSession() as session:
+                query = sqlalchemy.select( model ).order_by( model.I_ID ).limit( 100 ).offset( idx * 10 )
+                records = ( await session.execute( query ) ).scalars().all()
+                return await common.asyncDump( session, schema, records )
+
+    async def asyncRequests():
+        semaphore = asyncio.Semaphore( concurrency )
+        return await asyncio.gather( *[ asyncRequest( idx, semaphore ) for idx in range( requests ) ] )
+
+    with app.app_context():
+        start = time.perf_counter()
+        asyncResults = asyncio.run( asyncRequests() )
+        asyncTime = time.perf_counter() - start
+
+    report_benchmark( "{} list requests, {} concurrent: sync {:.0f}/s, async {:.0f}/s".format( requests, concurrency,
+                                                                                            requests / syncTime,
+                                                                                            requests / asyncTime ) )
+    assert asyncResults == syncResults
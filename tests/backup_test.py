@@ -0,0 +1,29 @@
+import os
+import gencrud.util.backup as backup
+
+
+def test_backup_and_restore( tmp_path, monkeypatch ):
+    monkeypatch.chdir( str( tmp_path ) )
+    monkeypatch.setattr( backup, 'runId', None )
+    first = os.path.join( str( tmp_path ), 'app.module.ts' )
+    second = os.path.join( str( tmp_path ), 'copy.module.ts' )
+    for filename in ( first, second ):
+        with open( filename, 'w' ) as stream:
+            stream.write( 'original\n' )
+
+    backup.backupFile( first )
+    backup.backupFile( second )
+    with open( first, 'w' ) as stream:
+        stream.write( 'patched\n' )
+
+    # The second backup of the same file in a run is not the original
+    backup.backupFile( first )
+
+    # Identical content is stored once
+    assert len( os.listdir( backup.backupFolder( backup.OBJECTS_FOLDER ) ) ) == 2
+    assert backup.listRuns() == [ backup.currentRunId() ]
+
+    restored = backup.restoreRun( backup.currentRunId() )
+    assert sorted( restored ) == sorted( [ first, second ] )
+    with open( first, 'r' ) as stream:
+        assert stream.read() == 'original\n'
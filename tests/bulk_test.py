@@ -0,0 +1,99 @@
+import time
+import pytest
+from .helpers import make_model
+
+
+def per_record_new( common, db, model, records ):
+    # What /new does per request
+    for data in records:
+        record = model()
+        for key, value in data.items():
+            setattr( record, key, common.fieldConversion( record, key, value ) )
+
+        db.session.add( record )
+        db.session.commit()
+        db.session.close()
+        db.session.remove()
+
+
+def per_record_update( common, db, model, records ):
+    # What /update does per request
+    for data in records:
+        record = model.query.get( data[ 'I_ID' ] )
+        for key, value in data.items():
+            if key != 'I_ID':
+                setattr( record, key, common.fieldConversion( record, key, value ) )
+
+        db.session.commit()
+        db.session.close()
+        db.session.remove()
+
+
+def test_bulk_results( project_common ):
+    common, app, db = project_common
+    model = make_model( db )
+    with app.app_context():
+        db.create_all()
+        results = common.bulkNew( db.session, model, [ { 'I_NAME': 'a', 'I_COUNT': '1' },
+                                                       { 'I_NAME': 'b', 'I_COUNT': 2 } ], lambda r: r )
+        assert results == [ { 'ok': True, 'I_ID': 1 }, { 'ok': True, 'I_ID': 2 } ]
+        assert model.query.get( 1 ).I_COUNT == 1
+
+        # One unknown record, nothing is updated
+        with pytest.raises( common.BulkError ) as exc:
+            common.bulkUpdate( db.session, model, [ { 'I_ID': 1, 'I_NAME': 'x' }, { 'I_ID': 9 } ], lambda r: r )
+
+        assert [ result[ 'ok' ] for result in exc.value.results ] == [ True, False ]
+        db.session.rollback()
+        assert model.query.get( 1 ).I_NAME == 'a'
+
+        common.bulkUpdate( db.session, model, [ { 'I_ID': '1', 'I_NAME': 'x' } ], lambda r: r )
+        assert model.query.get( 1 ).I_NAME == 'x'
+        assert common.bulkDelete( db.session, model, [ 1, { 'I_ID': 2 } ] ) == [ { 'ok': True, 'I_ID': 1 },
+                                                                                   { 'ok': True, 'I_ID': 2 } ]
+        assert model.query.count() == 0
+
+        # Unknown fields are reported per record, as /new and /update answer them with 400
+        with pytest.raises( common.BulkError ) as exc:
+            common.bulkNew( db.session, model, [ { 'I_NAME': 'a' }, { 'I_NAME': 'b', 'I_OTHER': 1 } ], lambda r: r )
+
+        assert exc.value.results == [ { 'ok': True }, { 'ok': False, 'error': 'Unknown fields I_OTHER' } ]
+        assert model.query.count() == 0
+        with pytest.raises( common.BulkError ) as exc:
+            common.bulkUpdate( db.session, model, [ { 'I_ID': 1, 'I_OTHER': 1, 'I_NAME_REL': {} } ], lambda r: r )
+
+        assert exc.value.results[ 0 ][ 'error' ] == 'Unknown fields I_OTHER'
+
+
+def test_bulk_throughput( project_common, report_benchmark ):
+    common, app, db = project_common
+    model = make_model( db )
+    count = 300
+    records = [ { 'I_NAME': 'item {}'.format( idx ), 'I_COUNT': str( idx ), 'I_PRICE': idx / 10 }
+                for idx in range( count ) ]
+    with app.app_context():
+        db.create_all()
+        start = time.perf_counter()
+        per_record_new( common, db, model, records )
+        perRecordNew = time.perf_counter() - start
+
+        start = time.perf_counter()
+        common.bulkNew( db.session, model, records, lambda r: r )
+        bulkNew = time.perf_counter() - start
+
+        updates = [ { 'I_ID': idx + 1, 'I_COUNT': idx * 2 } for idx in range( count ) ]
+        start = time.perf_counter()
+        per_record_update( common, db, model, updates )
+        perRecordUpdate = time.perf_counter() - start
+
+        updates = [ { 'I_ID': count + idx + 1, 'I_COUNT': idx * 2 } for idx in range( count ) ]
+        start = time.perf_counter()
+        common.bulkUpdate( db.session, model, updates, lambda r: r )
+        bulkUpdate = time.perf_counter() - start
+        assert model.query.filter( model.I_COUNT == 2 * ( count - 1 ) ).count() == 2
+
+    report_benchmark( "Records per second, new: per record {:.0f}, bulk {:.0f}; "
+                      "update: per record {:.0f}, bulk {:.0f}".format( count / perRecordNew, count / bulkNew,
+                                                                       count / perRecordUpdate, count / bulkUpdate ) )
+    assert bulkNew < perRecordNew
+    assert bulkUpdate < perRecordUpdate
@@ -0,0 +1,74 @@
+import datetime
+import pytest
+
+
+def make_model( db ):
+    class Item( db.Model ):
+        __tablename__   = 'ITEMS'
+        I_ID            = db.Column( db.Integer, primary_key = True, autoincrement = True )
+        I_NAME          = db.Column( db.String( 40 ) )
+        UPDATED_AT      = db.Column( db.DateTime, default = datetime.datetime.utcnow,
+                                     onupdate = datetime.datetime.utcnow, index = True )
+
+    return Item
+
+
+def changes( common, db, model, token ):
+    # What /changes does
+    now, since = common.changesSince( token )
+    records = [ { 'I_ID': record.I_ID, 'I_NAME': record.I_NAME }
+                for record in common.changesQuery( db.session.query( model ), model, since ) ]
+    deleted = [] if since is None else db.session.execute( common.deletedQuery( model, since ) ).fetchall()
+    return common.changesResult( now, since, records, deleted, 'I_ID' )
+
+
+def merge( data, result ):
+    # What the data service of the frontend does
+    if result[ 'reset' ]:
+        return { record[ 'I_ID' ]: record for record in result[ 'records' ] }
+
+    data = { key: record for key, record in data.items() if key not in result[ 'deleted' ] }
+    data.update( { record[ 'I_ID' ]: record for record in result[ 'records' ] } )
+    return data
+
+
+def test_changes( project_common ):
+    common, app, db = project_common
+    app.config[ 'CHANGES_GRACE_SECONDS' ] = 0
+    model = make_model( db )
+    with app.app_context():
+        common.trackChanges( model, model.UPDATED_AT )
+        db.create_all()
+        common.bulkNew( db.session, model, [ { 'I_NAME': str( idx ) } for idx in range( 5 ) ], lambda r: r )
+        result = changes( common, db, model, None )
+        assert result[ 'reset' ] and len( result[ 'records' ] ) == 5
+        data = merge( {}, result )
+        token = result[ 'token' ]
+        assert changes( common, db, model, token )[ 'records' ] == []
+
+        # Every way of changing the records is in the delta
+        db.session.add( model( I_NAME = 'new' ) )
+        model.query.get( 1 ).I_NAME = 'orm'
+        db.session.delete( model.query.get( 2 ) )
+        db.session.commit()
+        common.bulkUpdate( db.session, model, [ { 'I_ID': 3, 'I_NAME': 'bulk' } ], lambda r: r )
+        common.bulkDelete( db.session, model, [ 4 ] )
+        result = changes( common, db, model, token )
+        assert not result[ 'reset' ]
+        assert sorted( record[ 'I_ID' ] for record in result[ 'records' ] ) == [ 1, 3, 6 ]
+        assert sorted( result[ 'deleted' ] ) == [ 2, 4 ]
+        data = merge( data, result )
+        assert data == { record.I_ID: { 'I_ID': record.I_ID, 'I_NAME': record.I_NAME }
+                         for record in model.query.all() }
+
+        # A rolled back delete leaves no tombstone
+        db.session.delete( model.query.get( 5 ) )
+        db.session.flush()
+        db.session.rollback()
+        assert changes( common, db, model, result[ 'token' ] )[ 'deleted' ] == []
+
+        # A token older than the tombstones are kept replaces all records
+        old = common.encodeCursor( [ datetime.datetime.utcnow() - datetime.timedelta( days = 8 ) ] )
+        assert changes( common, db, model, old )[ 'reset' ]
+        with pytest.raises( ValueError ):
+            common.changesSince( 'invalid' )
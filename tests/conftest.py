@@ -0,0 +1,50 @@
+import sys
+import types
+import importlib.util
+import pytest
+from .helpers import COMMON_PY
+
+# The figures of the benchmark tests, shown in the terminal summary
+_benchmarks = []
+
+
+@pytest.fixture
+def report_benchmark( request ):
+    """Reports a line with the figures a benchmark test measured, these are shown
+    in the terminal summary instead of being printed into the captured output.
+    """
+    def report( line ):
+        _benchmarks.append( '{}: {}'.format( request.node.name, line ) )
+
+    return report
+
+
+def pytest_terminal_summary( terminalreporter ):
+    if len( _benchmarks ) > 0:
+        terminalreporter.section( 'benchmarks' )
+        for line in _benchmarks:
+            terminalreporter.write_line( line )
+
+
+@pytest.fixture
+def project_common( tmp_path, monkeypatch ):
+    """The common.py that is copied into a generated project, with a webapp2.api
+    of a Flask application on a SQLite file.
+    """
+    flask = pytest.importorskip( 'flask' )
+    flask_sqlalchemy = pytest.importorskip( 'flask_sqlalchemy' )
+    pytest.importorskip( 'dateutil' )
+    app = flask.Flask( 'bulk' )
+    app.config[ 'SQLALCHEMY_DATABASE_URI' ] = 'sqlite:///' + str( tmp_path / 'bulk.db' )
+    app.config[ 'SQLALCHEMY_TRACK_MODIFICATIONS' ] = False
+    api = types.ModuleType( 'webapp2.api' )
+    api.app = app
+    api.db = flask_sqlalchemy.SQLAlchemy( app )
+    package = types.ModuleType( 'webapp2' )
+    package.api = api
+    monkeypatch.setitem( sys.modules, 'webapp2', package )
+    monkeypatch.setitem( sys.modules, 'webapp2.api', api )
+    spec = importlib.util.spec_from_file_location( 'project_common', COMMON_PY )
+    common = importlib.util.module_from_spec( spec )
+    spec.loader.exec_module( common )
+    return common, app, api.db
@@ -0,0 +1,70 @@
+import time
+import datetime
+import pytest
+
+
+def make_model( db ):
+    class Record( db.Model ):
+        __tablename__   = 'RECORDS'
+        R_ID            = db.Column( db.Integer, primary_key = True )
+        R_NAME          = db.Column( db.String( 40 ) )
+        R_COUNT         = db.Column( db.Integer )
+        R_TOTAL         = db.Column( db.BigInteger )
+        R_PRICE         = db.Column( db.Float )
+        R_AMOUNT        = db.Column( db.Numeric( 10, 2 ) )
+        R_ACTIVE        = db.Column( db.Boolean )
+        R_CREATED       = db.Column( db.DateTime )
+        R_START         = db.Column( db.Time )
+        R_REMARK        = db.Column( db.Text )
+
+    return Record
+
+
+RECORD = { 'R_ID': '12', 'R_NAME': 'name', 'R_COUNT': 3, 'R_TOTAL': '99', 'R_PRICE': '1.5', 'R_AMOUNT': 2,
+           'R_ACTIVE': 1, 'R_CREATED': '2020-05-17 10:20:30', 'R_START': '08:30:00', 'R_REMARK': None }
+
+
+def test_converters( project_common ):
+    common, app, db = project_common
+    model = make_model( db )
+    converters = common.fieldConverters( model )
+    record = { key: converters[ key ]( value ) for key, value in RECORD.items() }
+    assert record == { 'R_ID': 12, 'R_NAME': 'name', 'R_COUNT': 3, 'R_TOTAL': 99, 'R_PRICE': 1.5, 'R_AMOUNT': 2.0,
+                       'R_ACTIVE': True, 'R_CREATED': datetime.datetime( 2020, 5, 17, 10, 20, 30 ),
+                       'R_START': datetime.time( 8, 30 ), 'R_REMARK': None }
+    assert converters[ 'R_COUNT' ]( 'x' ) == 0
+    assert converters[ 'R_COUNT' ]( None, 5 ) == 5
+    assert converters[ 'R_ACTIVE' ]( None ) is False
+    # fieldConversion() gives the same, for a record as well as the model
+    assert all( common.fieldConversion( model(), key, value ) == record[ key ] for key, value in RECORD.items() )
+    assert common.fieldConversion( model, 'R_COUNT', '7' ) == 7
+    # A name that is not found is looked up in lower case, unknown names are reported
+    converters[ 'r_lower' ] = common.convertInteger
+    assert converters[ 'R_LOWER' ]( '3' ) == 3
+    assert converters.unknown( [ 'R_ID', 'R_LOWER', 'R_OTHER' ] ) == [ 'R_OTHER' ]
+    with pytest.raises( KeyError ):
+        converters[ 'R_OTHER' ]
+
+
+def test_converter_cost( project_common, report_benchmark ):
+    common, app, db = project_common
+    model = make_model( db )
+    converters = common.fieldConverters( model )
+    instance = model()
+    count = 20000
+    with app.app_context():
+        start = time.perf_counter()
+        for _ in range( count ):
+            for key, value in RECORD.items():
+                common.fieldConversion( instance, key, value )
+
+        perCall = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range( count ):
+            for key, value in RECORD.items():
+                converters[ key ]( value )
+
+        table = time.perf_counter() - start
+
+    report_benchmark( "Conversion of a record of {} fields: fieldConversion() {:.1f} us, converter table {:.1f} us".format(
+                      len( RECORD ), perCall / count * 1e6, table / count * 1e6 ) )
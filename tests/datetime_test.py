@@ -0,0 +1,56 @@
+import time
+import datetime
+
+PLUS_2 = datetime.timezone( datetime.timedelta( hours = 2 ) )
+MIN_5 = datetime.timezone( datetime.timedelta( hours = -5 ) )
+
+# Every format convertDateTime() accepted before the fast path, with the result
+CONFORMANCE = [
+    # JavaScript Date.toString(), the seconds were lost before
+    ( 'Tue Aug 19 1975 23:15:30 GMT+0200 (CEST)', datetime.datetime( 1975, 8, 19, 23, 15, 30, tzinfo = PLUS_2 ) ),
+    # Date.toISOString(), the last digit of the milliseconds was lost before
+    ( '2020-05-17T10:20:30.123Z', datetime.datetime( 2020, 5, 17, 10, 20, 30, 123000 ) ),
+    ( '2020-05-17T10:20:30.120Z', datetime.datetime( 2020, 5, 17, 10, 20, 30, 120000 ) ),
+    ( '2020-05-17T10:20:30.123456Z', datetime.datetime( 2020, 5, 17, 10, 20, 30, 123456 ) ),
+    ( '2020-05-17T10:20:30.120+02:00', datetime.datetime( 2020, 5, 17, 10, 20, 30, 120000, tzinfo = PLUS_2 ) ),
+    ( '2020-05-17T10:20:30-05:00', datetime.datetime( 2020, 5, 17, 10, 20, 30, tzinfo = MIN_5 ) ),
+    ( '2020-05-17 10:20:30', datetime.datetime( 2020, 5, 17, 10, 20, 30 ) ),
+]
+
+# Formats that were rejected before and are accepted by the ISO fast path
+ISO_ONLY = [
+    ( '2020-05-17T10:20:30Z', datetime.datetime( 2020, 5, 17, 10, 20, 30 ) ),
+    ( '2020-05-17T10:20:30+02:00', datetime.datetime( 2020, 5, 17, 10, 20, 30, tzinfo = PLUS_2 ) ),
+    ( '2020-05-17 10:20:30.123', datetime.datetime( 2020, 5, 17, 10, 20, 30, 123000 ) ),
+    ( '2020-05-17T10:20:30', datetime.datetime( 2020, 5, 17, 10, 20, 30 ) ),
+]
+
+
+def test_convert_datetime( project_common ):
+    common, app, db = project_common
+    for value, expected in CONFORMANCE + ISO_ONLY:
+        result = common.convertDateTime( value )
+        assert result == expected and result.tzinfo == expected.tzinfo, value
+
+    # The formats also parse without the fast path, except for the precision of the milliseconds
+    for value, expected in CONFORMANCE:
+        assert abs( common.convertDateTimeFormats( value ) - expected ) < datetime.timedelta( milliseconds = 10 ), value
+
+    before = datetime.datetime.utcnow()
+    assert before <= common.convertDateTime( '0000-00-00T00:00:00.000Z' ) <= datetime.datetime.utcnow()
+    assert common.convertDate( '2020-05-17' ) == datetime.date( 2020, 5, 17 )
+
+
+def test_convert_datetime_cost( project_common, report_benchmark ):
+    common, app, db = project_common
+    values = [ ( datetime.datetime( 2020, 1, 1 ) + datetime.timedelta( seconds = idx * 37 ) )
+               .strftime( '%Y-%m-%dT%H:%M:%S.%f' )[ :-3 ] + 'Z' for idx in range( 100000 ) ]
+    start = time.perf_counter()
+    fast = [ common.convertDateTime( value ) for value in values ]
+    fastTime = time.perf_counter() - start
+    start = time.perf_counter()
+    formats = [ common.convertDateTimeFormats( value ) for value in values ]
+    formatsTime = time.perf_counter() - start
+    report_benchmark( "100k ISO values: fast path {:.2f} s, strptime {:.2f} s".format( fastTime, formatsTime ) )
+    assert len( fast ) == len( formats )
+    assert fastTime < formatsTime
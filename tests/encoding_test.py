@@ -0,0 +1,55 @@
+import json
+import decimal
+import pytest
+
+RECORDS = [ { 'I_ID': 1, 'I_NAME': 'a', 'I_PRICE': decimal.Decimal( '1.50' ) },
+            { 'I_ID': 2, 'I_NAME': 'b', 'I_PRICE': None } ]
+
+
+def test_encode_list( project_common ):
+    common, app, db = project_common
+
+    @app.route( '/api/items/list' )
+    def getItems():
+        return common.encodeList( RECORDS )
+
+    @app.route( '/api/items/pagedlist' )
+    def getPagedItems():
+        return common.encodeList( dict( page = 0, recordCount = 2, records = RECORDS ), 'records' )
+
+    client = app.test_client()
+    response = client.get( '/api/items/list', headers = { 'Accept': 'application/json, */*' } )
+    assert response.mimetype == common.JSON_MIMETYPE and 'Accept' in response.headers[ 'Vary' ]
+    assert json.loads( response.data )[ 0 ][ 'I_NAME' ] == 'a'
+
+    response = client.get( '/api/items/list', headers = { 'Accept': common.COLUMNAR_MIMETYPE } )
+    assert response.mimetype == common.COLUMNAR_MIMETYPE
+    assert json.loads( response.data ) == { 'columns': [ 'I_ID', 'I_NAME', 'I_PRICE' ],
+                                            'data': [ [ 1, 'a', '1.50' ], [ 2, 'b', None ] ] }
+    response = client.get( '/api/items/pagedlist', headers = { 'Accept': common.COLUMNAR_MIMETYPE } )
+    assert json.loads( response.data )[ 'records' ][ 'data' ][ 1 ] == [ 2, 'b', None ]
+    assert json.loads( response.data )[ 'recordCount' ] == 2
+
+    msgpack = pytest.importorskip( 'msgpack' )
+    response = client.get( '/api/items/pagedlist', headers = { 'Accept': 'application/msgpack, application/json;q=0.5' } )
+    assert response.mimetype == common.MSGPACK_MIMETYPE
+    assert msgpack.unpackb( response.data )[ 'records' ][ 0 ] == { 'I_ID': 1, 'I_NAME': 'a', 'I_PRICE': '1.50' }
+
+
+def test_encoded_size( project_common, report_benchmark ):
+    common, app, db = project_common
+    pytest.importorskip( 'msgpack' )
+    records = [ { 'I_ID': idx, 'I_NAME': 'item {}'.format( idx ), 'I_COUNT': idx * 3, 'I_ACTIVE': idx % 2 == 0 }
+                for idx in range( 50000 ) ]
+
+    @app.route( '/api/items/list' )
+    def getItems():
+        return common.encodeList( records )
+
+    client = app.test_client()
+    sizes = { mimetype: len( client.get( '/api/items/list', headers = { 'Accept': mimetype } ).data )
+              for mimetype in ( common.JSON_MIMETYPE, common.COLUMNAR_MIMETYPE, common.MSGPACK_MIMETYPE ) }
+    report_benchmark( "50k records: JSON {} bytes, columnar JSON {} bytes, msgpack {} bytes".format(
+                      sizes[ common.JSON_MIMETYPE ], sizes[ common.COLUMNAR_MIMETYPE ], sizes[ common.MSGPACK_MIMETYPE ] ) )
+    assert sizes[ common.COLUMNAR_MIMETYPE ] < sizes[ common.JSON_MIMETYPE ]
+    assert sizes[ common.MSGPACK_MIMETYPE ] < sizes[ common.JSON_MIMETYPE ]
@@ -0,0 +1,60 @@
+import os
+import gencrud
+import gencrud.generator
+from gencrud.configuraton import TemplateConfiguration
+from gencrud.constants import C_PYTHON
+from .helpers import synthetic_config
+
+TEMPLATES = os.path.join( os.path.dirname( gencrud.__file__ ), 'templates' )
+
+
+def project_config( root: str ) -> dict:
+    config = synthetic_config( 2, False )
+    config[ 'source' ] = { 'base': root, 'python': 'python', 'angular': 'angular' }
+    config[ 'templates' ] = { 'python': os.path.join( TEMPLATES, 'python' ),
+                              'angular': os.path.join( TEMPLATES, 'angular' ) }
+    return config
+
+
+def test_stat_calls_per_run( tmp_path, monkeypatch, report_benchmark ):
+    root = str( tmp_path )
+    for folder in ( 'python', 'angular' ):
+        os.mkdir( os.path.join( root, folder ) )
+
+    with open( os.path.join( root, 'python', 'config.yaml' ), 'w' ) as stream:
+        stream.write( 'COMMON:\n  API_MODULE: testrun\n' )
+
+    counter = { 'stat': 0, 'listdir': 0 }
+    stat, listdir = os.stat, os.listdir
+
+    def counting_stat( *args, **kwargs ):
+        counter[ 'stat' ] += 1
+        return stat( *args, **kwargs )
+
+    def counting_listdir( *args, **kwargs ):
+        counter[ 'listdir' ] += 1
+        return listdir( *args, **kwargs )
+
+    monkeypatch.setattr( os, 'stat', counting_stat )
+    monkeypatch.setattr( os, 'listdir', counting_listdir )
+
+    def run():
+        # What the generators use per input file, object and template
+        config = TemplateConfiguration( **project_config( root ) )
+        gencrud.generator.verifyLoadProject( config, C_PYTHON )
+        for _obj in config:
+            for _templ in range( 10 ):
+                for source in ( config.python, config.angular ):
+                    assert os.path.isabs( source.sourceFolder )
+                    assert source.templateFolder.startswith( TEMPLATES )
+                    assert source.commonFolder.startswith( TEMPLATES )
+
+        return dict( counter )
+
+    first = run()
+    report_benchmark( "First input file: {stat} stat and {listdir} listdir calls".format( **first ) )
+    assert first[ 'listdir' ] == 2
+    counter.update( stat = 0, listdir = 0 )
+
+    # The next input files of the same project resolve nothing again
+    assert run() == { 'stat': 0, 'listdir': 0 }
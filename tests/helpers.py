@@ -0,0 +1,51 @@
+import os
+import gencrud
+
+COMMON_PY = os.path.join( os.path.dirname( gencrud.__file__ ), 'templates', 'common', 'python', 'common.py' )
+
+
+def make_model( db ):
+    class Item( db.Model ):
+        __tablename__   = 'ITEMS'
+        I_ID            = db.Column( db.Integer, primary_key = True, autoincrement = True )
+        I_NAME          = db.Column( db.String( 40 ) )
+        I_COUNT         = db.Column( db.Integer )
+        I_PRICE         = db.Column( db.Float )
+
+    return Item
+
+
+def fill( db, model, count ):
+    db.session.execute( model.__table__.insert(),
+                        [ { 'I_NAME': 'item {:08}'.format( idx ), 'I_COUNT': idx, 'I_PRICE': idx / 10 }
+                          for idx in range( count ) ] )
+    db.session.commit()
+
+
+def synthetic_config( count: int, streaming: bool ) -> dict:
+    objects = []
+    for idx in range( count ):
+        objects.append( {
+            'name': 'obj{}'.format( idx ),
+            'title': 'Object {}'.format( idx ),
+            'class': 'Object{}'.format( idx ),
+            'uri': '/api/obj{}'.format( idx ),
+            'actions': [ { 'name': 'new', 'type': 'dialog' },
+                         { 'name': 'edit', 'type': 'screen', 'route': { 'class': 'ScreenObject{}Component'.format( idx ) } } ],
+            'menu': { 'caption': 'Objects',
+                      'menu': { 'caption': 'Object {}'.format( idx ), 'route': '/obj{}'.format( idx ) } },
+            'table': {
+                'name': 'OBJ_{}'.format( idx ),
+                'columns': [ { 'field': 'O{}_ID INT AUTO NUMBER PRIMARY KEY'.format( idx ),
+                               'label': 'Id' } ] +
+                           [ { 'field': 'O{}_FIELD{} CHAR( 40 ) NULL'.format( idx, col ),
+                               'label': 'Field {}'.format( col ),
+                               'ui': { 'type': 'textbox' },
+                               'listview': { 'index': col, 'width': '5%' } } for col in range( 10 ) ]
+            }
+        } )
+
+    return { 'source': { 'python': 'python', 'angular': 'angular' },
+             'application': 'testrun',
+             'options': { 'streaming': streaming },
+             'objects': objects }
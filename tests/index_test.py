@@ -0,0 +1,36 @@
+from gencrud.configuraton import TemplateConfiguration
+from .helpers import synthetic_config
+
+
+def table_config( **table ) -> dict:
+    config = synthetic_config( 2, False )
+    columns = config[ 'objects' ][ 1 ][ 'table' ][ 'columns' ]
+    columns.append( { 'field': 'O1_REF INT FOREIGN KEY OBJ_0.O0_ID', 'label': 'Ref' } )
+    columns[ 4 ][ 'listview' ][ 'filter' ] = True
+    config[ 'objects' ][ 1 ][ 'table' ].update( table )
+    return config
+
+
+def indexes( **table ) -> list:
+    config = TemplateConfiguration( **table_config( **table ) )
+    return [ obj for obj in config ][ 1 ].table.indexes
+
+
+def test_inferred_indexes():
+    result = indexes( viewSort = { 'field': 'O1_FIELD2', 'direction': 'asc' } )
+    assert [ index.name for index in result ] == [ 'OBJ_1_O1_FIELD2_IDX', 'OBJ_1_O1_REF_IDX', 'OBJ_1_O1_FIELD3_IDX' ]
+    assert result[ 1 ].sqlAlchemyDef( 'Object1' ) == "db.Index( 'OBJ_1_O1_REF_IDX', Object1.O1_REF )"
+    # The keyset index already starts with the sort field
+    result = indexes( viewSort = { 'field': 'O1_FIELD2', 'direction': 'asc', 'keyset': True } )
+    assert [ index.name for index in result ] == [ 'OBJ_1_O1_REF_IDX', 'OBJ_1_O1_FIELD3_IDX' ]
+    assert indexes( autoIndex = False ) == []
+
+
+def test_explicit_indexes():
+    result = indexes( indexes = [ { 'columns': 'O1_FIELD3, O1_FIELD5' },
+                                  { 'name': 'OBJ_1_OPEN_IDX', 'columns': [ 'O1_REF' ],
+                                    'unique': True, 'where': 'O1_FIELD7 IS NULL' } ] )
+    assert [ index.name for index in result ] == [ 'OBJ_1_O1_FIELD3_O1_FIELD5_IDX', 'OBJ_1_OPEN_IDX' ]
+    assert result[ 1 ].sqlAlchemyDef( 'Object1' ) == ( "db.Index( 'OBJ_1_OPEN_IDX', Object1.O1_REF, unique = True, "
+                                                     "postgresql_where = db.text( 'O1_FIELD7 IS NULL' ), "
+                                                     "sqlite_where = db.text( 'O1_FIELD7 IS NULL' ) )" )
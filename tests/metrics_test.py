@@ -0,0 +1,32 @@
+import pytest
+
+
+def test_endpoint_metrics( project_common ):
+    common, app, db = project_common
+    flask = pytest.importorskip( 'flask' )
+    blueprint = flask.Blueprint( 'metricsApi', __name__ )
+    common.endpointMetrics.register( blueprint )
+
+    @blueprint.route( '/api/items/list', methods = [ 'GET' ] )
+    def getItems():
+        common.countRows( 3 )
+        return flask.jsonify( [ 1, 2, 3 ] )
+
+    @blueprint.route( '/api/items/get/<int:id>', methods = [ 'GET' ] )
+    def getItem( id ):
+        return "Not found", 404
+
+    app.register_blueprint( blueprint )
+    client = app.test_client()
+    for _ in range( 2 ):
+        size = len( client.get( '/api/items/list' ).data )
+
+    client.get( '/api/items/get/1' )
+    client.get( '/api/other' )
+    statistics = common.endpointMetrics.statistics()
+    assert set( statistics ) == { 'GET /api/items/list', 'GET /api/items/get/<int:id>' }
+    listed = statistics[ 'GET /api/items/list' ]
+    assert listed[ 'count' ] == 2 and listed[ 'rows' ] == 6 and listed[ 'status' ] == { '200': 2 }
+    assert listed[ 'bytes' ] == 2 * size
+    assert sum( listed[ 'histogram' ].values() ) == 2
+    assert statistics[ 'GET /api/items/get/<int:id>' ][ 'status' ] == { '404': 1 }
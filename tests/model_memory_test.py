@@ -0,0 +1,124 @@
+import os
+import sys
+import time
+import types
+import tracemalloc
+import pytest
+import gencrud
+from gencrud.configuraton import TemplateConfiguration
+from .helpers import synthetic_config
+
+MODEL_TEMPLATE = os.path.join( os.path.dirname( gencrud.__file__ ), 'templates', 'python', 'model.py.templ' )
+ROWS = 100000
+
+
+@pytest.fixture
+def models( project_common, monkeypatch ):
+    """The generated models of two tables, the second with a foreign key to the first"""
+    mako = pytest.importorskip( 'mako.template' )
+    common, app, db = project_common
+    monkeypatch.setitem( sys.modules, 'webapp2.common', types.ModuleType( 'webapp2.common' ) )
+    monkeypatch.setitem( sys.modules, 'toastedmarshmallow', types.ModuleType( 'toastedmarshmallow' ) )
+    config = synthetic_config( 2, False )
+    config[ 'objects' ][ 1 ][ 'table' ][ 'columns' ].append( {
+        'field': 'O1_REF INT FOREIGN KEY OBJ_0.O0_ID NULL',
+        'label': 'Ref',
+        'ui': { 'type': 'choice', 'service': { 'class': 'Object0', 'name': 'obj0',
+                                               'value': 'O0_ID', 'label': 'O0_FIELD0' } } } )
+    config[ 'objects' ][ 1 ][ 'table' ][ 'columns' ].append( {
+        'field': 'O1_STATE INT NULL',
+        'label': 'State',
+        'ui': { 'type': 'choice', 'resolve-list': { 0: 'Open', 1: 'Closed' } } } )
+    result = []
+    for obj in TemplateConfiguration( **config ):
+        source = mako.Template( filename = MODEL_TEMPLATE ).render( obj = obj, root = None, modules = [],
+                                                                    date = '', version = '', username = '' )
+        module = types.ModuleType( 'testrun.{}.model'.format( obj.name ) )
+        exec( compile( source, module.__name__, 'exec' ), module.__dict__ )
+        result.append( module )
+
+    with app.app_context():
+        db.create_all()
+        yield app, db, result
+
+
+def test_dictionary_depth( models ):
+    app, db, ( obj0, obj1 ) = models
+    db.session.add( obj0.Object0( O0_ID = 1, O0_FIELD0 = 'ref' ) )
+    db.session.add( obj1.Object1( O1_ID = 1, O1_FIELD0 = 'a', O1_REF = 1 ) )
+    db.session.add( obj1.Object1( O1_ID = 2, O1_FIELD0 = 'b' ) )
+    db.session.commit()
+    record = obj1.Object1.query.get( 1 )
+    assert record.dictionary[ 'O1_REF_FK' ][ 'O0_FIELD0' ] == 'ref'
+    assert 'O1_REF_FK' not in record.toDict( 0 )
+    assert record.toSql().startswith( 'INSERT INTO OBJ_1 ( O1_ID, O1_FIELD0' )
+    memory = obj1.Object1Memory.fetch( obj1.Object1.O1_ID == 1 )
+    assert not hasattr( memory, '__dict__' )
+    assert memory.dictionary == dict( record.toDict( 0 ), O1_REF_FK = record.O1_REF_FK.toDict( 0 ), O1_STATE_LABEL = None )
+    assert [ m.O1_REF_FK for m in obj1.Object1Memory.fetch_many( order_by = 'O1_ID' ) ] == [ { 'O0_ID': 1, 'O0_FIELD0': 'ref',
+        **{ 'O0_FIELD{}'.format( idx ): None for idx in range( 1, 10 ) } }, None ]
+    # The derived fields of the schema have a slot, other keys are refused
+    memory = obj1.Object1Memory( O1_FIELD0 = 'set', O1_STATE = 1, O1_STATE_LABEL = 'Closed' )
+    assert ( memory.O1_FIELD0, memory.O1_STATE_LABEL ) == ( 'set', 'Closed' )
+    with pytest.raises( TypeError ):
+        obj1.Object1Memory( O1_OTHER = 1 )
+
+
+def measure( produce ) -> tuple:
+    # The time without tracemalloc, which slows down the allocations
+    start = time.perf_counter()
+    count = produce()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    try:
+        produce()
+        return elapsed, tracemalloc.get_traced_memory()[ 1 ], count
+
+    finally:
+        tracemalloc.stop()
+
+
+def test_fetch_benchmark( models, report_benchmark ):
+    """Fetching 100k rows as Memory objects; the dict based objects of a query.all()
+    as before, the slots of fetch_many() and fetch_iter() that keeps one at a time.
+    """
+    app, db, ( obj0, obj1 ) = models
+    db.session.execute( obj0.Object0.__table__.insert(), [ { 'O0_FIELD0': 'ref {}'.format( idx ) }
+                                                            for idx in range( 100 ) ] )
+    db.session.execute( obj1.Object1.__table__.insert(), [ dict( { 'O1_FIELD{}'.format( col ): 'value {}'.format( idx )
+                                                                   for col in range( 10 ) }, O1_REF = idx % 100 + 1 )
+                                                           for idx in range( ROWS ) ] )
+    db.session.commit()
+    Memory = obj1.Object1Memory
+
+    class DictMemory( object ):
+        def __init__( self, record ):
+            for name in Memory.__slots__[ :-1 ]:
+                setattr( self, name, getattr( record, name ) )
+
+            self.O1_REF_FK = record.O1_REF_FK.toDict( 0 )
+
+    def fetchDict():
+        result = [ DictMemory( record ) for record in db.session.query( obj1.Object1 ).all() ]
+        db.session.remove()
+        return len( result )
+
+    def fetchMany():
+        result = Memory.fetch_many()
+        db.session.remove()
+        return len( result )
+
+    def fetchIter():
+        count = sum( 1 for record in Memory.fetch_iter() )
+        db.session.remove()
+        return count
+
+    results = {}
+    for name, produce in ( ( 'dict', fetchDict ), ( 'fetch_many', fetchMany ), ( 'fetch_iter', fetchIter ) ):
+        results[ name ] = measure( produce )
+        assert results[ name ][ 2 ] == ROWS
+        report_benchmark( "{} rows, {:10}: {:.2f} s, peak {:.1f} MB".format( ROWS, name, results[ name ][ 0 ],
+                                                                             results[ name ][ 1 ] / 2 ** 20 ) )
+
+    assert results[ 'fetch_many' ][ 1 ] < results[ 'dict' ][ 1 ]
+    assert results[ 'fetch_iter' ][ 1 ] < results[ 'fetch_many' ][ 1 ] / 10
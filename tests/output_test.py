@@ -0,0 +1,70 @@
+import os
+import pytest
+import gencrud.util.utils
+from gencrud.util.output import GeneratedFiles
+
+
+def test_in_memory_changes( tmp_path, monkeypatch ):
+    monkeypatch.setattr( gencrud.util.utils, 'checkFiles', True )
+    same = os.path.join( str( tmp_path ), 'same.ts' )
+    other = os.path.join( str( tmp_path ), 'other.ts' )
+    for filename in ( same, other ):
+        with open( filename, 'w' ) as stream:
+            stream.write( 'export const x = 1;\n' )
+
+    files = GeneratedFiles()
+    files.write( same, 'export const x = 1;\n' )
+    files.write( other, 'export const x = 2;\n' )
+    files.makedirs( os.path.join( str( tmp_path ), 'module' ) )
+    files.write( os.path.join( str( tmp_path ), 'module', 'new.ts' ), 'new\n' )
+    files.write( os.path.join( str( tmp_path ), 'app.module.json' ), '{}' )
+    files.remove( os.path.join( str( tmp_path ), 'app.module.json' ) )
+
+    # Nothing touched on disk, but later reads see the pending content
+    assert sorted( os.listdir( str( tmp_path ) ) ) == [ 'other.ts', 'same.ts' ]
+    assert files.isdir( os.path.join( str( tmp_path ), 'module' ) )
+    assert files.read( other ) == 'export const x = 2;\n'
+
+    assert sorted( ( os.path.basename( f ), s ) for f, s in files.changes() ) == [ ( 'new.ts', 'create' ),
+                                                                                   ( 'other.ts', 'update' ) ]
+    diff = files.diff( os.path.abspath( other ) )
+    assert '-export const x = 1;\n' in diff and '+export const x = 2;\n' in diff
+
+
+def test_removed_file_not_read( tmp_path, monkeypatch ):
+    monkeypatch.setattr( gencrud.util.utils, 'checkFiles', True )
+    removed = os.path.join( str( tmp_path ), 'removed.ts' )
+    with open( removed, 'w' ) as stream:
+        stream.write( 'export const x = 1;\n' )
+
+    files = GeneratedFiles()
+    files.remove( removed )
+    # Still on disk, but the pending result is that it is gone
+    assert os.path.isfile( removed )
+    assert not files.isfile( removed )
+    with pytest.raises( FileNotFoundError ):
+        files.read( removed )
+
+    assert [ s for f, s in files.changes() ] == [ 'remove' ]
+
+
+def test_check_implies_overwrite( monkeypatch ):
+    from gencrud.config.options import TemplateOptions
+    monkeypatch.setattr( gencrud.util.utils, 'checkFiles', False )
+    assert not TemplateOptions( overwrite = False ).overWriteFiles
+    monkeypatch.setattr( gencrud.util.utils, 'checkFiles', True )
+    assert TemplateOptions( overwrite = False ).overWriteFiles
+
+
+def test_failed_check_exits_non_zero( tmp_path, monkeypatch ):
+    import sys
+    import gencrud.generator
+    for name in ( 'checkFiles', 'diffFiles', 'overWriteFiles' ):
+        monkeypatch.setattr( gencrud.util.utils, name, False )
+
+    monkeypatch.setattr( gencrud.util.utils, 'check_nltk', lambda: None )
+    monkeypatch.setattr( sys, 'argv', [ 'gencrud', '--check', str( tmp_path / 'missing.yaml' ) ] )
+    with pytest.raises( SystemExit ) as exc:
+        gencrud.generator.main()
+
+    assert exc.value.code == 2
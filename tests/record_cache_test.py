@@ -0,0 +1,185 @@
+import time
+import pytest
+from .helpers import make_model
+
+
+class FakeRedis( object ):
+    """The hash commands of a Redis client the record cache uses"""
+    def __init__( self ):
+        self.data = {}
+        self.expires = {}
+
+    def hget( self, key, field ):
+        if self.expires.get( key, float( 'inf' ) ) < time.monotonic():
+            self.delete( key )
+
+        value = self.data.get( key, {} ).get( field )
+        return None if value is None else value.encode( 'utf-8' )
+
+    def hset( self, key, field, value ):
+        self.data.setdefault( key, {} )[ field ] = value
+
+    def expire( self, key, seconds ):
+        self.expires[ key ] = time.monotonic() + seconds
+
+    def delete( self, *keys ):
+        for key in keys:
+            self.data.pop( key, None )
+            self.expires.pop( key, None )
+
+    def pipeline( self ):
+        client = self
+
+        class Pipeline( object ):
+            def __init__( self ):
+                self.calls = []
+
+            def __getattr__( self, name ):
+                return lambda *args: self.calls.append( ( getattr( client, name ), args ) )
+
+            def execute( self ):
+                return [ method( *args ) for method, args in self.calls ]
+
+        return Pipeline()
+
+
+def test_memory_store( project_common ):
+    common, app, db = project_common
+    store = common.MemoryRecordStore( 2 )
+    store.put( '1', '', { 'a': 1 }, 60 )
+    store.put( '1', 'fields', { 'b': 1 }, 60 )
+    store.put( '2', '', { 'a': 2 }, 60 )
+    assert store.get( '1', '' ) == { 'a': 1 }
+    store.put( '3', '', { 'a': 3 }, 60 )
+    # '2' is the least recently used
+    assert store.get( '2', '' ) is None and store.get( '1', 'fields' ) == { 'b': 1 }
+    store.delete( [ '1' ] )
+    assert store.get( '1', '' ) is None and len( store ) == 1
+    store.put( '4', '', { 'a': 4 }, 0 )
+    assert store.get( '4', '' ) is None
+
+
+@pytest.mark.parametrize( 'backend', [ 'memory', 'redis' ] )
+def test_record_cache_invalidation( project_common, backend ):
+    common, app, db = project_common
+    if backend == 'redis':
+        app.config[ 'RECORD_CACHE_CLIENT' ] = FakeRedis()
+
+    model = make_model( db )
+    with app.app_context():
+        common.trackTableVersion( model )
+        cache = common.RecordCache( model, ttl = 60, size = 10 )
+        db.create_all()
+        common.bulkNew( db.session, model, [ { 'I_NAME': 'a' }, { 'I_NAME': 'b' }, { 'I_NAME': 'c' } ], lambda r: r )
+        for key in ( 1, 2, 3 ):
+            cache.put( key, { 'I_NAME': model.query.get( key ).I_NAME } )
+
+        assert cache.get( 1 ) == { 'I_NAME': 'a' } and cache.get( 1, 'I_ID' ) is None
+
+        # An update through the ORM removes the record after the commit, not before
+        model.query.get( 1 ).I_NAME = 'x'
+        db.session.flush()
+        assert cache.get( 1 ) is not None
+        db.session.commit()
+        assert cache.get( 1 ) is None
+        # The commit changed the version of the table, the other records are stale as well
+        assert cache.get( 2 ) is None
+        cache.put( 2, { 'I_NAME': 'b' } )
+
+        # A rollback keeps it
+        db.session.delete( model.query.get( 2 ) )
+        db.session.flush()
+        db.session.rollback()
+        assert cache.get( 2 ) is not None
+
+        # The bulk operations bypass the ORM events
+        common.bulkUpdate( db.session, model, [ { 'I_ID': 2, 'I_NAME': 'y' } ], lambda r: r )
+        assert cache.get( 2 ) is None
+        common.bulkDelete( db.session, model, [ 3 ] )
+        assert cache.get( 3 ) is None
+        assert cache.statistics()[ 'hits' ] == 3
+
+        # A read that misses while a write commits does not store the record it read
+        versions = cache.versions()
+        name = model.query.get( 1 ).I_NAME
+        db.session.close()
+        model.query.get( 1 ).I_NAME = 'z'
+        db.session.commit()
+        cache.put( 1, { 'I_NAME': name }, versions = versions )
+        assert cache.get( 1 ) is None
+        cache.put( 1, { 'I_NAME': 'z' }, versions = cache.versions() )
+        assert cache.get( 1 ) == { 'I_NAME': 'z' }
+
+    # In a request the versions that conditionalGet() took for the ETag are used
+    with app.test_request_context( '/api/items/get/1' ):
+        common.g.tableVersions = ( common.versionedTables( model ), [ -1 ] )
+        assert cache.versions() == [ -1 ]
+
+    assert isinstance( cache.store, common.RedisRecordStore if backend == 'redis' else common.MemoryRecordStore )
+
+
+def test_record_cache_nested( project_common ):
+    common, app, db = project_common
+
+    class Group( db.Model ):
+        __tablename__   = 'GROUPS'
+        G_ID            = db.Column( db.Integer, primary_key = True )
+        G_NAME          = db.Column( db.String( 40 ) )
+
+    class Member( db.Model ):
+        __tablename__   = 'MEMBERS'
+        M_ID            = db.Column( db.Integer, primary_key = True )
+        M_GROUP         = db.Column( db.Integer, db.ForeignKey( 'GROUPS.G_ID' ) )
+        M_GROUP_FK      = db.relationship( 'Group' )
+
+    with app.app_context():
+        common.trackTableVersion( Group )
+        common.trackTableVersion( Member )
+        cache = common.RecordCache( Member )
+        db.create_all()
+        db.session.add( Group( G_ID = 1, G_NAME = 'old' ) )
+        db.session.add( Member( M_ID = 1, M_GROUP = 1 ) )
+        db.session.commit()
+        cache.put( 1, { 'M_GROUP_FK': { 'G_NAME': 'old' } } )
+        assert cache.get( 1 ) is not None
+        # The serialized member nests the group, a change of any group makes it stale
+        Group.query.get( 1 ).G_NAME = 'new'
+        db.session.commit()
+        assert cache.get( 1 ) is None
+
+
+def test_record_cache_cost( project_common, report_benchmark ):
+    common, app, db = project_common
+    marshmallow = pytest.importorskip( 'marshmallow' )
+    model = make_model( db )
+
+    class ItemSchema( marshmallow.Schema ):
+        class Meta:
+            fields = ( 'I_ID', 'I_NAME', 'I_COUNT', 'I_PRICE' )
+
+    schema = ItemSchema()
+    count = 2000
+    with app.app_context():
+        cache = common.RecordCache( model )
+        db.create_all()
+        common.bulkNew( db.session, model, [ { 'I_NAME': 'item {}'.format( idx ), 'I_COUNT': idx }
+                                             for idx in range( 100 ) ], lambda r: r )
+        start = time.perf_counter()
+        for idx in range( count ):
+            schema.dump( db.session.query( model ).get( idx % 100 + 1 ) )
+            db.session.remove()
+
+        uncached = time.perf_counter() - start
+        start = time.perf_counter()
+        for idx in range( count ):
+            data = cache.get( idx % 100 + 1 )
+            if data is None:
+                data = schema.dump( db.session.query( model ).get( idx % 100 + 1 ) )
+                cache.put( idx % 100 + 1, data )
+                db.session.remove()
+
+        cached = time.perf_counter() - start
+
+    report_benchmark( "{} reads of 100 records: query {:.0f} us, record cache {:.0f} us per read, hit rate {:.0%}".format(
+                      count, uncached / count * 1e6, cached / count * 1e6, cache.statistics()[ 'hitRate' ] ) )
+    assert cached < uncached
@@ -1,4 +1,5 @@
 from gencrud.configuraton import TemplateConfiguration
+import io
 import os
 from pytest import fixture
 import pytest
@@ -23,3 +24,21 @@ def test_normal_schema(normal_template_config: TemplateConfiguration):
 
 def test_invalid_schema(invalid_template_config: TemplateConfiguration):
     assert True
+
+
+def test_controls_parsed_once(monkeypatch):
+    import yaml
+    import gencrud.config.dynamic.controls as controls
+    filename = os.path.join(os.getcwd(), 'tests', 'input', 'te_format.yaml')
+    with open(filename, 'r') as stream:
+        text = stream.read().replace('application:', 'controls: true\napplication:', 1)
+
+    monkeypatch.setattr(controls, '_controlDefinitions', {})
+    loads = []
+    safeLoad = yaml.safe_load
+    monkeypatch.setattr(controls.yaml, 'safe_load', lambda stream: loads.append(stream.name) or safeLoad(stream))
+    first = TemplateConfiguration(io.StringIO(text))
+    second = TemplateConfiguration(io.StringIO(text))
+    assert loads == [controls.C_PYT_CONTROLS_FILE]
+    assert first.controls.get('textbox') is not None
+    assert second.controls.get('textbox') is not None
@@ -0,0 +1,73 @@
+import pytest
+from gencrud.configuraton import TemplateConfiguration
+from .helpers import synthetic_config
+
+
+def search_table( search ):
+    config = synthetic_config( 2, False )
+    config[ 'objects' ][ 1 ][ 'table' ][ 'search' ] = search
+    return [ obj for obj in TemplateConfiguration( **config ) ][ 1 ].table
+
+
+def make_models( db ):
+    class Owner( db.Model ):
+        __tablename__   = 'OWNERS'
+        W_ID            = db.Column( db.Integer, primary_key = True )
+        W_NAME          = db.Column( db.String( 40 ) )
+
+    class Note( db.Model ):
+        __tablename__   = 'OBJ_1'
+        O1_ID           = db.Column( db.Integer, primary_key = True )
+        O1_OWNER        = db.Column( db.Integer, db.ForeignKey( 'OWNERS.W_ID' ) )
+        O1_STATE        = db.Column( db.Integer )
+        O1_OWNER_FK     = db.relationship( Owner )
+
+    for idx in range( 10 ):
+        setattr( Note, 'O1_FIELD{}'.format( idx ), db.Column( db.String( 40 ) ) )
+
+    return Owner, Note
+
+
+def test_search_ddl():
+    assert search_table( 'like' ).searchDDL() == []
+    table = search_table( 'fts5' )
+    assert table.searchColumns == [ 'O1_FIELD{}'.format( idx ) for idx in range( 10 ) ]
+    assert [ dialect for dialect, statement in table.searchDDL() ] == [ 'sqlite' ] * 4
+    assert [ dialect for dialect, statement in search_table( 'tsvector' ).searchDDL() ] == [ 'postgresql' ] * 2
+
+
+@pytest.mark.parametrize( 'index', [ 'like', 'fts5' ] )
+def test_search( project_common, index ):
+    common, app, db = project_common
+    Owner, Note = make_models( db )
+    for dialect, statement in search_table( index ).searchDDL():
+        db.event.listen( Note.__table__, 'after_create', db.DDL( statement ).execute_if( dialect = dialect ) )
+
+    columns = [ 'O1_FIELD{}'.format( idx ) for idx in range( 10 ) ] + [ 'O1_OWNER_FK', 'O1_STATE' ]
+    labels = { 'O1_STATE': { 0: 'Open', 1: 'Closed' } }
+    with app.app_context():
+        db.create_all()
+        db.session.add_all( [ Owner( W_ID = 1, W_NAME = 'Alice' ), Owner( W_ID = 2, W_NAME = 'Bob' ) ] )
+        db.session.add_all( [ Note( O1_ID = 1, O1_OWNER = 1, O1_STATE = 0, O1_FIELD0 = 'quick brown fox' ),
+                              Note( O1_ID = 2, O1_OWNER = 2, O1_STATE = 1, O1_FIELD3 = 'lazy dog' ),
+                              Note( O1_ID = 3, O1_OWNER = 2, O1_STATE = 0, O1_FIELD9 = 'brown dog' ) ] )
+        db.session.commit()
+        # The FTS5 table follows the updates
+        db.session.query( Note ).filter( Note.O1_ID == 3 ).update( { 'O1_FIELD9': 'brown cow' } )
+        db.session.commit()
+
+        def search( text ):
+            paged = common.PagedListQuery( Note, db.session.query( Note ), { 'O1_OWNER_FK': [ 'W_NAME' ] } )
+            paged.search( text, columns, labels, index )
+            return sorted( record.O1_ID for record in paged.query.all() )
+
+        assert search( 'brown' ) == [ 1, 3 ]
+        assert search( 'Brown bob' ) == [ 3 ]
+        assert search( 'dog' ) == [ 2 ]
+        assert search( 'closed' ) == [ 2 ]
+        assert search( 'alice open' ) == [ 1 ]
+        assert search( 'nothing' ) == []
+        assert search( '' ) == [ 1, 2, 3 ]
+        assert search( '"%' ) == []
+        # The full text index matches words by prefix, ILIKE anywhere
+        assert search( 'rown' ) == ( [ 1, 3 ] if index == 'like' else [] )
@@ -0,0 +1,83 @@
+import os
+import sys
+import types
+import shutil
+import logging
+import importlib
+import pytest
+from .helpers import make_model, COMMON_PY
+
+
+@pytest.fixture
+def project_main( project_common, tmp_path, monkeypatch ):
+    """The main.py of a generated project, in a package with its common.py"""
+    common, app, db = project_common
+    package = tmp_path / 'sqlproject'
+    package.mkdir()
+    ( package / '__init__.py' ).write_text( '' )
+    shutil.copy( COMMON_PY, str( package / 'common.py' ) )
+    shutil.copy( os.path.join( os.path.dirname( COMMON_PY ), 'main.py' ), str( package / 'main.py' ) )
+    sql = types.ModuleType( 'common.sql' )
+    sql.getSqlStatement = lambda statement: 'SQL: {}'.format( statement )
+    monkeypatch.setitem( sys.modules, 'common', types.ModuleType( 'common' ) )
+    monkeypatch.setitem( sys.modules, 'common.sql', sql )
+    monkeypatch.syspath_prepend( str( tmp_path ) )
+    main = importlib.import_module( 'sqlproject.main' )
+    yield main, app, db
+    sqlalchemy = pytest.importorskip( 'sqlalchemy' )
+    for name, listener in ( ( 'before_cursor_execute', main._beforeCursorExecute ),
+                            ( 'after_cursor_execute', main._afterCursorExecute ) ):
+        if sqlalchemy.event.contains( main.Engine, name, listener ):
+            sqlalchemy.event.remove( main.Engine, name, listener )
+
+    for name in [ name for name in sys.modules if name.startswith( 'sqlproject' ) ]:
+        del sys.modules[ name ]
+
+
+def test_query_headers( project_main, caplog ):
+    main, app, db = project_main
+    model = make_model( db )
+    main.registerSqlInstrumentation( app )
+
+    @app.route( '/api/items/count' )
+    def countItems():
+        return str( model.query.count() + model.query.filter( model.I_ID > 0 ).count() )
+
+    with app.app_context():
+        db.create_all()
+
+    client = app.test_client()
+    app.debug = False
+    assert 'X-Query-Count' not in client.get( '/api/items/count' ).headers
+    app.debug = True
+    response = client.get( '/api/items/count' )
+    assert response.headers[ 'X-Query-Count' ] == '2'
+    assert float( response.headers[ 'X-DB-Time' ] ) >= 0
+
+    app.config[ 'SQL_SLOW_QUERY' ] = 0
+    with caplog.at_level( logging.WARNING ):
+        client.get( '/api/items/count' )
+
+    assert any( 'Slow query' in record.getMessage() and 'SQL: SELECT' in record.getMessage()
+                for record in caplog.records )
+
+
+def test_nested_executions( project_main, monkeypatch ):
+    main, app, db = project_main
+    app.config[ 'SQL_SLOW_QUERY' ] = None
+    clock = iter( [ 1.0, 2.0, 2.5, 4.0 ] )
+    monkeypatch.setattr( main.time, 'perf_counter', lambda: next( clock ) )
+    conn = types.SimpleNamespace( info = {} )
+    with app.test_request_context():
+        # Only the end of an execution that started before the registration
+        main._afterCursorExecute( conn, None, 'SELECT 1', (), None, False )
+        assert main.g.get( 'queryCount' ) is None
+        # An execution inside another one does not overwrite the start of the outer one
+        main._beforeCursorExecute( conn, None, 'SELECT 1', (), None, False )
+        main._beforeCursorExecute( conn, None, 'SELECT 2', (), None, False )
+        main._afterCursorExecute( conn, None, 'SELECT 2', (), None, False )
+        main._afterCursorExecute( conn, None, 'SELECT 1', (), None, False )
+        assert main.g.queryCount == 2
+        assert main.g.dbTime == pytest.approx( 0.5 + 3.0 )
+
+    assert conn.info[ 'queryStart' ] == []
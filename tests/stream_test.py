@@ -0,0 +1,68 @@
+import json
+import tracemalloc
+import pytest
+from .helpers import make_model, fill
+
+
+def peak_memory( produce ) -> tuple:
+    tracemalloc.start()
+    try:
+        size = 0
+        for chunk in produce():
+            size += len( chunk )
+
+        return tracemalloc.get_traced_memory()[ 1 ], size
+
+    finally:
+        tracemalloc.stop()
+
+
+def test_stream_formats( project_common ):
+    common, app, db = project_common
+    marshmallow = pytest.importorskip( 'marshmallow' )
+    model = make_model( db )
+
+    class ItemSchema( marshmallow.Schema ):
+        class Meta:
+            fields = ( 'I_ID', 'I_NAME' )
+
+    with app.app_context():
+        db.create_all()
+        fill( db, model, 5 )
+        query = db.session.query( model ).order_by( model.I_ID )
+        array = ''.join( common.streamRecords( query, ItemSchema( many = True ), chunk_size = 2 ) )
+        assert [ row[ 'I_ID' ] for row in json.loads( array ) ] == [ 1, 2, 3, 4, 5 ]
+        lines = ''.join( common.streamRecords( query, ItemSchema( many = True ), True, chunk_size = 2 ) )
+        assert [ json.loads( line )[ 'I_NAME' ] for line in lines.splitlines() ][ -1 ] == 'item 00000004'
+        assert ''.join( common.streamRecords( query.filter( model.I_ID < 0 ), ItemSchema( many = True ) ) ) == '[]'
+
+
+def test_stream_peak_memory( project_common, report_benchmark ):
+    common, app, db = project_common
+    marshmallow = pytest.importorskip( 'marshmallow' )
+    model = make_model( db )
+
+    class ItemSchema( marshmallow.Schema ):
+        class Meta:
+            fields = ( 'I_ID', 'I_NAME', 'I_COUNT', 'I_PRICE' )
+
+    schema = ItemSchema( many = True )
+    results = {}
+    with app.app_context():
+        db.create_all()
+        for count in ( 5000, 50000 ):
+            fill( db, model, count - db.session.query( model ).count() )
+            query = db.session.query( model ).order_by( model.I_ID )
+            streamed, streamedSize = peak_memory( lambda: common.streamRecords( query, schema ) )
+            db.session.expunge_all()
+            listed, listedSize = peak_memory( lambda: [ json.dumps( schema.dump( query.all() ) ) ] )
+            db.session.expunge_all()
+            assert streamedSize > 0 and listedSize > 0
+            results[ count ] = ( streamed, listed )
+            report_benchmark( "Peak memory for {} records: streamed {:.1f} MB, list {:.1f} MB".format( count,
+                                                                                                  streamed / 2 ** 20,
+                                                                                                  listed / 2 ** 20 ) )
+
+    # The streamed peak does not grow with the table, the list does
+    assert results[ 50000 ][ 0 ] < 2 * results[ 5000 ][ 0 ]
+    assert results[ 50000 ][ 0 ] < results[ 50000 ][ 1 ] / 5
@@ -0,0 +1,44 @@
+from gencrud.configuraton import TemplateConfiguration
+import tracemalloc
+from .helpers import synthetic_config
+
+
+def generate_peak_memory( count: int, streaming: bool ) -> int:
+    tracemalloc.start()
+    try:
+        config = TemplateConfiguration( **synthetic_config( count, streaming ) )
+        for obj in config:
+            # Touch what the generators use when rendering an object
+            for column in obj.table.columns:
+                column.sqlAlchemyDef()
+
+        assert len( config.summaries ) == count
+        return tracemalloc.get_traced_memory()[ 1 ]
+
+    finally:
+        tracemalloc.stop()
+
+
+def test_streaming_summaries():
+    config = TemplateConfiguration( **synthetic_config( 3, True ) )
+    assert [ s.name for s in config.summaries ] == [ 'obj0', 'obj1', 'obj2' ]
+    assert config.summaries[ 1 ].tableName == 'OBJ_1'
+    assert config.summaries[ 1 ].screenRoutes[ 0 ].cls == 'ScreenObject1Component'
+
+
+def test_streaming_objects_lazy():
+    config = TemplateConfiguration( **synthetic_config( 3, True ) )
+    # The objects are build on access and not kept
+    assert len( config.objects ) == 3
+    assert config.objects[ 1 ].name == 'obj1'
+    assert config.objects[ 1 ] is not config.objects[ 1 ]
+    assert [ obj.name for obj in config.objects ] == [ obj.name for obj in config ] == [ 'obj0', 'obj1', 'obj2' ]
+    assert [ obj.name for obj in config ] == [ 'obj0', 'obj1', 'obj2' ]
+
+
+def test_streaming_peak_memory( report_benchmark ):
+    retained = generate_peak_memory( 1000, False )
+    streamed = generate_peak_memory( 1000, True )
+    report_benchmark( "Peak memory for 1000 objects: retained {:.1f} MB, streaming {:.1f} MB".format( retained / 2 ** 20,
+                                                                                                  streamed / 2 ** 20 ) )
+    assert streamed < retained
@@ -0,0 +1,26 @@
+def test_default_store_is_shared( project_common ):
+    common, app, db = project_common
+    with app.app_context():
+        store = common.tableVersions()
+        assert isinstance( store, common.DatabaseVersionStore ) and store.shared
+        # A second process has a store of its own on the same database
+        other = common.DatabaseVersionStore( db.engine )
+        before = store.get( [ 'ITEMS' ] )
+        other.bump( [ 'ITEMS' ] )
+        assert store.get( [ 'ITEMS' ] ) != before
+
+    assert not common.MemoryVersionStore().shared
+
+
+def test_select_cache_expires( project_common, monkeypatch ):
+    common, app, db = project_common
+    cache = common.SelectCache()
+    now = [ 1000.0 ]
+    monkeypatch.setattr( common.time, 'monotonic', lambda: now[ 0 ] )
+    app.config[ 'SELECT_CACHE_TTL' ] = 10
+    with app.app_context():
+        cache.put( 'key', 1, [ 'a' ] )
+        assert cache.get( 'key', 1 ) == [ 'a' ] and cache.get( 'key', 2 ) is None
+        # Without a change of the version, for writes that were not counted
+        now[ 0 ] += 11
+        assert cache.get( 'key', 1 ) is None
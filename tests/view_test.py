@@ -0,0 +1,214 @@
+import os
+import sys
+import json
+import types
+import shutil
+import importlib
+import pytest
+import gencrud
+from gencrud.configuraton import TemplateConfiguration
+from .helpers import synthetic_config, COMMON_PY
+
+PYTHON_TEMPLATES = os.path.join( os.path.dirname( gencrud.__file__ ), 'templates', 'python' )
+
+
+def view_config( flavour: str ) -> dict:
+    """Two objects, the second with a foreign key, a resolve list, search, changes,
+    keyset paging and a record cache
+    """
+    config = synthetic_config( 2, False )
+    config[ 'options' ][ 'flavour' ] = flavour
+    obj1 = config[ 'objects' ][ 1 ]
+    obj1[ 'cache' ] = { 'ttl': 60, 'size': 100 }
+    obj1[ 'table' ].update( search = 'fts5', changes = True,
+                            viewSort = { 'field': 'O1_FIELD2', 'direction': 'desc', 'keyset': True } )
+    obj1[ 'table' ][ 'columns' ] += [
+        { 'field': 'O1_STATE INT NULL',
+          'label': 'State',
+          'listview': { 'index': 10, 'width': '5%' },
+          'ui':{ 'type': 'choice', 'resolve-list': { 0: 'Open', 1: 'Closed' } } },
+        { 'field': 'O1_REF INT FOREIGN KEY OBJ_0.O0_ID NULL',
+          'label': 'Ref',
+          'ui': { 'type': 'choice', 'service': { 'class': 'Object0', 'name': 'obj0',
+                                                 'value': 'O0_ID', 'label': 'O0_FIELD0' } } } ]
+    return config
+
+
+def serialization_dict_field( marshmallow ):
+    class SerializationDictField( marshmallow.fields.Field ):
+        def __init__( self, dictionary = None, attribute = None, **kwargs ):
+            super().__init__( dump_only = True, **kwargs )
+            self.dictionary = dictionary
+            self.source = attribute
+
+        def get_value( self, obj, attr, accessor = None, default = None ):
+            return getattr( obj, self.source )
+
+        def _serialize( self, value, attr, obj, **kwargs ):
+            return self.dictionary.get( value )
+
+    return SerializationDictField
+
+
+@pytest.fixture( params = [ 'sync', 'async' ] )
+def views( request, project_common, tmp_path, monkeypatch ):
+    """The generated model, schema and view of the objects in a testrun package,
+    with their blueprints registered on the Flask application
+    """
+    mako = pytest.importorskip( 'mako.template' )
+    marshmallow = pytest.importorskip( 'marshmallow' )
+    flask_marshmallow = pytest.importorskip( 'flask_marshmallow' )
+    if request.param == 'async':
+        pytest.importorskip( 'aiosqlite' )
+        pytest.importorskip( 'asgiref' )
+
+    common, app, db = project_common
+    api = sys.modules[ 'webapp2.api' ]
+    api.mm = flask_marshmallow.Marshmallow( app )
+    parameters = types.ModuleType( 'webapp2.common.parameters' )
+    parameters.SerializationDictField = serialization_dict_field( marshmallow )
+    package = types.ModuleType( 'webapp2.common' )
+    package.parameters = parameters
+    toasted = types.ModuleType( 'toastedmarshmallow' )
+    toasted.Jit = None
+    sql = types.ModuleType( 'common.sql' )
+    sql.getSqlStatement = str
+    for name, module in ( ( 'webapp2.common', package ), ( 'webapp2.common.parameters', parameters ),
+                          ( 'toastedmarshmallow', toasted ), ( 'common', types.ModuleType( 'common' ) ),
+                          ( 'common.sql', sql ) ):
+        monkeypatch.setitem( sys.modules, name, module )
+
+    root = tmp_path / 'testrun'
+    root.mkdir()
+    ( root / '__init__.py' ).write_text( '' )
+    shutil.copy( COMMON_PY, str( root / 'common.py' ) )
+    config = TemplateConfiguration( **view_config( request.param ) )
+    for obj in config:
+        folder = root / obj.name
+        folder.mkdir()
+        ( folder / '__init__.py' ).write_text( '' )
+        for name in ( 'model.py', 'schema.py', 'view.py' ):
+            template = os.path.join( PYTHON_TEMPLATES, name + '.templ' )
+            if name == 'view.py' and request.param == 'async':
+                template = os.path.join( PYTHON_TEMPLATES, 'async', name + '.templ' )
+
+            source = mako.Template( filename = template ).render( obj = obj, root = config, modules = [],
+                                                                  date = '', version = '', username = '' )
+            ( folder / name ).write_text( source )
+
+    monkeypatch.syspath_prepend( str( tmp_path ) )
+    app.config[ 'CHANGES_GRACE_SECONDS' ] = 0
+    modules = [ importlib.import_module( 'testrun.{}.view'.format( obj.name ) ) for obj in config ]
+    for module, obj in zip( modules, config ):
+        app.register_blueprint( getattr( module, '{}Api'.format( obj.name ) ) )
+
+    with app.app_context():
+        db.create_all()
+
+    yield app.test_client(), app, modules
+    for name in [ name for name in sys.modules if name.startswith( 'testrun' ) ]:
+        del sys.modules[ name ]
+
+
+def fill_views( client ):
+    for idx in range( 3 ):
+        assert client.post( '/api/obj0/new', json = { 'O0_FIELD0': 'ref {}'.format( idx ) } ).status_code == 200
+
+    for idx in range( 12 ):
+        response = client.post( '/api/obj1/new', json = { 'O1_FIELD0': 'name {}'.format( idx ),
+                                                          'O1_FIELD1': 'word{} alpha'.format( idx ),
+                                                          'O1_FIELD2': 's{:02}'.format( idx % 5 ),
+                                                          'O1_STATE': idx % 2,
+                                                          'O1_REF': idx % 3 + 1 } )
+        assert response.status_code == 200
+
+
+def test_routing( views ):
+    client, app, modules = views
+    rules = { rule.rule for rule in app.url_map.iter_rules() }
+    for uri in ( '/list', '/list/stream', '/pagedlist', '/keysetlist', '/search', '/changes', '/select',
+                 '/new', '/put', '/update', '/bulk/new', '/bulk/update', '/bulk/delete' ):
+        assert '/api/obj1' + uri in rules
+
+    assert '/api/obj0/keysetlist' not in rules
+
+
+def test_list_projection_and_etag( views ):
+    client, app, modules = views
+    fill_views( client )
+    response = client.get( '/api/obj1/list' )
+    records = response.get_json()
+    assert len( records ) == 12
+    assert records[ 0 ][ 'O1_STATE_LABEL' ] == 'Open'
+    assert records[ 0 ][ 'O1_REF_FK' ][ 'O0_FIELD0' ] == 'ref 0'
+    assert client.get( '/api/obj1/list', headers = { 'If-None-Match': response.headers[ 'ETag' ] } ).status_code == 304
+    projected = client.get( '/api/obj1/list?fields=O1_ID,O1_FIELD0' ).get_json()
+    assert set( projected[ 0 ] ) == { 'O1_ID', 'O1_FIELD0' }
+    assert client.get( '/api/obj1/list?fields=O1_NOPE' ).status_code == 400
+    # A change of the table invalidates the ETag
+    assert client.post( '/api/obj1/update', json = { 'O1_ID': 1, 'O1_FIELD0': 'changed' } ).status_code == 200
+    assert client.get( '/api/obj1/list', headers = { 'If-None-Match': response.headers[ 'ETag' ] } ).status_code == 200
+
+
+def test_paging( views ):
+    client, app, modules = views
+    fill_views( client )
+    paged = client.post( '/api/obj1/pagedlist', json = { 'page': 1, 'pageSize': 4 } ).get_json()
+    assert ( paged[ 'page' ], paged[ 'recordCount' ], len( paged[ 'records' ] ) ) == ( 1, 12, 4 )
+    for data in ( { 'page': -1 }, { 'pageSize': 0 }, { 'pageSize': 'x' }, { 'page': None },
+                  { 'pageSize': 5000 }, { 'columnSort': { 'column': 'NOPE' } } ):
+        assert client.post( '/api/obj1/pagedlist', json = data ).status_code == 400
+
+    first = client.post( '/api/obj1/keysetlist', json = { 'pageSize': 5 } ).get_json()
+    second = client.post( '/api/obj1/keysetlist', json = { 'pageSize': 5, 'cursor': first[ 'next' ] } ).get_json()
+    keys = [ record[ 'O1_ID' ] for record in first[ 'records' ] + second[ 'records' ] ]
+    assert len( set( keys ) ) == 10
+    assert [ record[ 'O1_FIELD2' ] for record in first[ 'records' ] ][ 0 ] == 's04'
+    for data in ( { 'pageSize': 0 }, { 'pageSize': 'x' }, { 'pageSize': 5000 }, { 'cursor': 'invalid' } ):
+        assert client.post( '/api/obj1/keysetlist', json = data ).status_code == 400
+
+
+def test_bulk_and_stream( views ):
+    client, app, modules = views
+    fill_views( client )
+    response = client.post( '/api/obj1/bulk/new', json = [ { 'O1_FIELD0': 'bulk 1' }, { 'O1_FIELD0': 'bulk 2' } ] )
+    assert response.get_json()[ 'count' ] == 2
+    response = client.post( '/api/obj1/bulk/update', json = [ { 'O1_ID': 1, 'O1_FIELD0': 'bulk' }, { 'O1_ID': 99 } ] )
+    assert response.status_code == 400
+    assert response.get_json()[ 'results' ][ 1 ] == { 'ok': False, 'error': 'Record 99 not found' }
+    response = client.post( '/api/obj1/bulk/new', json = [ { 'O1_OTHER': 1 } ] )
+    assert response.status_code == 400
+    assert client.post( '/api/obj1/bulk/delete', json = [ 2 ] ).get_json()[ 'count' ] == 1
+    records = json.loads( client.get( '/api/obj1/list/stream' ).get_data( as_text = True ) )
+    assert len( records ) == 13
+    assert 'bulk 2' in [ record[ 'O1_FIELD0' ] for record in records ]
+
+
+def test_search_and_changes( views ):
+    client, app, modules = views
+    fill_views( client )
+    assert sorted( record[ 'O1_ID' ] for record in client.get( '/api/obj1/search?q=word1' ).get_json() ) == [ 2, 11, 12 ]
+    assert len( client.get( '/api/obj1/search?q=closed' ).get_json() ) == 6
+    changes = client.get( '/api/obj1/changes' ).get_json()
+    assert len( changes[ 'records' ] ) == 12
+    assert client.post( '/api/obj1/update', json = { 'O1_ID': 3, 'O1_FIELD0': 'delta' } ).status_code == 200
+    assert client.delete( '/api/obj1/4' ).status_code == 200
+    delta = client.get( '/api/obj1/changes?since=' + changes[ 'token' ] ).get_json()
+    assert [ record[ 'O1_ID' ] for record in delta[ 'records' ] ] == [ 3 ]
+    assert delta[ 'deleted' ] == [ 4 ]
+    assert client.get( '/api/obj1/changes?since=invalid' ).status_code == 400
+
+
+def test_record_cache( views ):
+    client, app, modules = views
+    fill_views( client )
+    cache = modules[ 1 ].obj1RecordCache
+    assert client.get( '/api/obj1/get/5' ).get_json()[ 'O1_FIELD0' ] == 'name 4'
+    assert client.get( '/api/obj1/get/5' ).get_json()[ 'O1_FIELD0' ] == 'name 4'
+    assert cache.statistics()[ 'hits' ] == 1
+    assert client.post( '/api/obj1/put', json = { 'O1_ID': 5, 'O1_FIELD0': 'put' } ).status_code == 200
+    assert client.get( '/api/obj1/get/5' ).get_json()[ 'O1_FIELD0' ] == 'put'
+    # A change of the referenced table invalidates the nested record as well
+    assert client.post( '/api/obj0/update', json = { 'O0_ID': 2, 'O0_FIELD0': 'nested' } ).status_code == 200
+    assert client.get( '/api/obj1/get/5' ).get_json()[ 'O1_REF_FK' ][ 'O0_FIELD0' ] == 'nested'
+    assert client.get( '/api/obj1/get/5?fields=O1_ID,O1_FIELD0' ).get_json() == { 'O1_ID': 5, 'O1_FIELD0': 'put' }